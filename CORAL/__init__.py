@@ -4,6 +4,35 @@ __maintainer__ = "Jake Nunemaker"
 __email__ = "jake.nunemaker@nrel.gov"
 
 
-from .library import SharedLibrary
-from .manager import GlobalManager
-from .pipelines import Pipeline
+from importlib import import_module
+
+# Public names and the modules they are imported from on first access.
+_EXPORTS = {
+    "SharedLibrary": "CORAL.library",
+    "GlobalManager": "CORAL.manager",
+    "Pipeline": "CORAL.pipelines",
+    "sweep": "CORAL.sweeps",
+    "expand_grid": "CORAL.sweeps",
+    "minimize_fleet": "CORAL.optimize",
+    "run_ensemble": "CORAL.ensemble",
+    "JobStore": "CORAL.jobs",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    try:
+        module = _EXPORTS[name]
+
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_EXPORTS})
@@ -0,0 +1,361 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import os
+import json
+import hashlib
+import tempfile
+import datetime as dt
+from numbers import Number
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+
+
+class ProjectResult:
+    """Summary of a completed ORBIT `ProjectManager` run."""
+
+    def __init__(self, project_time, phase_starts=None, phase_times=None):
+        """
+        Creates an instance of `ProjectResult`.
+
+        Parameters
+        ----------
+        project_time : float
+            Total project time.
+        phase_starts : dict
+            Start time of each phase, relative to the project start.
+        phase_times : dict
+            Duration of each phase.
+        """
+
+        self.project_time = project_time
+        self.phase_starts = phase_starts if phase_starts else {}
+        self.phase_times = phase_times if phase_times else {}
+
+    @classmethod
+    def from_project(cls, project):
+        """
+        Creates an instance of `ProjectResult` from a completed ORBIT project.
+
+        Parameters
+        ----------
+        project : ProjectManager
+        """
+
+        times = {
+            k: float(v)
+            for k, v in project.phase_times.items()
+            if isinstance(v, Number)
+        }
+        starts = {
+            k: float(v) for k, v in project.phase_starts.items() if k in times
+        }
+
+        return cls(float(project.project_time), starts, times)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Creates an instance of `ProjectResult` from `data`.
+
+        Parameters
+        ----------
+        data : dict
+        """
+
+        return cls(**data)
+
+    def to_dict(self):
+        """Return dictionary representation of the result."""
+
+        return {
+            "project_time": self.project_time,
+            "phase_starts": self.phase_starts,
+            "phase_times": self.phase_times,
+        }
+
+
+class ProjectCache:
+    """
+    Content addressed cache of ORBIT project results with an in-memory LRU
+    tier and an optional on-disk tier that is shared across processes.
+    """
+
+    def __init__(self, maxsize=1024, path=None):
+        """
+        Creates an instance of `ProjectCache`.
+
+        Parameters
+        ----------
+        maxsize : int
+            Maximum number of results held in memory.
+        path : str | None
+            Directory for the on-disk tier. If `None`, results are only held
+            in memory.
+        """
+
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def __len__(self):
+        return len(self._memory)
+
+    def __contains__(self, key):
+        return key in self._memory or (
+            self.path is not None and os.path.exists(self._filepath(key))
+        )
+
+    @property
+    def info(self):
+        """Return cache statistics."""
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._memory),
+            "maxsize": self.maxsize,
+        }
+
+    def get(self, key):
+        """
+        Return cached result for `key` or `None` if it isn't available.
+
+        Parameters
+        ----------
+        key : str
+        """
+
+        try:
+            result = self._memory[key]
+            self._memory.move_to_end(key)
+
+        except KeyError:
+            result = self._read(key)
+            if result is None:
+                self.misses += 1
+                return None
+
+            self._insert(key, result)
+
+        self.hits += 1
+        return result
+
+    def set(self, key, result):
+        """
+        Store `result` at `key`.
+
+        Parameters
+        ----------
+        key : str
+        result : ProjectResult
+        """
+
+        self._insert(key, result)
+        self._write(key, result)
+
+    def clear(self):
+        """Clear the in-memory tier and reset counters."""
+
+        self._memory.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _insert(self, key, result):
+        """Insert `result` into the in-memory tier, evicting if necessary."""
+
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _filepath(self, key):
+        """Return on-disk location of `key`."""
+
+        return os.path.join(self.path, key[:2], f"{key}.json")
+
+    def _read(self, key):
+        """Read `key` from the on-disk tier."""
+
+        if self.path is None:
+            return None
+
+        try:
+            with open(self._filepath(key), "r") as f:
+                return ProjectResult.from_dict(json.load(f))
+
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write(self, key, result):
+        """Atomically write `result` to the on-disk tier."""
+
+        if self.path is None:
+            return
+
+        filepath = self._filepath(key)
+        directory = os.path.dirname(filepath)
+        os.makedirs(directory, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile(
+            "w", dir=directory, suffix=".tmp", delete=False
+        ) as f:
+            json.dump(result.to_dict(), f)
+
+        os.replace(f.name, filepath)
+
+
+def project_key(config, weather=None, offset=None):
+    """
+    Return canonical hash of an ORBIT configuration and the weather it runs
+    against.
+
+    Parameters
+    ----------
+    config : dict
+        Final ORBIT configuration.
+    weather : str | None
+        Fingerprint of the weather profile. See `weather_fingerprint`.
+    offset : int | None
+        Index into the weather profile where the project starts. Ignored if
+        `weather` is `None`.
+    """
+
+    from ORBIT import __version__
+
+    payload = {
+        "orbit": __version__,
+        "config": _normalize(config),
+        "library": library_files(config),
+        "weather": weather,
+        "offset": offset if weather is not None else None,
+    }
+
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def library_files(config):
+    """
+    Return path, modification time and size of each ORBIT library file that
+    `config` refers to by name, e.g. `turbine: "12MW_generic"`, resolved
+    the way ORBIT resolves them. Items that can't be found are `None`.
+
+    Parameters
+    ----------
+    config : dict
+        Final ORBIT configuration.
+    """
+
+    from ORBIT.core.library import PATH_LIBRARY, default_library
+
+    root = os.environ.get("DATA_LIBRARY", default_library)
+    phases = [
+        *config.get("design_phases", []),
+        *config.get("install_phases", []),
+    ]
+
+    items = []
+    for key, value in config.items():
+        if isinstance(value, Mapping) and any(p in key for p in phases):
+            items.extend(value.items())
+
+        else:
+            items.append((key, value))
+
+    files = {}
+    for key, value in items:
+        if not isinstance(value, str) or key not in PATH_LIBRARY:
+            continue
+
+        filename = f"{value}.yaml"
+        for directory in dict.fromkeys((root, default_library)):
+            path = os.path.join(directory, PATH_LIBRARY[key], filename)
+            try:
+                stat = os.stat(path)
+
+            except OSError:
+                continue
+
+            files[f"{key}:{value}"] = [path, stat.st_mtime_ns, stat.st_size]
+            break
+
+        else:
+            files[f"{key}:{value}"] = None
+
+    return files
+
+
+def weather_fingerprint(weather):
+    """
+    Return hash of a weather profile.
+
+    Parameters
+    ----------
+    weather : pd.DataFrame | np.ndarray | None
+    """
+
+    if weather is None:
+        return None
+
+    import pandas as pd
+
+    h = hashlib.sha256()
+    if isinstance(weather, pd.DataFrame):
+        h.update(json.dumps([str(c) for c in weather.columns]).encode())
+        h.update(pd.util.hash_pandas_object(weather).values.tobytes())
+
+    else:
+        weather = np.ascontiguousarray(weather)
+        h.update(str(weather.dtype).encode())
+        h.update(weather.tobytes())
+
+    return h.hexdigest()
+
+
+def _normalize(obj):
+    """
+    Return JSON serializable representation of `obj` that distinguishes types
+    that ORBIT treats differently, e.g. tuples and lists.
+
+    Parameters
+    ----------
+    obj : object
+    """
+
+    if isinstance(obj, Mapping):
+        return {str(k): _normalize(v) for k, v in obj.items()}
+
+    if isinstance(obj, tuple):
+        return {"__tuple__": [_normalize(v) for v in obj]}
+
+    if isinstance(obj, list):
+        return [_normalize(v) for v in obj]
+
+    if isinstance(obj, (set, frozenset)):
+        return {"__set__": sorted((_normalize(v) for v in obj), key=repr)}
+
+    if isinstance(obj, (dt.date, dt.datetime)):
+        return {"__datetime__": obj.isoformat()}
+
+    if isinstance(obj, np.ndarray):
+        return {"__ndarray__": obj.tolist()}
+
+    if isinstance(obj, np.generic):
+        return obj.item()
+
+    if obj is None or isinstance(obj, (str, bool, int, float)):
+        return obj
+
+    return repr(obj)
@@ -0,0 +1,130 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+from copy import deepcopy
+from collections.abc import Mapping, MutableMapping
+
+
+class LayeredConfig(MutableMapping):
+    """
+    Copy-on-write view of a stack of ORBIT configuration layers. Layers are
+    never modified. Nested dictionaries are merged across layers and writes
+    are held by the view until it is flattened with `to_dict`.
+    """
+
+    def __init__(self, *layers):
+        """
+        Creates an instance of `LayeredConfig`.
+
+        Parameters
+        ----------
+        layers : dict
+            Configuration layers, lowest priority first. Typically a shared
+            base template followed by project specific overrides.
+        """
+
+        self._layers = [layer for layer in layers if layer is not None]
+        self._writes = {}
+        self._deleted = set()
+
+    def __getitem__(self, key):
+
+        try:
+            return self._writes[key]
+
+        except KeyError:
+            if key in self._deleted:
+                raise
+
+        mappings = []
+        for layer in reversed(self._layers):
+            if key not in layer:
+                continue
+
+            value = layer[key]
+            if isinstance(value, Mapping):
+                mappings.append(value)
+                continue
+
+            if mappings:
+                break
+
+            if isinstance(value, (list, set)):
+                value = deepcopy(value)
+                self._writes[key] = value
+
+            return value
+
+        if not mappings:
+            raise KeyError(key)
+
+        child = LayeredConfig(*reversed(mappings))
+        self._writes[key] = child
+
+        return child
+
+    def __setitem__(self, key, value):
+
+        self._writes[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key):
+
+        if key not in self:
+            raise KeyError(key)
+
+        self._writes.pop(key, None)
+        self._deleted.add(key)
+
+    def __contains__(self, key):
+
+        if key in self._writes:
+            return True
+
+        if key in self._deleted:
+            return False
+
+        return any(key in layer for layer in self._layers)
+
+    def __iter__(self):
+
+        keys = {}
+        for layer in self._layers:
+            keys.update(dict.fromkeys(layer))
+
+        keys.update(dict.fromkeys(self._writes))
+        for key in keys:
+            if key in self._writes or key not in self._deleted:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"LayeredConfig({self.to_dict()!r})"
+
+    def to_dict(self):
+        """Return flattened configuration as a plain dictionary."""
+
+        return {
+            k: v.to_dict() if isinstance(v, LayeredConfig) else v
+            for k, v in self.items()
+        }
+
+
+def flatten(config):
+    """
+    Return `config` as a plain dictionary if it is a `LayeredConfig`.
+
+    Parameters
+    ----------
+    config : dict | LayeredConfig
+    """
+
+    if isinstance(config, LayeredConfig):
+        return config.to_dict()
+
+    return config
@@ -0,0 +1,487 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+from copy import deepcopy
+from heapq import heappop, heappush, heapify
+from collections import defaultdict
+
+from CORAL.scheduling import get_scheduler
+
+ARRIVE = 0
+START = 1
+FINISH = 2
+CAPACITY = 3
+PASS = 4
+RELEASE = 5
+
+
+class Job:
+    """Project scheduled by `FastEngine`."""
+
+    __slots__ = (
+        "index",
+        "name",
+        "pools",
+        "priority",
+        "start",
+        "duration",
+        "finish",
+    )
+
+    def __init__(self, index, name, pools, priority=0, start=0, duration=None):
+        self.index = index
+        self.name = name
+        self.pools = pools
+        self.priority = priority
+        self.start = start
+        self.duration = duration
+        self.finish = None
+
+
+class Checkpoint:
+    """Snapshot of the state of a `FastEngine` between event times."""
+
+    __slots__ = ("time", "sequence", "finished", "timelines", "state")
+
+    def __init__(self, time, sequence, finished, timelines, state):
+        self.time = time
+        self.sequence = sequence
+        self.finished = finished
+        self.timelines = timelines
+        self.state = state
+
+
+class FastEngine:
+    """
+    Heap based event loop that schedules projects on shared resource pools
+    without simpy processes, events or resources. Events are ordered by time
+    and then by the order they were scheduled in, which reproduces the event
+    order of the simpy implementation in `GlobalManager`.
+    """
+
+    def __init__(
+        self,
+        capacities,
+        profiler=None,
+        timelines=None,
+        scheduler=None,
+        checkpoint=None,
+        coalesce=False,
+    ):
+        """
+        Creates an instance of `FastEngine`.
+
+        Parameters
+        ----------
+        capacities : dict
+            Initial capacity of each `(category, name)` resource pool.
+        profiler : Profiler | None
+            Records time spent checking requests and queue lengths.
+        timelines : dict | None
+            `Timeline` of each `(category, name)` resource pool, recording
+            capacity, resources in use and waiting requests.
+        scheduler : str | Scheduler | None
+            Policy deciding which waiting project is granted next, see
+            `CORAL.scheduling.SCHEDULERS`.
+        checkpoint : int | float | None
+            Interval between checkpoints of the engine state, taken before
+            the first event at or after each multiple of the interval and
+            before the first event. See `FastEngine.restore`.
+        coalesce : bool
+            If `True`, pools that gain capacity are matched against waiting
+            projects in one pass after every other event at the same time,
+            like a coalescing `SharedLibrary`. Otherwise each pool is
+            checked as it gains capacity.
+        """
+
+        self.now = 0
+        self.logs = []
+        self.profiler = profiler
+        self.timelines = timelines
+        self.scheduler = get_scheduler(scheduler)
+        self.checkpoint = checkpoint
+        self.checkpoints = []
+        self.coalesce = coalesce
+
+        self._capacity = dict(capacities)
+        self._count = dict.fromkeys(self._capacity, 0)
+        self._events = []
+        self._sequence = 0
+        self._next_checkpoint = 0
+        self._projects = []
+        self._active = {}
+        self._holders = defaultdict(dict)
+        self._queued = dict.fromkeys(self._capacity, 0)
+        self._dirty = {}
+
+    def add_project(self, name, start, resources, priority=0, duration=None):
+        """
+        Add a project that arrives at time `start`.
+
+        Parameters
+        ----------
+        name : str
+            Project handle.
+        start : int | float
+            Project arrival time.
+        resources : list
+            List of `(category, name)` resource pools required by the project.
+        priority : int | float
+            Scheduling priority.
+        duration : int | float | None
+            Estimated project time, used by schedulers that backfill.
+        """
+
+        i = len(self._projects)
+        job = Job(i, name, list(resources), priority, start, duration)
+        self._projects.append(job)
+        self._schedule(start, ARRIVE, i)
+
+        return i
+
+    def add_capacity(self, pool, delay):
+        """
+        Add one resource to `pool` at time `delay`.
+
+        Parameters
+        ----------
+        pool : tuple
+            `(category, name)` resource pool.
+        delay : int | float
+            Time the resource is added.
+        """
+
+        self._schedule(delay, CAPACITY, pool)
+
+    def run(self, duration, blocked=None, finished=None, leases=None):
+        """
+        Run the event loop until all projects are finished.
+
+        Parameters
+        ----------
+        duration : callable
+            Called with the project index and start time. Returns the
+            project time.
+        blocked : callable | None
+            Called with the project index when a project can't start on
+            arrival.
+        finished : callable | None
+            Called with the project index and log when a project finishes.
+        leases : callable | None
+            Called with the project index after `duration`. Returns a
+            dictionary of resource pools that are released before the
+            project finishes and their release time relative to the start.
+        """
+
+        while self._events:
+            if self.checkpoint and self._events[0][0] >= self._next_checkpoint:
+                self._save()
+
+            self.now, _, _, kind, item = heappop(self._events)
+
+            if kind == ARRIVE:
+                self._arrive(item, blocked)
+
+            elif kind == START:
+                job = self._projects[item]
+                self._active[item]["Started"] = self.now
+                job.finish = self.now + duration(item, self.now)
+                if leases is not None:
+                    for pool, end in leases(item).items():
+                        self._schedule(self.now + end, RELEASE, (job, pool))
+
+                self._schedule(job.finish, FINISH, item)
+
+            elif kind == FINISH:
+                self._finish(item, finished)
+
+            elif kind == CAPACITY:
+                self._capacity[item] += 1
+                self._record(item)
+                self._wake(item)
+
+            elif kind == RELEASE:
+                self._release(*item)
+
+            else:
+                self._run_pass()
+
+    def restore(self, checkpoint):
+        """
+        Return the engine to `checkpoint`. Logs and timeline records after
+        the checkpoint are dropped, as are later checkpoints. The engine is
+        checkpointed again when it resumes, so changes made after restoring
+        are included.
+
+        Parameters
+        ----------
+        checkpoint : Checkpoint
+            One of `self.checkpoints`.
+        """
+
+        (
+            self._events,
+            self._projects,
+            self._active,
+            self._holders,
+            self.scheduler,
+            self._capacity,
+            self._count,
+            self._queued,
+            self._dirty,
+        ) = deepcopy(checkpoint.state)
+
+        self.now = checkpoint.time
+        self._sequence = checkpoint.sequence
+        finished = checkpoint.finished
+        del self.logs[finished:]
+        if self.timelines is not None:
+            for pool, size in checkpoint.timelines.items():
+                self.timelines[pool].truncate(size)
+
+        index = self.checkpoints.index(checkpoint)
+        del self.checkpoints[index:]
+        self._next_checkpoint = checkpoint.time
+
+    def move_project(self, i, start, duration=None):
+        """
+        Move the arrival of project `i` to `start`, in the engine and in the
+        checkpoints before it. The project must not have arrived yet. Ties
+        with other events keep the order of the original arrival.
+
+        Parameters
+        ----------
+        i : int
+            Project index.
+        start : int | float
+            New arrival time.
+        duration : int | float | None
+            New estimated project time, used by schedulers that backfill.
+        """
+
+        _move(self._events, self._projects[i], start, duration)
+        for checkpoint in self.checkpoints:
+            events, projects, *_ = checkpoint.state
+            _move(events, projects[i], start, duration)
+
+    def set_capacity(self, pool, capacity):
+        """
+        Set the initial capacity of `pool`, before any events are processed
+        or after restoring the first checkpoint.
+
+        Parameters
+        ----------
+        pool : tuple
+            `(category, name)` resource pool.
+        capacity : int
+        """
+
+        if self.logs or any(self._count.values()):
+            raise ValueError(
+                "Capacity can only be set before the first event."
+            )
+
+        self._capacity[pool] = capacity
+        if self.timelines is not None:
+            self.timelines[pool].truncate(0)
+            self.timelines[pool].record(0, capacity, 0, 0)
+
+    def is_full(self, pool):
+        """Return `True` if `pool` is at capacity."""
+
+        return self._count[pool] == self._capacity[pool]
+
+    def free(self, pool):
+        """Return number of free resources in `pool`."""
+
+        return self._capacity[pool] - self._count[pool]
+
+    def holders(self, pool):
+        """Return started projects holding `pool`."""
+
+        return self._holders[pool]
+
+    def _arrive(self, i, blocked=None):
+        """Grant resources to project `i` on arrival or queue it."""
+
+        job = self._projects[i]
+        self._active[i] = {"name": job.name, "Initialized": self.now}
+
+        if self._dirty:
+            self.scheduler.defer(job)
+            self._queue(job, blocked)
+
+        elif self.scheduler.submit(job, self):
+            self._grant(job)
+
+        else:
+            self._queue(job, blocked)
+
+        if self.profiler is not None:
+            waiting = len(self.scheduler.waiting)
+            self.profiler.record_queue(self.now, None, waiting)
+
+    def _queue(self, job, blocked=None):
+        """Count waiting `job` in the queue length of its pools."""
+
+        for pool in job.pools:
+            self._queued[pool] += 1
+            self._record(pool)
+
+        if blocked is not None:
+            blocked(job.index)
+
+    def _finish(self, i, finished=None):
+        """Log project `i` and release its resources."""
+
+        log = self._active.pop(i)
+        log["Finished"] = self.now
+        self.logs.append(log)
+        if finished is not None:
+            finished(i, log)
+
+        job = self._projects[i]
+        for pool in job.pools:
+            self._release(job, pool)
+
+    def _release(self, job, pool):
+        """Return `pool` held by `job`, unless it was already released."""
+
+        holders = self._holders[pool]
+        if job not in holders:
+            return
+
+        del holders[job]
+        self._count[pool] -= 1
+        self._record(pool)
+        self._wake(pool)
+
+    def _schedule(self, time, kind, item, priority=0):
+        """Push an event onto the event queue."""
+
+        heappush(self._events, (time, priority, self._sequence, kind, item))
+        self._sequence += 1
+
+    def _save(self):
+        """Checkpoint the engine before the next event."""
+
+        time = self._events[0][0]
+        state = (
+            self._events,
+            self._projects,
+            self._active,
+            self._holders,
+            self.scheduler,
+            self._capacity,
+            self._count,
+            self._queued,
+            self._dirty,
+        )
+
+        timelines = {}
+        if self.timelines is not None:
+            timelines = {pool: len(t) for pool, t in self.timelines.items()}
+
+        self.checkpoints.append(
+            Checkpoint(
+                time,
+                self._sequence,
+                len(self.logs),
+                timelines,
+                deepcopy(state),
+            )
+        )
+        self._next_checkpoint = (time // self.checkpoint + 1) * self.checkpoint
+
+    def _record(self, pool):
+        """Record the state of `pool` to its timeline."""
+
+        if self.timelines is not None:
+            self.timelines[pool].record(
+                self.now,
+                self._capacity[pool],
+                self._count[pool],
+                self._queued[pool],
+            )
+
+    def _wake(self, pool):
+        """
+        Check `pool` after it gains capacity, or mark it for the next pass
+        if `self.coalesce`.
+        """
+
+        if not self.coalesce:
+            self._check(self.scheduler.wake(pool, self), pool)
+            return
+
+        if not self._dirty:
+            self._schedule(self.now, PASS, None, priority=1)
+
+        self._dirty[pool] = None
+
+    def _run_pass(self):
+        """Check every pool marked since the last pass."""
+
+        pools = list(self._dirty)
+        self._dirty = {}
+        self._check(self.scheduler.wake_many(pools, self))
+
+    def _check(self, jobs, pool=None):
+        """
+        Grant each of `jobs` yielded by the scheduler, timed if profiling.
+
+        Parameters
+        ----------
+        jobs : iterator
+        pool : tuple | None
+            Pool recorded by the profiler.
+        """
+
+        if self.profiler is None:
+            self._grant_all(jobs)
+            return
+
+        with self.profiler.stage("check_requests"):
+            self._grant_all(jobs)
+
+        waiting = len(self.scheduler.waiting)
+        self.profiler.record_queue(self.now, pool, waiting)
+
+    def _grant_all(self, jobs):
+        """Grant and dequeue each of `jobs`."""
+
+        for job in jobs:
+            for queue in job.pools:
+                self._queued[queue] -= 1
+
+            self._grant(job)
+
+    def _grant(self, job):
+        """Take resources for `job` and schedule its start."""
+
+        for pool in job.pools:
+            self._holders[pool][job] = None
+            self._count[pool] += 1
+            self._record(pool)
+
+        self._schedule(self.now, START, job.index)
+
+
+def _move(events, job, start, duration=None):
+    """Move the arrival event of `job` in heap `events` to `start`."""
+
+    for j, (_, priority, seq, kind, item) in enumerate(events):
+        if kind == ARRIVE and item == job.index:
+            events[j] = (start, priority, seq, kind, item)
+            heapify(events)
+            break
+
+    else:
+        raise ValueError(f"Project {job.index} has already arrived.")
+
+    job.start = start
+    if duration is not None:
+        job.duration = duration
@@ -0,0 +1,270 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import os
+import tempfile
+import datetime as dt
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from CORAL.sweeps import _prepare
+from CORAL.weather import WeatherStore
+from CORAL.manager import GlobalManager
+from CORAL.results import StreamingQuantile
+
+# Configurations, weather and manager arguments of an ensemble worker.
+_ENSEMBLE = None
+
+
+class EnsembleSummary:
+    """
+    Distribution of the start and finish of each project over weather
+    realizations, aggregated as realizations complete. Memory is constant
+    in the number of realizations.
+    """
+
+    def __init__(self, quantiles=(0.5, 0.9), start=None):
+        """
+        Creates an instance of `EnsembleSummary`.
+
+        Parameters
+        ----------
+        quantiles : tuple
+            Quantiles of the start and finish times, e.g. 0.9 for P90.
+        start : int | float | dt.datetime | None
+            Simulation start. If a datetime, date columns are included.
+        """
+
+        self.quantiles = tuple(quantiles)
+        self.start = start
+        self.realizations = 0
+        self._projects = {}
+
+    def add(self, logs):
+        """
+        Add the logs of a realization.
+
+        Parameters
+        ----------
+        logs : list
+            Project logs with keys 'name', 'Started' and 'Finished'.
+        """
+
+        self.realizations += 1
+        for log in logs:
+            try:
+                stats = self._projects[log["name"]]
+
+            except KeyError:
+                stats = self._projects[log["name"]] = {
+                    k: [0, 0.0, [StreamingQuantile(q) for q in self.quantiles]]
+                    for k in ("Started", "Finished")
+                }
+
+            for k, data in stats.items():
+                data[0] += 1
+                data[1] += log[k]
+                for quantile in data[2]:
+                    quantile.add(log[k])
+
+    def to_frame(self):
+        """
+        Return `pd.DataFrame` of the number of realizations, mean and
+        quantiles of the start and finish times of each project. Quantile
+        columns are named by percentile, e.g. 'Finished P90'.
+        """
+
+        rows = {}
+        for name, stats in self._projects.items():
+            row = {"realizations": stats["Finished"][0]}
+            for k, (count, total, quantiles) in stats.items():
+                row[f"{k} mean"] = total / count
+                for quantile in quantiles:
+                    row[f"{k} {_label(quantile.q)}"] = quantile.value
+
+            rows[name] = row
+
+        frame = pd.DataFrame.from_dict(rows, orient="index")
+        frame.index.name = "name"
+
+        if isinstance(self.start, dt.datetime) and not frame.empty:
+            start = pd.Timestamp(self.start)
+            for k in ("Started", "Finished"):
+                for q in self.quantiles:
+                    column = f"{k} {_label(q)}"
+                    hours = np.ceil(frame[column]).astype("int64")
+                    frame[f"Date {column}"] = start + pd.to_timedelta(
+                        hours, unit="h"
+                    )
+
+        return frame
+
+
+def run_ensemble(
+    configs,
+    allocations,
+    weather,
+    offsets,
+    workers=None,
+    quantiles=(0.5, 0.9),
+    callback=None,
+    engine="simpy",
+    library_path=None,
+    cache=None,
+    **kwargs,
+):
+    """
+    Simulate `configs` under each weather realization in `offsets` and
+    return the distribution of the start and finish of each project, see
+    `EnsembleSummary.to_frame`.
+
+    Parameters
+    ----------
+    configs : list
+        List of ORBIT configurations, shared by every realization.
+    allocations : dict
+        Number of each library item that exists in the shared environment.
+    weather : pd.DataFrame | WeatherStore
+        Hourly weather profiles. Data frames are written to a temporary
+        `WeatherStore`, which every worker process shares.
+    offsets : list
+        Hours from the start of `weather` to the start of the simulation in
+        each realization, e.g. `range(0, 10 * 8760, 8760)` for ten weather
+        years.
+    workers : int | None
+        Number of worker processes. If `None`, realizations are simulated
+        in this process.
+    quantiles : tuple
+        Quantiles of the start and finish times, e.g. 0.9 for P90.
+    callback : callable | None
+        Called with the offset and logs of each realization as it
+        completes.
+    engine : str
+        Scheduling backend, see `GlobalManager.run`.
+    library_path : str | None
+        Path to shared library items or a library snapshot.
+    cache : ProjectCache | None
+        Cache of ORBIT project results. Defaults to a temporary cache that
+        is shared by every realization and worker process.
+    kwargs : dict
+        Passed to `GlobalManager`.
+    """
+
+    configs = list(configs)
+    start = min(config["project_start"] for config in configs)
+    summary = EnsembleSummary(quantiles, start)
+
+    for offset, logs in iter_ensemble(
+        configs,
+        allocations,
+        weather,
+        offsets,
+        workers=workers,
+        engine=engine,
+        library_path=library_path,
+        cache=cache,
+        **kwargs,
+    ):
+        summary.add(logs)
+        if callback is not None:
+            callback(offset, logs)
+
+    return summary.to_frame()
+
+
+def iter_ensemble(
+    configs,
+    allocations,
+    weather,
+    offsets,
+    workers=None,
+    engine="simpy",
+    library_path=None,
+    cache=None,
+    **kwargs,
+):
+    """
+    Yield the offset and logs of each weather realization in `offsets` as
+    it completes. At most twice `workers` realizations are in flight. See
+    `run_ensemble` for parameters.
+    """
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        if not isinstance(weather, WeatherStore):
+            weather = WeatherStore.create(
+                os.path.join(tmp, "weather"), weather
+            )
+
+        path, cache = _prepare(tmp, library_path, cache)
+        kwargs = {**kwargs, "library_path": path, "cache": cache}
+        state = (list(configs), allocations, weather, engine, kwargs)
+
+        if not workers:
+            for offset in offsets:
+                yield offset, _run_realization(offset, *state)
+
+            return
+
+        offsets = iter(offsets)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_initialize_worker,
+            initargs=state,
+        ) as executor:
+            pending = {}
+            try:
+                while True:
+                    for offset in offsets:
+                        future = executor.submit(
+                            _run_worker_realization, offset
+                        )
+                        pending[future] = offset
+                        if len(pending) >= 2 * workers:
+                            break
+
+                    if not pending:
+                        break
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), future.result()
+
+            finally:
+                for future in pending:
+                    future.cancel()
+
+
+def _label(q):
+    """Return percentile label of quantile `q`, e.g. 'P90'."""
+
+    return f"P{q * 100:g}"
+
+
+def _run_realization(offset, configs, allocations, weather, engine, kwargs):
+    """Simulate `configs` with `weather` shifted by `offset`."""
+
+    manager = GlobalManager(
+        configs, allocations, weather=weather.shift(offset), **kwargs
+    )
+    manager.run(engine=engine)
+
+    return manager.logs
+
+
+def _initialize_worker(*state):
+    """Store the configurations, weather and arguments of a worker."""
+
+    global _ENSEMBLE
+    _ENSEMBLE = state
+
+
+def _run_worker_realization(offset):
+    """Simulate a realization with the state of an ensemble worker."""
+
+    return _run_realization(offset, *_ENSEMBLE)
@@ -0,0 +1,387 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import os
+import json
+import time
+import pickle
+import socket
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from multiprocessing.managers import BaseManager
+
+from CORAL.cache import _normalize
+
+STATUSES = ("pending", "leased", "done", "failed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS jobs (
+    scenario TEXT PRIMARY KEY,
+    allocations BLOB NOT NULL,
+    digest TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, expires);
+"""
+
+
+class JobStore:
+    """
+    Queue of sweep scenarios in a SQLite database, shared by worker
+    processes on one machine or served to other machines with
+    `serve_store`. Scenarios are leased to one worker at a time. Leases
+    that aren't completed before they expire, e.g. after a crash, are
+    leased again, and completed scenarios are never re-ran unless their
+    allocations change.
+    """
+
+    def __init__(self, path, lease=3600.0, key=None):
+        """
+        Creates an instance of `JobStore`.
+
+        Parameters
+        ----------
+        path : str
+            Path of the SQLite database, created if it doesn't exist.
+        lease : int | float
+            Seconds a leased scenario is reserved for its worker. Should be
+            longer than the longest scenario.
+        key : str | None
+            Identifies the configurations the scenarios are ran with. A
+            store created with a different key raises a `ValueError`, so
+            results of changed configurations aren't mixed.
+        """
+
+        self.path = path
+        self.lease_time = lease
+        self.key = key
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=60, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._add_digests()
+
+        if key is not None:
+            self._check_key(key)
+
+    def __reduce__(self):
+        return (self.__class__, (self.path, self.lease_time, self.key))
+
+    def close(self):
+        """Close the database connection."""
+
+        self._conn.close()
+
+    def submit(self, scenarios):
+        """
+        Add scenarios that aren't in the store. Scenarios whose allocations
+        changed since they were added, and failed scenarios, are queued
+        again. Returns the number of scenarios queued.
+
+        Parameters
+        ----------
+        scenarios : dict
+            Allocations per scenario name. Names must be JSON serializable.
+        """
+
+        with self._transaction() as conn:
+            digests = dict(conn.execute("SELECT scenario, digest FROM jobs"))
+
+            queued = 0
+            for name, allocations in scenarios.items():
+                name = json.dumps(name)
+                digest = allocations_digest(allocations)
+                if name not in digests:
+                    conn.execute(
+                        "INSERT INTO jobs (scenario, allocations, digest) "
+                        "VALUES (?, ?, ?)",
+                        (name, pickle.dumps(allocations), digest),
+                    )
+                    queued += 1
+
+                elif digests[name] != digest:
+                    # Results of the previous allocations are discarded.
+                    conn.execute(
+                        "UPDATE jobs SET allocations = ?, digest = ?, "
+                        "status = 'pending', worker = NULL, expires = NULL, "
+                        "attempts = 0, result = NULL, error = NULL "
+                        "WHERE scenario = ?",
+                        (pickle.dumps(allocations), digest, name),
+                    )
+                    queued += 1
+
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'pending', worker = NULL, "
+                "expires = NULL WHERE status = 'failed'"
+            )
+
+        return queued + cursor.rowcount
+
+    def lease(self, worker):
+        """
+        Return the name and allocations of the next pending scenario, or of
+        a scenario with an expired lease, leased to `worker`. Returns `None`
+        if no scenario can be leased.
+
+        Parameters
+        ----------
+        worker : str
+            Worker identifier, see `worker_id`.
+        """
+
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT scenario, allocations FROM jobs "
+                "WHERE status = 'pending' "
+                "OR (status = 'leased' AND expires < ?) "
+                "ORDER BY rowid LIMIT 1",
+                (now,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', worker = ?, expires = ?, "
+                "attempts = attempts + 1 WHERE scenario = ?",
+                (worker, now + self.lease_time, row[0]),
+            )
+
+        return json.loads(row[0]), pickle.loads(row[1])
+
+    def release(self, name):
+        """
+        Return leased scenario `name` to the queue.
+
+        Parameters
+        ----------
+        name : str | int
+            Scenario name.
+        """
+
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'pending', worker = NULL, "
+                "expires = NULL WHERE scenario = ? AND status = 'leased'",
+                (json.dumps(name),),
+            )
+
+    def complete(self, name, result):
+        """
+        Store `result` of leased scenario `name` and mark it done. Results
+        of scenarios queued again by `submit` while leased are ignored.
+
+        Parameters
+        ----------
+        name : str | int
+            Scenario name.
+        result : dict
+            JSON serializable scenario result.
+        """
+
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', expires = NULL, result = ?, "
+                "error = NULL WHERE scenario = ? AND status = 'leased'",
+                (json.dumps(result), json.dumps(name)),
+            )
+
+    def fail(self, name, error):
+        """
+        Mark scenario `name` as failed with message `error`. Failed
+        scenarios are queued again by `submit`.
+
+        Parameters
+        ----------
+        name : str | int
+            Scenario name.
+        error : str
+        """
+
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', expires = NULL, "
+                "error = ? WHERE scenario = ? AND status != 'done'",
+                (error, json.dumps(name)),
+            )
+
+    def counts(self):
+        """Return number of scenarios per status."""
+
+        counts = dict.fromkeys(STATUSES, 0)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+
+        counts.update(rows)
+        return counts
+
+    def finished(self):
+        """Return `True` if no scenario is pending or leased."""
+
+        counts = self.counts()
+        return counts["pending"] == 0 and counts["leased"] == 0
+
+    def results(self, names=None):
+        """
+        Return dictionary of the result of each completed scenario.
+
+        Parameters
+        ----------
+        names : iterable | None
+            Scenario names to return, if completed. Defaults to all.
+        """
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT scenario, result FROM jobs WHERE status = 'done'"
+            ).fetchall()
+
+        results = {json.loads(k): json.loads(v) for k, v in rows}
+        if names is None:
+            return results
+
+        return {k: results[k] for k in names if k in results}
+
+    def _add_digests(self):
+        """
+        Add the allocations digest to stores created without it, so changed
+        allocations of their scenarios are detected by `submit`.
+        """
+
+        with self._transaction() as conn:
+            columns = [r[1] for r in conn.execute("PRAGMA table_info(jobs)")]
+            if "digest" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN digest TEXT")
+
+            rows = conn.execute(
+                "SELECT scenario, allocations FROM jobs WHERE digest IS NULL"
+            ).fetchall()
+            for name, allocations in rows:
+                conn.execute(
+                    "UPDATE jobs SET digest = ? WHERE scenario = ?",
+                    (allocations_digest(pickle.loads(allocations)), name),
+                )
+
+    def _check_key(self, key):
+        """Store `key`, or raise if the store has a different key."""
+
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO meta VALUES ('key', ?)", (key,)
+            )
+            stored = conn.execute(
+                "SELECT value FROM meta WHERE name = 'key'"
+            ).fetchone()[0]
+
+        if stored != key:
+            raise ValueError(
+                f"Job store '{self.path}' was created for different "
+                "configurations."
+            )
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Run the enclosed block in an immediate transaction, which locks the
+        database against other writers. Threads sharing the connection
+        are serialized.
+        """
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            self._conn.execute("COMMIT")
+
+
+class _StoreManager(BaseManager):
+    """Serves a `JobStore` to workers on other machines."""
+
+    pass
+
+
+def serve_store(path, address, authkey, **kwargs):
+    """
+    Serve the `JobStore` at `path` to other machines until interrupted.
+    Workers connect with `connect_store`.
+
+    Parameters
+    ----------
+    path : str
+        Path of the SQLite database.
+    address : tuple
+        `(host, port)` to listen on.
+    authkey : bytes
+        Shared secret of the coordinator and its workers.
+    kwargs : dict
+        Passed to `JobStore`.
+    """
+
+    store = JobStore(path, **kwargs)
+    manager = _StoreManager(address=address, authkey=authkey)
+    _StoreManager.register("store", callable=lambda: store)
+    manager.get_server().serve_forever()
+
+
+def connect_store(address, authkey):
+    """
+    Return proxy of a `JobStore` served by `serve_store`, with the same
+    methods.
+
+    Parameters
+    ----------
+    address : tuple
+        `(host, port)` of the coordinator.
+    authkey : bytes
+        Shared secret of the coordinator and its workers.
+    """
+
+    manager = _StoreManager(address=address, authkey=authkey)
+    _StoreManager.register("store")
+    manager.connect()
+
+    return manager.store()
+
+
+def allocations_digest(allocations):
+    """
+    Return canonical hash of the allocations of a scenario.
+
+    Parameters
+    ----------
+    allocations : dict
+        Allocations of a scenario, see `GlobalManager`.
+    """
+
+    encoded = json.dumps(
+        _normalize(allocations), sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def worker_id():
+    """Return identifier of this process, unique across machines."""
+
+    return f"{socket.gethostname()}:{os.getpid()}"
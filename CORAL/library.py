@@ -5,34 +5,93 @@ __email__ = "jake.nunemaker@nrel.gov"
 
 
 import os
+import pickle
+import hashlib
+from functools import partial
+from collections import Counter, defaultdict
 
 import yaml
-from simpy import Resource
-from ORBIT.core.library import loader, default_library
-
-CATEGORY_MAP = {"wtiv": "vessels", "feeder": "vessels", "port": "ports"}
+from simpy import Event, Resource
+
+from CORAL.results import Timeline
+from CORAL.scheduling import get_scheduler
+
+CATEGORY_MAP = {
+    "wtiv": "vessels",
+    "feeder": "vessels",
+    "spi_vessel": "vessels",
+    "oss_install_vessel": "vessels",
+    "array_cable_install_vessel": "vessels",
+    "array_cable_bury_vessel": "vessels",
+    "array_cable_trench_vessel": "vessels",
+    "export_cable_install_vessel": "vessels",
+    "export_cable_bury_vessel": "vessels",
+    "export_cable_trench_vessel": "vessels",
+    "mooring_install_vessel": "vessels",
+    "support_vessel": "vessels",
+    "towing_vessel": "vessels",
+    "port": "ports",
+}
+
+_ITEMS = {}
+_SNAPSHOTS = {}
+
+# Event priority after simpy's URGENT (0) and NORMAL (1).
+LOW = 2
 
 
 class SharedLibrary:
     """Class used to model shared library resources for ORBIT simulations."""
 
-    def __init__(self, env, allocations, path=None):
+    def __init__(
+        self,
+        env,
+        allocations,
+        path=None,
+        profiler=None,
+        scheduler=None,
+        coalesce=False,
+    ):
         """
         Creates an instance of `SharedLibrary`.
 
         Parameters
         ----------
         path : str
-            Path to shared resource library.
+            Path to shared resource library or to a library snapshot created
+            with `compile_library`.
         allocations : dict
             Number of each library item that exists in the shared environment.
+        profiler : Profiler | None
+            Records time spent checking requests and queue lengths.
+        scheduler : str | Scheduler | None
+            Policy deciding which waiting request is granted next, see
+            `CORAL.scheduling.SCHEDULERS`. Defaults to first in, first out.
+        coalesce : bool
+            If `True`, pools that gain capacity are only marked and waiting
+            requests are matched in a single pass after every other event at
+            the current time, instead of once per released resource.
+            Requests submitted while a pass is pending join that pass, so
+            they can't take capacity ahead of older requests. Requires the
+            environment to be running. Grants can differ from per-release
+            checks, which may let a younger request take a pool that an
+            older request is waiting on along with a pool released later at
+            the same time.
         """
 
         self.env = env
+        self.profiler = profiler
+        self.scheduler = get_scheduler(scheduler)
+        self.coalesce = coalesce
         self._alloc = allocations
         self._resources = {}
         self._requests = []
-        self._processed = []
+        self._processed = {}
+        self._queued = Counter()
+        self._holders = defaultdict(dict)
+        self._dirty = {}
+        self._pass = None
+        self._snapshot = None
 
         self.initialize_library_path(path)
         self.initialize_shared_resources()
@@ -63,13 +122,35 @@ class SharedLibrary:
     def processed_requests(self):
         """Return previously processed requests."""
 
-        return self._processed
+        return list(self._processed)
 
     @property
     def unprocessed_requests(self):
         """Return unprocessed requests."""
 
-        return [r for r in self._requests if r not in self._processed]
+        return list(self.scheduler.waiting)
+
+    @property
+    def now(self):
+        """Return current simulation time."""
+
+        return self.env.now
+
+    def is_full(self, pool):
+        """Return `True` if `(category, name)` pool is at capacity."""
+
+        return self.free(pool) == 0
+
+    def free(self, pool):
+        """Return number of free resources in `(category, name)` pool."""
+
+        resource = self.resources[pool[0]][pool[1]]
+        return resource.capacity - resource.count
+
+    def holders(self, pool):
+        """Return granted requests holding `(category, name)` pool."""
+
+        return self._holders[pool]
 
     def request(self, request):
         """
@@ -81,57 +162,217 @@ class SharedLibrary:
         """
 
         self._requests.append(request)
-        self.check_requests()
+        for pool in request.pools:
+            self._queued[pool] += 1
+
+        if self._pass is not None:
+            self.scheduler.defer(request)
+
+        elif self.scheduler.submit(request, self):
+            self._grant(request)
+            self._dequeue(request)
+
+        self._update_queues(request)
+        if self.profiler is not None:
+            waiting = len(self.scheduler.waiting)
+            self.profiler.record_queue(self.env.now, None, waiting)
 
         return {
             k: self.resources[k][v].data for k, v in request.resources.items()
         }
 
-    def release(self, request):
+    def release(self, request, categories=None):
         """
         Release requests of `SharedResources` associated with MultiRequest
-        `request`.
+        `request`. Resources that were already released are skipped.
 
         Parameters
         ----------
         request : MultiRequest
+        categories : list | None
+            Resource categories to release, e.g. `['wtiv']`. Defaults to
+            every resource held by `request`.
         """
 
         for k, v in request.resources.items():
 
+            if categories is not None and k not in categories:
+                continue
+
+            holders = self._holders[(k, v)]
+            if request not in holders:
+                continue
+
+            del holders[request]
             try:
                 self.resources[k][v].release(request.requests[k])
 
             except RuntimeError:
                 pass
 
-    def check_requests(self):
+    def check_requests(self, pool=None):
         """
         Check unprocessed requests for any projects that can start. This method
         is called as shared resources are released from completed projects.
+
+        Parameters
+        ----------
+        pool : tuple | None
+            `(category, name)` of the resource pool that changed. Only
+            requests parked on this pool by the scheduler are re-examined. If
+            `None`, all unprocessed requests are checked.
         """
 
-        for request in self.unprocessed_requests:
-            proceed = True
+        if pool is None:
+            self._check_requests(self.scheduler.wake_all(self))
 
-            for k, v in request.resources.items():
-                if self.resources[k][v].capacity == self.resources[k][v].count:
-                    proceed = False
-                    break
+        else:
+            self._check_requests(self.scheduler.wake(pool, self), pool)
+
+    def notify(self, pool):
+        """
+        Notify the library that `pool` gained capacity. Waiting requests are
+        checked immediately, or in the pending pass if `self.coalesce`.
 
-            if proceed:
-                request.requests = {
-                    k: self.resources[k][v].request()
-                    for k, v in request.resources.items()
-                }
+        Parameters
+        ----------
+        pool : tuple
+            `(category, name)` of the resource pool that changed.
+        """
 
-                self._processed.append(request)
+        if not self.coalesce:
+            self.check_requests(pool)
+            return
+
+        self._dirty[pool] = None
+        if self._pass is None:
+            # Triggered event scheduled after every other event at this time.
+            self._pass = Event(self.env)
+            self._pass._ok = True
+            self._pass._value = None
+            self._pass.callbacks.append(self._run_pass)
+            self.env.schedule(self._pass, priority=LOW)
+
+    def _run_pass(self, event):
+        """Match waiting requests against every pool marked since the last
+        pass."""
+
+        pools = list(self._dirty)
+        self._dirty = {}
+        self._pass = None
+        self._check_requests(self.scheduler.wake_many(pools, self))
+
+    def _check_requests(self, requests, pool=None):
+        """
+        Grant each of `requests` yielded by the scheduler, timed if
+        profiling.
 
-                try:
-                    request.trigger.succeed()
+        Parameters
+        ----------
+        requests : iterator
+        pool : tuple | None
+            Pool recorded by the profiler.
+        """
+
+        if self.profiler is None:
+            self._grant_all(requests)
+            return
+
+        with self.profiler.stage("check_requests"):
+            self._grant_all(requests)
+
+        waiting = len(self.scheduler.waiting)
+        self.profiler.record_queue(self.env.now, pool, waiting)
+
+    def _grant_all(self, requests):
+        """Grant and dequeue each of `requests`."""
+
+        for request in requests:
+            self._grant(request)
+            self._dequeue(request)
+
+    def _grant(self, request):
+        """
+        Request each shared resource in `request` and trigger it.
+
+        Parameters
+        ----------
+        request : MultiRequest
+        """
+
+        request.requests = {
+            k: self.resources[k][v].request()
+            for k, v in request.resources.items()
+        }
+
+        self._processed[request] = None
+        for pool in request.pools:
+            self._holders[pool][request] = None
+
+        try:
+            request.trigger.succeed()
+
+        except RuntimeError:
+            pass
+
+    def _dequeue(self, request):
+        """
+        Remove `request` from the wait queue lengths.
+
+        Parameters
+        ----------
+        request : MultiRequest
+        """
+
+        for pool in request.pools:
+            self._queued[pool] -= 1
+
+        self._update_queues(request)
+
+    def _update_queues(self, request):
+        """
+        Update the queue lengths of the resource pools in `request`.
+
+        Parameters
+        ----------
+        request : MultiRequest
+        """
+
+        for k, v in request.pools:
+            self.resources[k][v].set_queue(self._queued[(k, v)])
+
+    def utilization(self, end=None):
+        """
+        Return `pd.DataFrame` of utilization statistics per resource pool,
+        see `Timeline.stats`.
+
+        Parameters
+        ----------
+        end : int | float | None
+            End of the period. Defaults to the last change to any pool.
+        """
+
+        resources = {
+            (k, name): resource
+            for k, data in self.resources.items()
+            for name, resource in data.items()
+        }
+
+        import pandas as pd
+
+        if end is None:
+            end = max(
+                (r.timeline.data[-1, 0] for r in resources.values()),
+                default=0,
+            )
+
+        frame = pd.DataFrame.from_dict(
+            {k: r.utilization(end) for k, r in resources.items()},
+            orient="index",
+        )
+        frame.index.names = ["category", "name"]
 
-                except RuntimeError:
-                    pass
+        return frame
 
     def initialize_library_path(self, path):
         """
@@ -144,11 +385,16 @@ class SharedLibrary:
         """
 
         if path is None:
+            from ORBIT.core.library import default_library
+
             self._path = default_library
 
         else:
             self._path = path
 
+        if os.path.isfile(self._path):
+            self._snapshot = load_snapshot(self._path)
+
     def initialize_shared_resources(self):
         """Initializes shared resources in `self._alloc`."""
 
@@ -165,7 +411,11 @@ class SharedLibrary:
 
                 try:
                     resource = SharedResource(
-                        self.env, cap, path, self.check_requests
+                        self.env,
+                        cap,
+                        path,
+                        partial(self.notify, (key, name)),
+                        data=self._get_snapshot_item(category, name),
                     )
                     resources[name] = resource
 
@@ -178,11 +428,31 @@ class SharedLibrary:
 
             self._resources[key] = resources
 
+    def _get_snapshot_item(self, category, name):
+        """
+        Return data for library item `name` in `category` from the library
+        snapshot or `None` if the library isn't a snapshot.
+
+        Parameters
+        ----------
+        category : str
+        name : str
+        """
+
+        if self._snapshot is None:
+            return None
+
+        try:
+            return self._snapshot[f"{category}/{name}"]
+
+        except KeyError:
+            raise FileNotFoundError(name)
+
 
 class SharedResource(Resource):
     """Class to represent a shared set of resources."""
 
-    def __init__(self, env, capacity, path, callback=None):
+    def __init__(self, env, capacity, path, callback=None, data=None):
         """
         Creates an instance of `SharedResource`.
 
@@ -196,19 +466,78 @@ class SharedResource(Resource):
             Path to library item
         callback : simpy.Event | None
             Function to call on successful resource release.
+        data : dict | None
+            Pre-loaded library data. If `None`, data is loaded from `path`.
         """
 
         super().__init__(env, capacity)
-        self.load_data(path)
+        if data is None:
+            self.load_data(path)
+
+        else:
+            self.data = data
+
         self.callback = callback
+        self.queue = 0
+        self.timeline = Timeline()
+        self.record()
+
+    def record(self):
+        """Append the current state of the pool to `self.timeline`."""
+
+        self.timeline.record(
+            self._env.now, self._capacity, len(self.users), self.queue
+        )
+
+    def set_queue(self, length):
+        """
+        Set the number of requests waiting on the pool.
+
+        Parameters
+        ----------
+        length : int
+        """
+
+        if length != self.queue:
+            self.queue = length
+            self.record()
+
+    def add_capacity(self, num=1):
+        """
+        Add `num` resources to the pool.
+
+        Parameters
+        ----------
+        num : int
+        """
+
+        self._capacity += num
+        self.record()
+
+    def utilization(self, end=None):
+        """
+        Return utilization statistics of the pool, see `Timeline.stats`.
+
+        Parameters
+        ----------
+        end : int | float | None
+            End of the period. Defaults to the last change to the pool.
+        """
+
+        return self.timeline.stats(end)
+
+    def request(self, *args, **kwargs):
+        """Request a resource from the pool."""
+
+        req = super().request(*args, **kwargs)
+        self.record()
+
+        return req
 
     def load_data(self, path):
         """Load library data for eventual insert into ORBIT config."""
 
-        with open(path, "r") as f:
-            data = yaml.load(f, Loader=loader)
-
-        self.data = data
+        self.data = load_library_item(path)
 
     def release(self, req):
         """
@@ -223,5 +552,130 @@ class SharedResource(Resource):
         # TODO: Error handling if request doesn't exist?
 
         super().release(req)
+        self.record()
         if self.callback is not None:
             self.callback()
+
+
+def load_library_item(path):
+    """
+    Return parsed library item at `path`. Items are cached for the life of
+    the process and re-parsed only if the file is modified. The returned data
+    is shared between callers and should not be modified.
+
+    Parameters
+    ----------
+    path : str
+        Path to library item.
+    """
+
+    mtime = os.stat(path).st_mtime_ns
+    try:
+        cached, data = _ITEMS[path]
+        if cached == mtime:
+            return data
+
+    except KeyError:
+        pass
+
+    from ORBIT.core.library import loader
+
+    with open(path, "r") as f:
+        data = yaml.load(f, Loader=loader)
+
+    _ITEMS[path] = (mtime, data)
+    return data
+
+
+def compile_library(path, output):
+    """
+    Parse every library item in the library at `path` and write them to a
+    single snapshot at `output`, which can be used as the `path` of a
+    `SharedLibrary`. Snapshots are pickled and should only be loaded from
+    trusted sources.
+
+    Parameters
+    ----------
+    path : str
+        Path to shared resource library.
+    output : str
+        Path of the snapshot file.
+    """
+
+    items = {}
+    for item, filepath in _iter_library_files(path):
+        items[item] = load_library_item(filepath)
+
+    with open(output, "wb") as f:
+        pickle.dump(items, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    return output
+
+
+def library_fingerprint(path):
+    """
+    Return hash of the contents of the library or snapshot at `path`.
+
+    Parameters
+    ----------
+    path : str
+        Path to shared resource library or a snapshot created with
+        `compile_library`.
+    """
+
+    h = hashlib.sha256()
+    if os.path.isfile(path):
+        with open(path, "rb") as f:
+            h.update(f.read())
+
+        return h.hexdigest()
+
+    for item, filepath in _iter_library_files(path):
+        h.update(item.encode())
+        with open(filepath, "rb") as f:
+            h.update(hashlib.sha256(f.read()).digest())
+
+    return h.hexdigest()
+
+
+def _iter_library_files(path):
+    """Yield name and path of each library item in the library at `path`."""
+
+    for category in sorted(set(CATEGORY_MAP.values())):
+        directory = os.path.join(path, category)
+        if not os.path.isdir(directory):
+            continue
+
+        for filename in sorted(os.listdir(directory)):
+            name, ext = os.path.splitext(filename)
+            if ext not in (".yaml", ".yml"):
+                continue
+
+            yield f"{category}/{name}", os.path.join(directory, filename)
+
+
+def load_snapshot(path):
+    """
+    Return library items from snapshot at `path`, cached for the life of the
+    process and re-read only if the file is modified.
+
+    Parameters
+    ----------
+    path : str
+        Path of a snapshot created with `compile_library`.
+    """
+
+    mtime = os.stat(path).st_mtime_ns
+    try:
+        cached, items = _SNAPSHOTS[path]
+        if cached == mtime:
+            return items
+
+    except KeyError:
+        pass
+
+    with open(path, "rb") as f:
+        items = pickle.load(f)
+
+    _SNAPSHOTS[path] = (mtime, items)
+    return items
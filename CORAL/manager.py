@@ -4,22 +4,36 @@ __maintainer__ = "Jake Nunemaker"
 __email__ = "jake.nunemaker@nrel.gov"
 
 
+import asyncio
 import datetime as dt
-from copy import deepcopy
-from collections import Counter
+from time import perf_counter
+from functools import partial, lru_cache
+from contextlib import nullcontext
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
-from ORBIT import ProjectManager
 from simpy import Event, Environment
-
+from simpy.events import URGENT
+
+from CORAL.cache import ProjectResult, project_key, weather_fingerprint
+from CORAL.config import LayeredConfig, flatten
+from CORAL.engine import FastEngine
+from CORAL.profile import Profiler
+from CORAL.sinks import open_sink
+from CORAL.results import ResultsTable, project_record
+from CORAL.scheduling import get_scheduler
+from CORAL.weather import WeatherStore
 from CORAL.library import SharedLibrary
 
+ENGINES = ("simpy", "fast")
+
 
 class MultiRequest:
     """Object used to hold multiple simpy.Requests and interface with
     `SharedLibrary` instance."""
 
-    def __init__(self, env, resources, name):
+    def __init__(self, env, resources, name, priority=0, start=None):
         """
         Creates an instance of `MultiRequest`.
 
@@ -27,64 +41,262 @@ class MultiRequest:
         ----------
         env : simpy.Environment
         resources : dict
+        name : str
+        priority : int | float
+            Scheduling priority, larger values are granted first by the
+            'priority' scheduler.
+        start : int | float | None
+            Requested start time. Defaults to `env.now`.
         """
 
         self.trigger = Event(env)
         self.resources = resources
+        self.pools = list(resources.items())
         self.name = name
+        self.priority = priority
+        self.start = env.now if start is None else start
+        self.duration = None
+        self.finish = None
 
     def __str__(self) -> str:
         return f"MultiRequest object for {self.name}"
 
 
+class OffloadedRun(Event):
+    """
+    Event that resumes a project once its ORBIT run, offloaded by
+    `GlobalManager.run_async`, is complete. The project is resumed before
+    any other event at the same time, as if ORBIT ran inline.
+    """
+
+    def __init__(self, env, config, idx, region, name, key=None):
+        """
+        Creates an instance of `OffloadedRun`.
+
+        Parameters
+        ----------
+        env : simpy.Environment
+        config : dict
+            Final ORBIT configuration.
+        idx : int
+            Index of the project start in the weather profile.
+        region : str | None
+            Weather region if the weather is a `WeatherStore`.
+        name : str
+            Project handle.
+        key : str | None
+            Cache key of the run, if results are cached or speculated.
+        """
+
+        super().__init__(env)
+        self.config = config
+        self.idx = idx
+        self.region = region
+        self.name = name
+        self.key = key
+
+    def resolve(self):
+        """Schedule the project to resume ahead of other events."""
+
+        self._ok = True
+        self._value = None
+        self.env.schedule(self, priority=URGENT - 1)
+
+
 class GlobalManager:
     """Class to manage concurrent ORBIT simulations with shared resources."""
 
-    def __init__(self, configs, allocations, weather=None, library_path=None):
+    def __init__(
+        self,
+        configs,
+        allocations,
+        weather=None,
+        library_path=None,
+        cache=None,
+        workers=None,
+        profile=False,
+        callbacks=None,
+        scheduler=None,
+        leasing=False,
+        partition=False,
+        checkpoints=None,
+        sink=None,
+        drop_finished=False,
+        coalesce=False,
+    ):
         """
         Creates an instance of `GlobalManager`.
 
         Parameters
         ----------
         configs : list
-            List of ORBIT configurations to run.
+            List of ORBIT configurations to run. Configurations are not
+            copied, changes made by the manager are held in a
+            `LayeredConfig` on top of each configuration.
         library_path : str
             Path to shared library items.
         allocations : dict
             Number of each library item that exists in the shared environment.
+        weather : pd.DataFrame | WeatherStore | None
+            Hourly weather profile starting at the simulation start. With a
+            `WeatherStore`, each project uses the region matching its port
+            pool or nearest to its 'project_coords'.
+        cache : ProjectCache | None
+            Cache of ORBIT project results. Projects with a final
+            configuration and weather start index that were previously ran
+            are not re-ran.
+        workers : int | None
+            Number of worker processes used to run ORBIT projects ahead of
+            the simulation. Each project is speculatively ran from its
+            earliest possible start. Projects that are delayed by shared
+            resources are re-ran once their actual start is known.
+        profile : bool
+            Record time per stage, ORBIT wall time per project and queue
+            lengths, available as `GlobalManager.profile`.
+        callbacks : list | None
+            Functions called with the event name and event data as the
+            simulation progresses, see `Profiler`. Implies `profile`.
+        scheduler : str | Scheduler | None
+            Policy deciding which waiting project is granted shared
+            resources next: 'fifo' (default), 'priority', 'earliest_start'
+            or 'backfill'. Priorities are read from 'project_priority' in
+            each configuration.
+        leasing : bool
+            Release each shared resource once the last ORBIT install phase
+            that uses it is finished, instead of holding every shared
+            resource until the project finishes. Resources are still taken
+            at the project start. Phases are matched to resources by the
+            configuration keys they expect, and resources that aren't used
+            by any known phase are held for the whole project.
+        partition : bool
+            Simulate groups of projects that share no resource pools, see
+            `GlobalManager.components`, in separate worker processes
+            instead of speculatively running ORBIT projects. Requires
+            `workers`. The simulation is then ran with the ORBIT results
+            of the workers, so logs and resource utilization match a single
+            simulation. Each worker uses a copy of `cache`, so use a
+            `ProjectCache` with a `path` to share results between them.
+            ORBIT run times are only profiled in the workers.
+        checkpoints : int | float | None
+            Interval in hours between checkpoints of the 'fast' engine,
+            used by `GlobalManager.resimulate`. The 'simpy' engine can't be
+            checkpointed.
+        sink : ResultSink | str | None
+            Sink that each project record is written to as the project
+            finishes, see `CORAL.results.project_record`. Paths are opened
+            with `CORAL.sinks.open_sink` and closed after `run`. Buffered
+            records are written at the end of `run`.
+        drop_finished : bool
+            Drop the configuration and results of each project once it is
+            finished and written to `sink`, so memory doesn't grow with the
+            number of finished projects. `GlobalManager.results` is empty
+            and `GlobalManager.resimulate` is unavailable. Requires `sink`.
+        coalesce : bool
+            Match waiting projects against every pool released at the same
+            time in a single pass, instead of checking each pool as it is
+            released, see `SharedLibrary`. Reduces scheduling overhead with
+            many simultaneous releases, but can change which projects are
+            granted shared resources first.
         """
 
-        self._logs = []
+        if drop_finished and sink is None:
+            raise ValueError("'drop_finished' requires a 'sink'.")
+
         self._counter = Counter()
         self._weather = weather
+        self._weather_fingerprint = None
+        self._cache = cache
+        self._workers = workers
+        self._projects = []
+        self._futures = {}
+        self._speculative = {}
+        self._references = Counter()
+        self._additions = []
+        self._estimates = {}
+        self._partitioned = {}
+        self._orbit_results = None
         self._alloc = allocations
-        self.configs = [deepcopy(config) for config in configs]
+        self._scheduler = scheduler
+        self._leasing = leasing
+        self._coalesce = coalesce
+        self._partition = partition
+        self._library_path = library_path
+        self._checkpoints = checkpoints
+        self._fast = None
+        self._ran = False
+        self._started = {}
+        self._history = {}
+        self._index = {}
+        self._owns_sink = isinstance(sink, str)
+        self.sink = open_sink(sink) if self._owns_sink else sink
+        self._drop_finished = drop_finished
+        self._progress = None
+        self._offloaded = None
+        self._profiler = Profiler(callbacks) if profile or callbacks else None
+        self._configs = [LayeredConfig(config) for config in configs]
         self._start = self._get_internal_start_date()
+        self._results = ResultsTable(self._start)
 
         self.initialize_shared_environment()
-        self.library = SharedLibrary(self.env, self._alloc, path=library_path)
-        self.setup()
+        with self._stage("library"):
+            self.library = SharedLibrary(
+                self.env,
+                self._alloc,
+                path=library_path,
+                profiler=self._profiler,
+                scheduler=scheduler,
+                coalesce=coalesce,
+            )
+
+        with self._stage("setup"):
+            self.setup()
 
     def _get_internal_start_date(self):
         """Return minimum start_date (int or datetime). Used internally."""
-        return min([config["project_start"] for config in self.configs])
+        return min([config["project_start"] for config in self._configs])
+
+    @property
+    def configs(self):
+        """
+        Return list of project configurations as plain dictionaries,
+        including changes made by the manager. Dropped projects, see
+        `drop_finished`, are `None`.
+        """
+
+        return [flatten(c) if c is not None else None for c in self._configs]
 
     @property
     def logs(self):
         """Return post-processed logs."""
 
-        processed = []
-        for log in self._logs:
+        return self._results.to_records()
 
-            new = deepcopy(log)
-            if isinstance(self._start, dt.datetime):
-                for k in ["Initialized", "Started", "Finished"]:
-                    idx = int(np.ceil(log[k]))
-                    new[f"Date {k}"] = self._start + dt.timedelta(hours=idx)
+    @property
+    def results(self):
+        """
+        Return `pd.DataFrame` of finished projects with start, finish and
+        wait times, dates if the simulation start is a datetime and the shared
+        resource pool used per resource category.
+        """
+
+        return self._results.to_frame().copy()
 
-            processed.append(new)
+    @property
+    def profile(self):
+        """
+        Return `Profiler` of the simulation, or `None` if the manager was
+        created without `profile` or `callbacks`.
+        """
 
-        return processed
+        return self._profiler
+
+    def _stage(self, name):
+        """Return context timing stage `name` if profiling."""
+
+        if self._profiler is None:
+            return nullcontext()
+
+        return self._profiler.stage(name)
 
     def initialize_shared_environment(self):
         """Initializes `simpy.Environment` for managing shared resources."""
@@ -94,12 +306,15 @@ class GlobalManager:
     def setup(self):
         """Initialize the projects."""
 
-        for config in self.configs:
+        for config in self._configs:
 
             name = self._get_unique_name(config.pop("project_name", "Project"))
             start = config.pop("project_start", 0)
+            priority = config.pop("project_priority", 0)
 
-            self.env.process(self._initialize(name, start, config))
+            self._index[name] = len(self._projects)
+            self._projects.append((name, start, config, priority))
+            self.env.process(self._initialize(name, start, config, priority))
 
     def _get_unique_name(self, name):
         """
@@ -117,12 +332,681 @@ class GlobalManager:
 
         return f"{name} {self._counter[name]}"
 
-    def run(self):
-        """Main simulation run method."""
+    def run(self, engine="simpy"):
+        """
+        Main simulation run method.
+
+        Parameters
+        ----------
+        engine : str
+            Scheduling backend. 'simpy' runs each project as a simpy process.
+            'fast' schedules the same projects with a heap based event loop
+            and produces the same logs.
+
+        The simulation runs once, later calls are a no-op.
+        """
+
+        if engine not in ENGINES:
+            raise ValueError(
+                f"Engine '{engine}' not recognized. Options: {ENGINES}"
+            )
+
+        if self._ran:
+            return
+
+        self._ran = True
+        try:
+            self._run(engine)
+
+        finally:
+            self._flush_sink()
+
+    async def run_async(self, executor=None, steps=1000):
+        """
+        Run the simulation with the 'simpy' engine without blocking the
+        asyncio event loop, yielding progress events as `(event, data)`
+        tuples. Events are 'initialized', 'started' and 'finished' with the
+        project log, and 'time' with the simulation time after each slice
+        of `steps` simpy events that advances it. ORBIT runs are offloaded
+        to `executor` and the logs match `GlobalManager.run`. With
+        `workers`, projects are also speculatively ran in worker processes.
+
+        Closing the iterator or cancelling the task consuming it stops the
+        simulation and cancels pending ORBIT runs. Finished projects are
+        kept in the results, but the manager can't be resumed. Like
+        `GlobalManager.run`, the simulation runs once and no events are
+        yielded if the manager has already run.
+
+        Parameters
+        ----------
+        executor : concurrent.futures.Executor | None
+            Executor of ORBIT runs. Defaults to the worker processes if
+            `workers`, otherwise the default executor of the event loop.
+        steps : int
+            Number of simpy events processed before yielding control to the
+            event loop.
+        """
+
+        if self._ran:
+            return
+
+        self._ran = True
+        pool = None
+        if self._workers:
+            pool = ProcessPoolExecutor(max_workers=self._workers)
+            executor = executor if executor is not None else pool
+
+        now = None
+        self._progress = deque()
+        try:
+            if pool is not None:
+                with self._stage("dispatch"):
+                    self._dispatch_projects(pool)
+
+            with self._stage("run"):
+                while not self._step_async(steps):
+                    while self._progress:
+                        yield self._progress.popleft()
+
+                    if self.env.now != now:
+                        now = self.env.now
+                        yield "time", {"time": now}
+
+                    if self._offloaded is not None:
+                        await self._resolve_offloaded(executor)
+
+                    else:
+                        await asyncio.sleep(0)
+
+                while self._progress:
+                    yield self._progress.popleft()
+
+                yield "time", {"time": self.env.now}
+
+        finally:
+            self._progress = None
+            self._offloaded = None
+            if pool is not None:
+                for future in self._futures.values():
+                    future.cancel()
+
+                pool.shutdown(wait=False)
+                self._futures = {}
+                self._speculative = {}
+                self._references.clear()
+
+            self._flush_sink()
+
+    def _step_async(self, steps):
+        """
+        Process up to `steps` simpy events, stopping early if a project is
+        waiting on an offloaded ORBIT run. Returns `True` once the
+        simulation is finished.
+
+        Parameters
+        ----------
+        steps : int
+        """
+
+        for _ in range(steps):
+            if self._offloaded is not None:
+                return False
+
+            if self.env.peek() == float("inf"):
+                return True
+
+            self.env.step()
+
+        return self._offloaded is None and self.env.peek() == float("inf")
+
+    def _offload(self, config, region, name):
+        """
+        Return `OffloadedRun` of project `name` started now if it must be
+        ran by ORBIT, or `None` if `_run_project` can return its result
+        without running ORBIT or waiting on a worker.
+
+        Parameters
+        ----------
+        config : dict
+            Final ORBIT configuration.
+        region : str | None
+            Weather region if `self._weather` is a `WeatherStore`.
+        name : str
+            Project handle.
+        """
+
+        idx = int(np.ceil(self.env.now))
+        estimate = self._estimates.get(name, None)
+        if estimate is not None and estimate[0] == idx:
+            return None
+
+        key = None
+        if self._cache is not None or self._futures:
+            key = self._get_project_key(config, idx, region)
+            if self._cache is not None and key in self._cache:
+                return None
+
+            future = self._futures.get(key, None)
+            if future is not None and future.done():
+                return None
+
+        self._offloaded = OffloadedRun(
+            self.env, config, idx, region, name, key
+        )
+        return self._offloaded
+
+    async def _resolve_offloaded(self, executor=None):
+        """
+        Run the ORBIT project of `self._offloaded` in `executor`, or wait
+        for its speculative run, and resume the project.
+
+        Parameters
+        ----------
+        executor : concurrent.futures.Executor | None
+        """
+
+        run, self._offloaded = self._offloaded, None
+        future = self._futures.get(run.key, None)
+        if future is not None:
+            # The finished future is used by `_run_project`.
+            await asyncio.wrap_future(future)
+            run.resolve()
+            return
+
+        start = perf_counter()
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            executor,
+            _run_orbit,
+            flatten(run.config),
+            *self._get_orbit_args(run.idx, run.region),
+        )
+
+        if self._cache is not None:
+            self._cache.set(run.key, result)
+
+        if self._profiler is not None:
+            self._profiler.record_project(
+                run.name, self.env.now, perf_counter() - start, "orbit"
+            )
+
+        self._estimates[run.name] = (run.idx, result)
+        run.resolve()
+
+    def _flush_sink(self):
+        """Write buffered records to the sink, closing it if owned."""
+
+        if self.sink is not None:
+            self.sink.flush()
+            if self._owns_sink:
+                self.sink.close()
+
+    def _emit(self, event, data):
+        """
+        Pass `event` to the profiler and to the progress events of
+        `run_async`.
+
+        Parameters
+        ----------
+        event : str
+        data : dict
+        """
+
+        if self._progress is not None:
+            self._progress.append((event, data))
+
+        if self._profiler is not None:
+            self._profiler.emit(event, data)
+
+    def _run(self, engine):
+        """
+        Run the simulation, dispatching ORBIT projects or independent
+        groups of projects to worker processes if `self._workers`.
+
+        Parameters
+        ----------
+        engine : str
+        """
+
+        if not self._workers:
+            with self._stage("run"):
+                self._run_engine(engine)
+
+            return
+
+        if self._partition:
+            with self._stage("partition"):
+                self._run_partitions(engine)
+
+            with self._stage("run"):
+                self._run_engine(engine)
+
+            return
+
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            try:
+                with self._stage("dispatch"):
+                    self._dispatch_projects(executor)
+
+                with self._stage("run"):
+                    self._run_engine(engine)
+
+            finally:
+                for future in self._futures.values():
+                    future.cancel()
+
+                self._futures = {}
+                self._speculative = {}
+                self._references.clear()
+
+    def _run_engine(self, engine):
+        """
+        Run the simulation with scheduling backend `engine`.
+
+        Parameters
+        ----------
+        engine : str
+        """
+
+        if engine == "simpy":
+            self.env.run()
+
+        else:
+            self._run_fast()
+
+    def _run_fast(self):
+        """Run the simulation with `FastEngine`."""
+
+        pools = {
+            (k, name): resource
+            for k, data in self.library.resources.items()
+            for name, resource in data.items()
+        }
+
+        fast = FastEngine(
+            {pool: resource.capacity for pool, resource in pools.items()},
+            profiler=self._profiler,
+            timelines={pool: r.timeline for pool, r in pools.items()},
+            scheduler=get_scheduler(self._scheduler),
+            checkpoint=self._checkpoints,
+            coalesce=self._coalesce,
+        )
+
+        for name, start, config, priority in self._projects:
+            idx = self._get_start_idx(start)
+            resources = self._get_shared_resources(config)
+            estimate = None
+            if fast.scheduler.estimates:
+                estimate = self._estimate(name, config, idx)
+
+            fast.add_project(name, idx, resources, priority, estimate)
+
+        for category, name, delay in self._additions:
+            fast.add_capacity((category, name), delay)
+
+        self._fast = fast
+        self._resume_fast()
+
+    def _resume_fast(self):
+        """Run `self._fast` until all projects are finished."""
+
+        self._fast.run(
+            self._fast_duration,
+            self._fast_blocked,
+            self._fast_finished,
+            self._fast_leases if self._leasing else None,
+        )
+
+    def _fast_duration(self, i, now):
+        """Return project time of project `i` started at `now`."""
+
+        name, _, config, _ = self._projects[i]
+        self._emit("started", {"name": name, "time": now})
+
+        # Results are kept by start for `resimulate`.
+        key = (i, int(np.ceil(now)))
+        result = self._history.get(key, None)
+        if result is None:
+            region = self._get_weather_region(config)
+            final = self._get_final_config(config)
+            result = self._run_project(final, now, region, name)
+            if not self._drop_finished:
+                self._history[key] = result
+
+        self._started[i] = result
+        return result.project_time
+
+    def _fast_leases(self, i):
+        """Return early release times of the resource pools of project `i`."""
+
+        resources = dict(self._get_shared_resources(self._projects[i][2]))
+        ends = self._get_leases(resources, self._started.pop(i))
+        return {(k, resources[k]): end for k, end in ends.items()}
+
+    def _fast_blocked(self, i):
+        """Cancel speculation of project `i` that can't start on arrival."""
+
+        self._cancel_speculation(self._projects[i][0])
+
+    def _fast_finished(self, i, log):
+        """Record the log of finished project `i`."""
+
+        self._started.pop(i, None)
+        resources = self._get_shared_resources(self._projects[i][2])
+        self._record(i, log, dict(resources))
+        self._emit("finished", dict(log))
+
+    def resimulate(self, starts=None, capacities=None):
+        """
+        Re-simulate the last run of the 'fast' engine with changed project
+        starts or initial resource pool capacities. The simulation is
+        restored to the latest checkpoint before the earliest affected time
+        and ran from there. Projects that finished before the checkpoint
+        keep their logs, and ORBIT results of projects that start at the
+        same time as in a previous run are reused. Requires `checkpoints`.
+
+        Parameters
+        ----------
+        starts : dict | None
+            New 'project_start' per project name.
+        capacities : dict | None
+            New initial capacity per `(category, name)` resource pool.
+            Capacity changes re-simulate from the first event.
+        """
+
+        if self.sink is not None:
+            raise ValueError(
+                "Can't resimulate with a 'sink', written records can't be "
+                "replaced."
+            )
+
+        if self._fast is None or not self._fast.checkpoints:
+            raise ValueError(
+                "No checkpoints to resimulate from. Create the manager with "
+                "'checkpoints' and run it with engine='fast'."
+            )
+
+        starts = starts if starts else {}
+        capacities = capacities if capacities else {}
+        index = {name: i for i, (name, *_) in enumerate(self._projects)}
+
+        moves = {}
+        for name, start in starts.items():
+            i = index[name]
+            moves[i] = self._get_start_idx(start)
+            if moves[i] < 0:
+                raise ValueError(
+                    f"Start {start} is prior to simulation start."
+                )
+
+        time = min(
+            (
+                min(idx, self._get_start_idx(self._projects[i][1]))
+                for i, idx in moves.items()
+            ),
+            default=float("inf"),
+        )
+
+        checkpoints = self._fast.checkpoints
+        checkpoint = checkpoints[0]
+        if not capacities:
+            checkpoint = max(
+                (c for c in checkpoints if c.time <= time),
+                key=lambda c: c.time,
+                default=checkpoint,
+            )
+
+        with self._stage("restore"):
+            self._fast.restore(checkpoint)
+            self._results.truncate(len(self._fast.logs))
+            self._started = {}
+
+        for i, idx in moves.items():
+            name, _, config, priority = self._projects[i]
+            self._projects[i] = (name, starts[name], config, priority)
+
+            estimate = None
+            if self._fast.scheduler.estimates:
+                estimate = self._estimate(name, config, idx)
+
+            self._fast.move_project(i, idx, estimate)
+
+        for (k, name), capacity in capacities.items():
+            resource = self.library.resources[k][name]
+            resource.add_capacity(capacity - resource.capacity)
+            self._fast.set_capacity((k, name), capacity)
+
+        with self._stage("run"):
+            self._resume_fast()
+
+    def components(self):
+        """
+        Return groups of projects that share no resource pools with projects
+        in other groups and can be simulated independently. Each group is a
+        tuple of the project names and the `(category, name)` resource pools
+        they use, ordered by the first project in each group. Resource pools
+        that aren't used by any project form groups without projects.
+        """
+
+        parent = {
+            (k, name): (k, name)
+            for k, data in self.library.resources.items()
+            for name in data
+        }
+
+        def find(node):
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+
+            return node
+
+        for name, _, config, _ in self._projects:
+            parent[name] = name
+            for pool in self._get_shared_resources(config):
+                parent.setdefault(pool, pool)
+                parent[find(pool)] = find(name)
+
+        groups = {}
+        for name, *_ in self._projects:
+            groups.setdefault(find(name), ([], []))[0].append(name)
+
+        for node in parent:
+            if isinstance(node, tuple):
+                groups.setdefault(find(node), ([], []))[1].append(node)
+
+        return [
+            (tuple(names), tuple(pools)) for names, pools in groups.values()
+        ]
+
+    def _run_partitions(self, engine):
+        """
+        Simulate independent groups of projects in worker processes and keep
+        the ORBIT result of each project by start, used by `_run_project`.
+        Groups are balanced across `self._workers` processes by number of
+        projects.
+
+        Parameters
+        ----------
+        engine : str
+        """
+
+        components = sorted(
+            self.components(), key=lambda c: len(c[0]), reverse=True
+        )
+        batches = [
+            ([], []) for _ in range(min(self._workers, len(components)))
+        ]
+        for names, pools in components:
+            batch = min(batches, key=lambda b: len(b[0]))
+            batch[0].extend(names)
+            batch[1].extend(pools)
+
+        kwargs = {
+            "weather": self._weather,
+            "library_path": self._library_path,
+            "cache": self._cache,
+            "scheduler": self._scheduler,
+            "leasing": self._leasing,
+            "coalesce": self._coalesce,
+        }
+
+        projects = {name: project for name, *project in self._projects}
+        with ProcessPoolExecutor(max_workers=len(batches)) as executor:
+            futures = [
+                executor.submit(
+                    _run_partition,
+                    *self._get_partition(projects, names, pools),
+                    engine,
+                    **kwargs,
+                )
+                for names, pools in batches
+            ]
+            for future in futures:
+                self._partitioned.update(future.result())
+
+    def _get_partition(self, projects, names, pools):
+        """
+        Return the arguments of `_run_partition` for projects `names` using
+        resource pools `pools`.
+
+        Parameters
+        ----------
+        projects : dict
+            Start, configuration and priority of each project.
+        names : list
+            Project handles.
+        pools : list
+            `(category, name)` resource pools.
+        """
+
+        configs = []
+        names = set(names)
+        for name in (n for n in projects if n in names):
+            start, config, priority = projects[name]
+            configs.append(
+                {
+                    **flatten(config),
+                    "project_name": name,
+                    "project_start": self._get_start_idx(start),
+                    "project_priority": priority,
+                }
+            )
+
+        allocations = {}
+        for k, name in pools:
+            capacity = self._alloc_capacity(k, name)
+            allocations.setdefault(k, []).append((name, capacity))
+
+        pools = set(pools)
+        additions = [a for a in self._additions if (a[0], a[1]) in pools]
+
+        return configs, allocations, additions
+
+    def _alloc_capacity(self, category, name):
+        """
+        Return initial capacity of resource pool `name` in `category`.
+
+        Parameters
+        ----------
+        category : str
+        name : str
+        """
+
+        data = self._alloc[category]
+        if isinstance(data, tuple):
+            data = [data]
+
+        return dict(data)[name]
+
+    def _dispatch_projects(self, executor):
+        """
+        Submit ORBIT runs of every project, started at its earliest possible
+        start, to `executor`. Results are used by `_run_project` if the
+        project isn't delayed by shared resources. Without weather, project
+        times don't depend on the start and every result is used.
+
+        Parameters
+        ----------
+        executor : concurrent.futures.Executor
+        """
+
+        for name, start, config, _ in self._projects:
+
+            region = self._get_weather_region(config)
+            config = self._get_final_config(config)
+            idx = self._get_start_idx(start)
+            key = self._get_project_key(config, idx, region)
+
+            if self._cache is not None and key in self._cache:
+                continue
+
+            self._speculative[name] = key
+            self._references[key] += 1
+            if key not in self._futures:
+                self._futures[key] = executor.submit(
+                    _run_orbit,
+                    flatten(config),
+                    *self._get_orbit_args(idx, region),
+                )
+
+    def _get_orbit_args(self, idx, region=None):
+        """
+        Return weather arguments of `_run_orbit` for a project started at
+        weather index `idx`. A `WeatherStore` is passed whole so worker
+        processes view it without copying.
+
+        Parameters
+        ----------
+        idx : int
+            Index of the project start in the weather profile.
+        region : str | None
+            Weather region if `self._weather` is a `WeatherStore`.
+        """
+
+        if isinstance(self._weather, WeatherStore):
+            return self._weather, idx, region
+
+        return (self._get_weather(idx),)
+
+    def _cancel_speculation(self, name):
+        """
+        Cancel the speculative ORBIT run of project `name` if it is not
+        shared with another waiting project.
+
+        Parameters
+        ----------
+        name : str
+            Project handle.
+        """
+
+        key = self._speculative.pop(name, None)
+        if key is None or self._weather is None:
+            return
+
+        self._references[key] -= 1
+        if self._references[key] == 0:
+            future = self._futures.pop(key, None)
+            if future is not None:
+                future.cancel()
+
+    def _get_final_config(self, config):
+        """
+        Return `config` with shared resource data inserted.
+
+        Parameters
+        ----------
+        config : dict
+            Initial ORBIT configuration.
+        """
+
+        final = LayeredConfig(config)
+        for k, v in self._get_shared_resources(config):
+            final[k] = self.library.resources[k][v].data
 
-        self.env.run()
+        return final
 
-    def _initialize(self, name, start, config):
+    def _initialize(self, name, start, config, priority=0):
         """
         Run an individual project configuration.
 
@@ -134,29 +1018,130 @@ class GlobalManager:
             Time to initialize project.
         config : dict
             ORBIT configuration.
+        priority : int | float
+            Scheduling priority of the project.
         """
 
         idx = self._get_start_idx(start)
         yield self.env.timeout(idx)
         log = {"name": name, "Initialized": self.env.now}
+        if self._progress is not None:
+            self._progress.append(("initialized", dict(log)))
 
+        region = self._get_weather_region(config)
         resources = self._get_shared_resources(config)
-        request = MultiRequest(self.env, dict(resources), name)
+        request = MultiRequest(
+            self.env, dict(resources), name, priority=priority, start=idx
+        )
+        if self.library.scheduler.estimates:
+            request.duration = self._estimate(name, config, idx)
 
         resource_data = self.library.request(request)
+        if not request.trigger.triggered:
+            self._cancel_speculation(name)
+
         yield request.trigger
 
         log["Started"] = self.env.now
+        self._emit("started", {"name": name, "time": self.env.now})
+
         for key, data in resource_data.items():
             config[key] = data
 
-        project = self._run_project(config)
+        if self._progress is not None:
+            offloaded = self._offload(config, region, name)
+            if offloaded is not None:
+                yield offloaded
+
+        project = self._run_project(config, region=region, name=name)
+        request.finish = self.env.now + project.project_time
+        leases = {}
+        if self._leasing:
+            leases = self._get_leases(request.resources, project)
+
+        for key, end in leases.items():
+            lease = self.env.timeout(end)
+            lease.callbacks.append(partial(self._release_lease, request, key))
+
         yield self.env.timeout(project.project_time)
         log["Finished"] = self.env.now
 
-        self._logs.append(log)
+        self._record(self._index[name], log, request.resources)
+        self._emit("finished", dict(log))
+
         self.library.release(request)
 
+    def _record(self, i, log, resources):
+        """
+        Write the log of finished project `i` to the sink and the results,
+        and drop the project state if `self._drop_finished`.
+
+        Parameters
+        ----------
+        i : int
+            Project index.
+        log : dict
+            Project log.
+        resources : dict
+            Shared resource pool used per resource category.
+        """
+
+        if self.sink is not None:
+            self.sink.write(
+                project_record(log, resources, self._alloc, self._start)
+            )
+
+        if not self._drop_finished:
+            self._results.append(log, resources)
+            return
+
+        name, start, _, priority = self._projects[i]
+        self._projects[i] = (name, start, None, priority)
+        self._configs[i] = None
+
+    def _release_lease(self, request, key, event):
+        """
+        Release shared resource `key` of `request` before its project
+        finishes.
+
+        Parameters
+        ----------
+        request : MultiRequest
+        key : str
+            Resource category.
+        event : simpy.Event
+            Timeout at the end of the lease.
+        """
+
+        self.library.release(request, [key])
+
+    def _get_leases(self, resources, result):
+        """
+        Return the time, relative to the project start, that each shared
+        resource in `resources` is no longer used by the project, for
+        resources that are released before the project finishes.
+
+        Parameters
+        ----------
+        resources : dict
+            Shared resource pool per resource category.
+        result : ProjectResult
+            Result of the project.
+        """
+
+        leases = {}
+        for key in resources:
+            ends = [
+                result.phase_starts.get(phase, 0) + time
+                for phase, time in result.phase_times.items()
+                if _uses_key(phase, key)
+            ]
+
+            if ends and max(ends) < result.project_time:
+                leases[key] = max(ends)
+
+        return leases
+
     def _get_start_idx(self, start) -> int:
         """
         Return index of project start time.
@@ -224,7 +1209,24 @@ class GlobalManager:
                     f"Start date {date} is prior to simulation start."
                 )
 
-            self.env.process(self._add_resource(category, name, delay))
+            self._add_future_resource(category, name, delay)
+
+    def _add_future_resource(self, category, name, delay):
+        """
+        Add a resource to resource pool `name` in `category` at time `delay`.
+
+        Parameters
+        ----------
+        category : str
+            Resource category.
+        name : str
+            Resource name.
+        delay : int | float
+            Delay time before resource is added to pool.
+        """
+
+        self._additions.append((category, name, delay))
+        self.env.process(self._add_resource(category, name, delay))
 
     def _add_resource(self, category, name, delay):
         """
@@ -241,10 +1243,10 @@ class GlobalManager:
         """
 
         yield self.env.timeout(delay)
-        self.library.resources[category][name]._capacity += 1
-        self.library.check_requests()
+        self.library.resources[category][name].add_capacity()
+        self.library.notify((category, name))
 
-    def _run_project(self, config):
+    def _run_project(self, config, now=None, region=None, name=None):
         """
         Run configured ORBIT project.
 
@@ -252,13 +1254,125 @@ class GlobalManager:
         ----------
         config : dict
             Final ORBIT configuration.
+        now : int | float | None
+            Project start time. Defaults to `self.env.now`.
+        region : str | None
+            Weather region if `self._weather` is a `WeatherStore`.
+        name : str | None
+            Project handle, used by the profiler.
         """
 
-        weather = self._get_current_weather()
-        project = ProjectManager(config, weather=weather)
-        project.run()
+        now = self.env.now if now is None else now
+        idx = int(np.ceil(now))
+
+        estimate = self._estimates.pop(name, None)
+        if estimate is not None and estimate[0] == idx:
+            return estimate[1]
+
+        result = self._partitioned.pop((name, idx), None)
+        if result is not None:
+            return result
+
+        if self._profiler is None:
+            result = self._get_project_result(config, idx, region)[0]
+
+        else:
+            start = perf_counter()
+            result, source = self._get_project_result(config, idx, region)
+            self._profiler.record_project(
+                name, now, perf_counter() - start, source
+            )
+
+        # Kept by partition workers, see `_run_partition`.
+        if self._orbit_results is not None:
+            self._orbit_results[(name, idx)] = result
 
-        return project
+        return result
+
+    def _estimate(self, name, config, idx):
+        """
+        Return project time of project `name` if started at weather index
+        `idx`, used by schedulers that need a duration before a project
+        starts. The result is reused if the project starts at `idx`.
+
+        Parameters
+        ----------
+        name : str
+            Project handle.
+        config : dict
+            Initial ORBIT configuration.
+        idx : int
+            Index of the estimated start in the weather profile.
+        """
+
+        region = self._get_weather_region(config)
+        final = self._get_final_config(config)
+        result = self._run_project(final, idx, region, name)
+        self._estimates[name] = (idx, result)
+
+        return result.project_time
+
+    def _get_project_result(self, config, idx, region=None):
+        """
+        Return result of `config` started at weather index `idx` and its
+        source, one of 'cache', 'worker' or 'orbit'.
+
+        Parameters
+        ----------
+        config : dict
+            Final ORBIT configuration.
+        idx : int
+            Index of the project start in the weather profile.
+        region : str | None
+            Weather region if `self._weather` is a `WeatherStore`.
+        """
+
+        weather = self._get_weather(idx, region)
+        if self._cache is None and not self._futures:
+            return _run_orbit(config, weather), "orbit"
+
+        key = self._get_project_key(config, idx, region)
+        if self._cache is not None:
+            result = self._cache.get(key)
+            if result is not None:
+                return result, "cache"
+
+        future = self._futures.get(key, None)
+        if future is not None:
+            result, source = future.result(), "worker"
+
+        else:
+            result, source = _run_orbit(config, weather), "orbit"
+
+        if self._cache is not None:
+            self._cache.set(key, result)
+
+        return result, source
+
+    def _get_project_key(self, config, offset, region=None):
+        """
+        Return cache key of `config` started at weather index `offset`.
+
+        Parameters
+        ----------
+        config : dict
+            Final ORBIT configuration.
+        offset : int
+            Index of the project start in the weather profile.
+        region : str | None
+            Weather region if `self._weather` is a `WeatherStore`.
+        """
+
+        if isinstance(self._weather, WeatherStore):
+            fingerprint = self._weather.fingerprint(region)
+
+        else:
+            if self._weather is not None and self._weather_fingerprint is None:
+                self._weather_fingerprint = weather_fingerprint(self._weather)
+
+            fingerprint = self._weather_fingerprint
+
+        return project_key(config, fingerprint, offset)
 
     def _append_request_timing(self, log, resources, requests):
         """
@@ -285,7 +1399,129 @@ class GlobalManager:
     def _get_current_weather(self):
         """Returns current weather based on `self.env.now`."""
 
+        return self._get_weather(int(np.ceil(self.env.now)))
+
+    def _get_weather(self, idx, region=None):
+        """
+        Returns weather starting at index `idx`.
+
+        Parameters
+        ----------
+        idx : int
+            Start index.
+        region : str | None
+            Weather region if `self._weather` is a `WeatherStore`.
+        """
+
         if self._weather is None:
             return None
 
-        return self._weather[int(np.ceil(self.env.now)) :]
+        if isinstance(self._weather, WeatherStore):
+            return self._weather.view(idx, region)
+
+        return self._weather[idx:]
+
+    def _get_weather_region(self, config):
+        """
+        Return weather region of a project if `self._weather` is a
+        `WeatherStore`. Regions are matched by the name of the shared port
+        pool, e.g. the pipeline 'port_region', and then by the nearest
+        region to 'project_coords'.
+
+        Parameters
+        ----------
+        config : dict
+            Initial ORBIT configuration.
+        """
+
+        if not isinstance(self._weather, WeatherStore):
+            return None
+
+        name = None
+        port = config.get("port", None)
+        if isinstance(port, str) and "_shared_pool_" in port:
+            name = port.split(":")[1]
+
+        coords = config.get("project_coords", None)
+        return self._weather.select_region(name, coords)
+
+
+def _run_partition(configs, allocations, additions, engine, **kwargs):
+    """
+    Simulate `configs` in a new `GlobalManager` and return the ORBIT result
+    of each project by project handle and start index.
+
+    Parameters
+    ----------
+    configs : list
+        ORBIT configurations with unique 'project_name' and 'project_start'
+        as a weather index.
+    allocations : dict
+        Number of each library item that exists in the shared environment.
+    additions : list
+        `(category, name, delay)` of resources added during the simulation.
+    engine : str
+        Scheduling backend.
+    kwargs : dict
+        Passed to `GlobalManager`.
+    """
+
+    manager = GlobalManager(configs, allocations, **kwargs)
+    for category, name, delay in additions:
+        manager._add_future_resource(category, name, delay)
+
+    manager._orbit_results = {}
+    manager.run(engine)
+
+    return manager._orbit_results
+
+
+@lru_cache(maxsize=None)
+def _uses_key(phase, key):
+    """
+    Return `True` if ORBIT phase `phase` expects configuration key `key`.
+    Phases that can't be matched to an ORBIT phase are assumed to use it.
+
+    Parameters
+    ----------
+    phase : str
+        Phase name.
+    key : str
+        Configuration key, e.g. 'wtiv'.
+    """
+
+    from ORBIT import ProjectManager
+
+    _class = ProjectManager.find_key_match(phase)
+    if _class is None:
+        return True
+
+    return key in _class.expected_config
+
+
+def _run_orbit(config, weather=None, start=0, region=None):
+    """
+    Run ORBIT project for `config` and return the summarized result.
+
+    Parameters
+    ----------
+    config : dict | LayeredConfig
+        Final ORBIT configuration.
+    weather : pd.DataFrame | WeatherStore | None
+        Weather profile starting at the project start, or a `WeatherStore`
+        that is viewed from index `start` of `region`.
+    start : int
+        Start index if `weather` is a `WeatherStore`.
+    region : str | None
+        Weather region if `weather` is a `WeatherStore`.
+    """
+
+    from ORBIT import ProjectManager
+
+    if isinstance(weather, WeatherStore):
+        weather = weather.view(start, region)
+
+    project = ProjectManager(flatten(config), weather=weather)
+    project.run()
+
+    return ProjectResult.from_project(project)
@@ -0,0 +1,283 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import tempfile
+from collections import Counter
+
+import pandas as pd
+
+from CORAL.sweeps import _prepare, iter_sweep
+
+
+def minimize_fleet(
+    configs,
+    allocations,
+    budget,
+    metric="max_wait",
+    workers=None,
+    engine="fast",
+    library_path=None,
+    cache=None,
+    **kwargs,
+):
+    """
+    Search for the smallest capacity of each resource pool in `allocations`
+    that keeps `metric` of the simulated `configs` within `budget`.
+
+    Capacities are searched between 1 and the smaller of the capacity in
+    `allocations` and the number of projects that use the pool. Each pool
+    is first bisected with every other pool at its upper bound, which gives
+    a lower bound of its capacity. Starting from the lower bounds, the pool
+    that reduces `metric` the most is then grown by one until the budget is
+    met. Candidate allocations of each step are evaluated together, in
+    parallel if `workers`, and ORBIT project results are cached between
+    evaluations, so most evaluations only reschedule projects.
+
+    Parameters
+    ----------
+    configs : list
+        List of ORBIT configurations, e.g. `Pipeline.configs`.
+    allocations : dict
+        Resource pools to size, see `GlobalManager`. Capacities are the
+        largest capacity searched per pool.
+    budget : int | float
+        Largest acceptable value of `metric`.
+    metric : str
+        Summary metric compared to `budget`, see `CORAL.sweeps.summarize`.
+        Defaults to the longest wait of any project for shared resources.
+    workers : int | None
+        Number of worker processes used to evaluate candidate allocations.
+    engine : str
+        Scheduling backend, see `GlobalManager.run`.
+    library_path : str | None
+        Path to shared library items or a library snapshot.
+    cache : ProjectCache | None
+        Cache of ORBIT project results. Defaults to a temporary cache that
+        is shared by every evaluation.
+    kwargs : dict
+        Passed to `GlobalManager`.
+
+    Returns
+    -------
+    allocations : dict
+        `allocations` with the smallest capacities found.
+    evaluations : pd.DataFrame
+        Capacity of each pool and summary metrics of every evaluated
+        allocation.
+    """
+
+    configs = list(configs)
+    pools = _get_pools(allocations)
+    usage = Counter(pool for c in configs for pool in _get_shared_pools(c))
+    upper = tuple(
+        max(min(capacity, usage[pool]), 1) for pool, capacity in pools.items()
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        path, cache = _prepare(tmp, library_path, cache)
+        search = _FleetSearch(
+            configs,
+            allocations,
+            list(pools),
+            budget,
+            metric,
+            workers=workers,
+            engine=engine,
+            library_path=path,
+            cache=cache,
+            **kwargs,
+        )
+
+        if not search.feasible([upper])[0]:
+            raise ValueError(
+                f"'{metric}' exceeds the budget of {budget} with the largest"
+                f" capacities: {dict(zip(pools, upper))}"
+            )
+
+        capacities = search.bisect(upper)
+        capacities = search.grow(capacities, upper)
+
+    return search.to_allocations(capacities), search.evaluations
+
+
+class _FleetSearch:
+    """Evaluations of candidate capacities for `minimize_fleet`."""
+
+    def __init__(self, configs, allocations, pools, budget, metric, **kwargs):
+        """
+        Creates an instance of `_FleetSearch`.
+
+        Parameters
+        ----------
+        configs : list
+        allocations : dict
+        pools : list
+            `(category, name)` resource pools, in order of the capacities.
+        budget : int | float
+        metric : str
+        kwargs : dict
+            Passed to `iter_sweep`.
+        """
+
+        self.configs = configs
+        self.allocations = allocations
+        self.pools = pools
+        self.budget = budget
+        self.metric = metric
+        self.kwargs = kwargs
+        self.results = {}
+
+    @property
+    def evaluations(self):
+        """Return `pd.DataFrame` of every evaluated allocation."""
+
+        columns = [f"{k}:{name}" for k, name in self.pools]
+        rows = [
+            {**dict(zip(columns, capacities)), **metrics}
+            for capacities, metrics in self.results.items()
+        ]
+
+        frame = pd.DataFrame(rows)
+        if not frame.empty:
+            frame["feasible"] = frame[self.metric] <= self.budget
+
+        return frame
+
+    def evaluate(self, candidates):
+        """
+        Return `metric` of each of `candidates`, simulating the candidates
+        that weren't evaluated before.
+
+        Parameters
+        ----------
+        candidates : list
+            Capacity of each pool per candidate.
+        """
+
+        scenarios = {
+            capacities: self.to_allocations(capacities)
+            for capacities in candidates
+            if capacities not in self.results
+        }
+
+        for capacities, metrics in iter_sweep(
+            self.configs, scenarios, **self.kwargs
+        ):
+            self.results[capacities] = metrics
+
+        return [self.results[c][self.metric] for c in candidates]
+
+    def feasible(self, candidates):
+        """Return `True` for each of `candidates` within the budget."""
+
+        return [v <= self.budget for v in self.evaluate(candidates)]
+
+    def bisect(self, upper):
+        """
+        Return the smallest capacity of each pool that is within the budget
+        while every other pool is at `upper`. Pools are bisected together.
+
+        Parameters
+        ----------
+        upper : tuple
+            Largest capacity of each pool.
+        """
+
+        lower, upper = [1] * len(upper), list(upper)
+        bounds = list(upper)
+        while lower != upper:
+            searching = [i for i, lo in enumerate(lower) if lo < upper[i]]
+            mids = {i: (lower[i] + upper[i]) // 2 for i in searching}
+            candidates = [_replace(bounds, i, mids[i]) for i in searching]
+
+            for i, ok in zip(searching, self.feasible(candidates)):
+                if ok:
+                    upper[i] = mids[i]
+
+                else:
+                    lower[i] = mids[i] + 1
+
+        return tuple(lower)
+
+    def grow(self, capacities, upper):
+        """
+        Grow the pool that reduces `metric` the most by one until
+        `capacities` is within the budget.
+
+        Parameters
+        ----------
+        capacities : tuple
+            Starting capacity of each pool.
+        upper : tuple
+            Largest capacity of each pool.
+        """
+
+        while not self.feasible([capacities])[0]:
+            candidates = [
+                _replace(capacities, i, c + 1)
+                for i, c in enumerate(capacities)
+                if c < upper[i]
+            ]
+
+            values = self.evaluate(candidates)
+            capacities = candidates[values.index(min(values))]
+
+        return capacities
+
+    def to_allocations(self, capacities):
+        """
+        Return `self.allocations` with the capacity of each pool replaced by
+        `capacities`.
+
+        Parameters
+        ----------
+        capacities : tuple
+        """
+
+        sizes = dict(zip(self.pools, capacities))
+        allocations = {}
+        for key, data in self.allocations.items():
+            if isinstance(data, tuple):
+                allocations[key] = (data[0], sizes[(key, data[0])])
+
+            else:
+                allocations[key] = [(n, sizes[(key, n)]) for n, _ in data]
+
+        return allocations
+
+
+def _get_pools(allocations):
+    """Return capacity of each `(category, name)` pool in `allocations`."""
+
+    pools = {}
+    for key, data in allocations.items():
+        if isinstance(data, tuple):
+            data = [data]
+
+        for name, capacity in data:
+            pools[(key, name)] = capacity
+
+    return pools
+
+
+def _get_shared_pools(config):
+    """Return `(category, name)` shared resource pools used by `config`."""
+
+    return [
+        (k, v.split(":")[1])
+        for k, v in config.items()
+        if isinstance(v, str) and "_shared_pool_" in v
+    ]
+
+
+def _replace(capacities, i, capacity):
+    """Return `capacities` with the capacity of pool `i` replaced."""
+
+    capacities = list(capacities)
+    capacities[i] = capacity
+
+    return tuple(capacities)
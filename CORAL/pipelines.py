@@ -4,18 +4,20 @@ __maintainer__ = "Jake Nunemaker"
 __email__ = "jake.nunemaker@nrel.gov"
 
 
-import re
 from copy import deepcopy
+from itertools import repeat
 
 import numpy as np
 import pandas as pd
 from ORBIT import load_config
 
+from CORAL.config import LayeredConfig
+
 
 class Pipeline:
     """Base class for modeling offshore wind project pipelines."""
 
-    def __init__(self, projects_fp, base_config):
+    def __init__(self, projects_fp, base_config, lazy=False, layered=False):
         """
         Creates an instance of `Pipeline`.
 
@@ -25,12 +27,25 @@ class Pipeline:
             Filepath
         base_config : str
             Filepath
+        lazy : bool
+            If `True`, `self.configs` is an iterator that builds each config
+            as it is consumed.
+        layered : bool
+            If `True`, configs are `LayeredConfig` overlays of project
+            specific values on a shared template instead of plain dicts.
         """
 
+        self.layered = layered
+
         self.projects = pd.read_csv(projects_fp, parse_dates=["start_date"])
         self.append_num_turbines()
         self.base = load_config(base_config)
-        self.configs = self.build_configs()
+
+        if lazy:
+            self.configs = self.iter_configs()
+
+        else:
+            self.configs = self.build_configs()
 
     def append_num_turbines(self):
         """
@@ -40,41 +55,83 @@ class Pipeline:
 
         if "num_turbines" not in self.projects:
 
-            self.projects["_cap"] = self.projects["turbine"].apply(
-                lambda x: float(re.search(r"\d+", x).group(0))
+            self.projects["_cap"] = (
+                self.projects["turbine"]
+                .str.extract(r"(\d+)", expand=False)
+                .astype(float)
             )
-            self.projects["num_turbines"] = (
+            self.projects["num_turbines"] = np.ceil(
                 self.projects["capacity"] / self.projects["_cap"]
-            )
-            self.projects["num_turbines"] = self.projects[
-                "num_turbines"
-            ].apply(lambda x: int(np.ceil(x)))
+            ).astype(int)
 
     def build_configs(self):
         """Iterate through projects in `self.projects` and build ORBIT configs."""
 
-        configs = []
-        for _, data in self.projects.iterrows():
+        return list(self.iter_configs())
 
-            config = deepcopy(self.base)
-            config["project_name"] = data["name"]
-            config["project_coords"] = (data["lat"], data["lon"])
-            config["project_start"] = data["start_date"]
-
-            config["turbine"] = data["turbine"]
-            config["plant"]["num_turbines"] = data["num_turbines"]
-
-            config["site"]["depth"] = data["depth"]
-            config["site"]["distance_to_landfall"] = data["distance_to_shore"]
-
-            config["port"] = ":".join(["_shared_pool_", data["port_region"]])
+    def iter_configs(self):
+        """
+        Yield ORBIT configs for projects in `self.projects`. Project specific
+        fields are overlaid on a template built once per substructure type.
+        Plain dict configs get their own copy of each top level list and
+        dict of the template (e.g. 'install_phases'), `LayeredConfig`
+        overlays share the template. An optional 'priority' column is used
+        as the 'project_priority'.
+        """
 
-            config = self.add_substructure_specific_config(
-                config, data["substructure"]
+        df = self.projects
+        templates = {
+            substructure: self.add_substructure_specific_config(
+                deepcopy(self.base), substructure
             )
-            configs.append(config)
-
-        return configs
+            for substructure in df["substructure"].unique()
+        }
+
+        columns = zip(
+            df["name"].tolist(),
+            df["lat"].tolist(),
+            df["lon"].tolist(),
+            df["start_date"].tolist(),
+            df["turbine"].tolist(),
+            df["num_turbines"].tolist(),
+            df["depth"].tolist(),
+            df["distance_to_shore"].tolist(),
+            ("_shared_pool_:" + df["port_region"]).tolist(),
+            df["substructure"].tolist(),
+        )
+
+        priorities = repeat(None)
+        if "priority" in df:
+            priorities = df["priority"].tolist()
+
+        for row, priority in zip(columns, priorities):
+            name, lat, lon, start, turbine, num, depth, dist, port, sub = row
+
+            template = templates[sub]
+            overlay = {
+                "project_name": name,
+                "project_coords": (lat, lon),
+                "project_start": start,
+                "turbine": turbine,
+                "plant": {"num_turbines": num},
+                "site": {"depth": depth, "distance_to_landfall": dist},
+                "port": port,
+            }
+
+            if pd.notna(priority):
+                overlay["project_priority"] = priority
+
+            if self.layered:
+                yield LayeredConfig(template, overlay)
+                continue
+
+            # Plain dict configs don't share any containers of the template.
+            config = deepcopy(template)
+            config["plant"].update(overlay.pop("plant"))
+            config["site"].update(overlay.pop("site"))
+            config.update(overlay)
+
+            yield config
 
     def add_substructure_specific_config(self, config, substructure):
         """
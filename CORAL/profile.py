@@ -0,0 +1,177 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+from time import perf_counter
+from contextlib import contextmanager
+
+
+class Profiler:
+    """
+    Collects timings of the hot paths of a `GlobalManager` simulation:
+    cumulative time per stage, ORBIT wall time per project and shared
+    resource queue lengths over time. Events are passed to the optional
+    callbacks as they are recorded.
+    """
+
+    def __init__(self, callbacks=None):
+        """
+        Creates an instance of `Profiler`.
+
+        Parameters
+        ----------
+        callbacks : list | None
+            Functions called with the event name and a dictionary of event
+            data. Events are 'stage', 'orbit', 'queue', 'started' and
+            'finished'.
+        """
+
+        self.callbacks = list(callbacks) if callbacks else []
+
+        self._stages = {}
+        self._projects = []
+        self._queues = []
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time the enclosed block and add it to stage `name`.
+
+        Parameters
+        ----------
+        name : str
+            Stage name.
+        """
+
+        start = perf_counter()
+        try:
+            yield
+
+        finally:
+            self.record_stage(name, perf_counter() - start)
+
+    def record_stage(self, name, seconds):
+        """
+        Add a call of stage `name` that took `seconds`.
+
+        Parameters
+        ----------
+        name : str
+        seconds : float
+        """
+
+        calls, total = self._stages.get(name, (0, 0.0))
+        self._stages[name] = (calls + 1, total + seconds)
+        self.emit("stage", {"stage": name, "seconds": seconds})
+
+    def record_project(self, name, time, seconds, source):
+        """
+        Add the ORBIT run of project `name`.
+
+        Parameters
+        ----------
+        name : str
+            Project handle.
+        time : int | float
+            Simulation time the project started.
+        seconds : float
+            Wall time spent getting the project result.
+        source : str
+            'orbit' if ORBIT was ran in process, 'worker' if the result came
+            from a worker process or 'cache' if it was cached.
+        """
+
+        row = {
+            "name": name,
+            "time": time,
+            "seconds": seconds,
+            "source": source,
+        }
+        self._projects.append(row)
+        self.record_stage("orbit", seconds)
+        self.emit("orbit", row)
+
+    def record_queue(self, time, pool, length):
+        """
+        Add the number of waiting requests after a change to `pool`.
+
+        Parameters
+        ----------
+        time : int | float
+            Simulation time.
+        pool : tuple | None
+            `(category, name)` resource pool that changed.
+        length : int
+            Number of waiting requests.
+        """
+
+        row = {"time": time, "pool": pool, "length": length}
+        self._queues.append(row)
+        self.emit("queue", row)
+
+    def emit(self, event, data):
+        """
+        Pass `event` to the callbacks.
+
+        Parameters
+        ----------
+        event : str
+            Event name.
+        data : dict
+            Event data.
+        """
+
+        for callback in self.callbacks:
+            callback(event, data)
+
+    @property
+    def stages(self):
+        """Return `pd.DataFrame` of calls and cumulative time per stage."""
+
+        import pandas as pd
+
+        frame = pd.DataFrame(
+            [(k, *v) for k, v in self._stages.items()],
+            columns=["stage", "calls", "seconds"],
+        ).set_index("stage")
+        frame["mean"] = frame["seconds"] / frame["calls"]
+
+        return frame
+
+    @property
+    def projects(self):
+        """Return `pd.DataFrame` of ORBIT wall time per project."""
+
+        import pandas as pd
+
+        return pd.DataFrame(
+            self._projects, columns=["name", "time", "seconds", "source"]
+        )
+
+    @property
+    def queues(self):
+        """Return `pd.DataFrame` of waiting requests over time."""
+
+        import pandas as pd
+
+        return pd.DataFrame(self._queues, columns=["time", "pool", "length"])
+
+    def report(self):
+        """Return summary of the profile as a string."""
+
+        projects = self.projects
+        lines = [self.stages.to_string(), ""]
+        if not projects.empty:
+            lines.append(
+                projects.groupby("source")["seconds"]
+                .agg(["count", "sum", "mean", "max"])
+                .to_string()
+            )
+
+        queues = self.queues
+        if not queues.empty:
+            lines.append(f"\nMax waiting requests: {queues['length'].max()}")
+
+        return "\n".join(lines)
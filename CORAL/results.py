@@ -0,0 +1,378 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import datetime as dt
+from array import array
+from numbers import Integral
+from bisect import insort, bisect_right
+
+import numpy as np
+
+TIMES = ("Initialized", "Started", "Finished")
+
+
+class ResultsTable:
+    """Array backed columns of project results, appended as projects finish."""
+
+    def __init__(self, start=None):
+        """
+        Creates an instance of `ResultsTable`.
+
+        Parameters
+        ----------
+        start : int | float | dt.datetime
+            Simulation start. If a datetime, date columns are included.
+        """
+
+        self.start = start
+        self.names = []
+        self.resources = []
+        self.times = {k: array("d") for k in TIMES}
+        self.integral = {k: array("b") for k in TIMES}
+
+        self._frame = None
+        self._records = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def append(self, log, resources=None):
+        """
+        Append a finished project.
+
+        Parameters
+        ----------
+        log : dict
+            Project log with keys 'name', 'Initialized', 'Started' and
+            'Finished'.
+        resources : dict | None
+            Shared resource pool used per resource category.
+        """
+
+        self.names.append(log["name"])
+        self.resources.append(dict(resources) if resources else {})
+        for k in TIMES:
+            self.times[k].append(log[k])
+            self.integral[k].append(isinstance(log[k], Integral))
+
+        self._frame = None
+        self._records = None
+
+    def truncate(self, size):
+        """
+        Keep the first `size` projects.
+
+        Parameters
+        ----------
+        size : int
+        """
+
+        del self.names[size:]
+        del self.resources[size:]
+        for k in TIMES:
+            del self.times[k][size:]
+            del self.integral[k][size:]
+
+        self._frame = None
+        self._records = None
+
+    def to_frame(self):
+        """
+        Return results as a `pd.DataFrame`. The frame is cached until another
+        project is appended.
+        """
+
+        if self._frame is not None:
+            return self._frame
+
+        import pandas as pd
+
+        data = {"name": self.names}
+        for k in TIMES:
+            data[k] = np.array(self.times[k], dtype=float)
+
+        data["Wait"] = data["Started"] - data["Initialized"]
+
+        if isinstance(self.start, dt.datetime):
+            start = pd.Timestamp(self.start)
+            for k in TIMES:
+                hours = np.ceil(data[k]).astype("int64")
+                data[f"Date {k}"] = start + pd.to_timedelta(hours, unit="h")
+
+        categories = {k: None for r in self.resources for k in r}
+        for k in categories:
+            data[k] = [r.get(k, None) for r in self.resources]
+
+        self._frame = pd.DataFrame(data)
+        return self._frame
+
+    def to_records(self):
+        """
+        Return results as a list of new log dictionaries. Times keep the
+        type they were logged with and dates are `dt.datetime`, as in the
+        logs of the simpy simulation. The record values are cached until
+        another project is appended.
+        """
+
+        if self._records is None:
+            columns = ["name", *TIMES]
+            values = [self.names]
+            for k in TIMES:
+                values.append(
+                    [
+                        int(v) if i else v
+                        for v, i in zip(self.times[k], self.integral[k])
+                    ]
+                )
+
+            if isinstance(self.start, dt.datetime):
+                for k in TIMES:
+                    columns.append(f"Date {k}")
+                    values.append(
+                        [
+                            self.start + dt.timedelta(hours=int(np.ceil(v)))
+                            for v in self.times[k]
+                        ]
+                    )
+
+            self._records = (columns, list(zip(*values)))
+
+        columns, rows = self._records
+        return [dict(zip(columns, row)) for row in rows]
+
+
+def project_record(log, resources=None, categories=(), start=None):
+    """
+    Return the results row of a finished project, with the columns of
+    `ResultsTable.to_frame`. Every category in `categories` is included, so
+    records of different projects have the same keys.
+
+    Parameters
+    ----------
+    log : dict
+        Project log with keys 'name', 'Initialized', 'Started' and
+        'Finished'.
+    resources : dict | None
+        Shared resource pool used per resource category.
+    categories : iterable
+        Resource categories, `None` if not used by the project.
+    start : int | float | dt.datetime | None
+        Simulation start. If a datetime, dates are included.
+    """
+
+    record = {"name": log["name"], **{k: float(log[k]) for k in TIMES}}
+    record["Wait"] = record["Started"] - record["Initialized"]
+
+    if isinstance(start, dt.datetime):
+        import pandas as pd
+
+        start = pd.Timestamp(start)
+        for k in TIMES:
+            hours = int(np.ceil(log[k]))
+            record[f"Date {k}"] = start + pd.Timedelta(hours=hours)
+
+    resources = resources if resources else {}
+    for k in categories:
+        record[k] = resources.get(k, None)
+
+    return record
+
+
+class Timeline:
+    """
+    Preallocated buffer of the state of a shared resource pool over time.
+    Each row holds the time, capacity, number of resources in use and number
+    of waiting requests after a change to the pool. The buffer doubles in
+    size when full.
+    """
+
+    COLUMNS = ("time", "capacity", "in_use", "queue")
+
+    def __init__(self, size=64):
+        """
+        Creates an instance of `Timeline`.
+
+        Parameters
+        ----------
+        size : int
+            Initial number of rows.
+        """
+
+        self._data = np.empty((size, len(self.COLUMNS)))
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def record(self, time, capacity, in_use, queue):
+        """
+        Append the state of the pool at `time`.
+
+        Parameters
+        ----------
+        time : int | float
+        capacity : int
+        in_use : int
+        queue : int
+        """
+
+        if self._size == len(self._data):
+            self._data = np.concatenate(
+                [self._data, np.empty_like(self._data)]
+            )
+
+        self._data[self._size] = (time, capacity, in_use, queue)
+        self._size += 1
+
+    def truncate(self, size):
+        """
+        Keep the first `size` rows.
+
+        Parameters
+        ----------
+        size : int
+        """
+
+        self._size = min(size, self._size)
+
+    @property
+    def data(self):
+        """Return recorded rows as a view of the buffer."""
+
+        return self._data[: self._size]
+
+    def to_frame(self):
+        """Return recorded rows as a `pd.DataFrame`."""
+
+        import pandas as pd
+
+        return pd.DataFrame(self.data, columns=self.COLUMNS)
+
+    def stats(self, end=None):
+        """
+        Return utilization statistics of the pool from the first record to
+        `end`. Hours are resource-hours, e.g. two idle resources for an hour
+        is two idle hours.
+
+        Parameters
+        ----------
+        end : int | float | None
+            End of the period. Defaults to the last record.
+        """
+
+        time, capacity, in_use, queue = self.data.T
+        end = time[-1] if end is None else max(end, time[-1])
+        dt = np.diff(time, append=end)
+        period = end - time[0]
+
+        available = float(np.sum(capacity * dt))
+        busy = float(np.sum(in_use * dt))
+
+        return {
+            "capacity": int(capacity[-1]),
+            "peak_in_use": int(in_use.max()),
+            "busy_hours": busy,
+            "idle_hours": available - busy,
+            "utilization": busy / available if available else np.nan,
+            "peak_queue": int(queue.max()),
+            "mean_queue": (
+                float(np.sum(queue * dt) / period) if period else np.nan
+            ),
+        }
+
+
+class StreamingQuantile:
+    """
+    Estimate of quantile `q` of a stream of values in constant memory, using
+    the P-square algorithm (Jain and Chlamtac, 1985). Five markers track the
+    minimum, maximum, the quantile and the quantiles halfway to either end,
+    and are adjusted with piecewise-parabolic interpolation as values
+    arrive. Quantiles of up to five values are exact.
+    """
+
+    def __init__(self, q):
+        """
+        Creates an instance of `StreamingQuantile`.
+
+        Parameters
+        ----------
+        q : float
+            Quantile between 0 and 1, e.g. 0.9 for P90.
+        """
+
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile {q} must be between 0 and 1.")
+
+        self.q = q
+        self.count = 0
+        self._heights = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self._increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def add(self, x):
+        """
+        Add value `x` to the stream.
+
+        Parameters
+        ----------
+        x : float
+        """
+
+        self.count += 1
+        h, n = self._heights, self._positions
+        if self.count <= 5:
+            insort(h, x)
+            return
+
+        if x < h[0]:
+            h[0], k = x, 0
+
+        elif x >= h[4]:
+            h[4], k = x, 3
+
+        else:
+            k = bisect_right(h, x) - 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in (1, 2, 3):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (
+                d <= -1 and n[i - 1] - n[i] < -1
+            ):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not h[i - 1] < height < h[i + 1]:
+                    height = h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+
+                h[i] = height
+                n[i] += d
+
+    def _parabolic(self, i, d):
+        """Return adjusted height of marker `i` moved by `d`."""
+
+        h, n = self._heights, self._positions
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self):
+        """Return the estimated quantile, `nan` if no values were added."""
+
+        if self.count == 0:
+            return np.nan
+
+        if self.count <= 5:
+            return float(np.quantile(self._heights, self.q))
+
+        return self._heights[2]
@@ -0,0 +1,363 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+from copy import deepcopy
+from heapq import heappop, heappush
+from itertools import count
+from collections import defaultdict
+
+
+class Scheduler:
+    """
+    First in, first out scheduling of requests for shared resource pools.
+
+    Waiting requests are parked in a heap on the first pool that blocks them
+    and are only re-examined when that pool gains capacity, so granting a
+    request is O(log n) in the number of waiting requests. Requests are
+    granted in the order of `Scheduler.key` and then arrival. A request that
+    can start is granted even if requests ahead of it are blocked on other
+    pools.
+
+    Requests are objects with the attributes:
+
+    - `pools`: list of `(category, name)` resource pools.
+    - `priority`: larger values are scheduled first by `PriorityScheduler`.
+    - `start`: requested start time, used by `EarliestStartScheduler`.
+    - `duration`: estimated time the pools are held, used by
+      `BackfillScheduler`. `None` if unknown.
+    - `finish`: time the pools are released once started, used by
+      `BackfillScheduler`. `None` if unknown.
+
+    The `state` passed to the scheduler is the owner of the pools, e.g. a
+    `SharedLibrary`, and provides `now`, `is_full(pool)`, `free(pool)` and
+    `holders(pool)`.
+    """
+
+    name = "fifo"
+
+    # Set if requests need a `duration` estimate before they start.
+    estimates = False
+
+    def __init__(self):
+        """Creates an instance of `Scheduler`."""
+
+        self.waiting = {}
+        self._parked = defaultdict(list)
+        self._deferred = []
+        self._order = count()
+
+    def key(self, request):
+        """
+        Return sort key of `request`. Requests with smaller keys are granted
+        first, ties are granted in the order they arrived.
+
+        Parameters
+        ----------
+        request : object
+        """
+
+        return ()
+
+    def submit(self, request, state):
+        """
+        Return `True` if `request` can start now, otherwise add it to the
+        wait queue.
+
+        Parameters
+        ----------
+        request : object
+        state : SharedLibrary | FastEngine
+        """
+
+        self.waiting[request] = None
+        blocker = self.get_blocker(request, state)
+        if blocker is None:
+            del self.waiting[request]
+            return True
+
+        heappush(
+            self._parked[blocker],
+            (self.key(request), next(self._order), request),
+        )
+        return False
+
+    def defer(self, request):
+        """
+        Add `request` to the wait queue without checking if it can start. It
+        is considered, in scheduling order, by the next `wake_many`.
+
+        Parameters
+        ----------
+        request : object
+        """
+
+        self.waiting[request] = None
+        heappush(
+            self._deferred, (self.key(request), next(self._order), request)
+        )
+
+    def wake(self, pool, state):
+        """
+        Yield waiting requests that can start after `pool` gained capacity.
+        Each request must be granted before the next one is yielded.
+
+        Parameters
+        ----------
+        pool : tuple
+            `(category, name)` resource pool.
+        state : SharedLibrary | FastEngine
+        """
+
+        yield from self._match((pool,), state)
+
+    def wake_all(self, state):
+        """
+        Yield waiting requests that can start on any pool.
+
+        Parameters
+        ----------
+        state : SharedLibrary | FastEngine
+        """
+
+        for pool in list(self._parked):
+            yield from self.wake(pool, state)
+
+    def wake_many(self, pools, state):
+        """
+        Yield waiting requests that can start after `pools` gained capacity
+        and deferred requests that can start, merged in scheduling order.
+        Each request must be granted before the next one is yielded.
+
+        Parameters
+        ----------
+        pools : list
+            `(category, name)` resource pools.
+        state : SharedLibrary | FastEngine
+        """
+
+        yield from self._match(pools, state)
+
+    def _match(self, pools, state):
+        """Yield waiting requests that can start, see `wake_many`."""
+
+        held = []
+        while True:
+            source = self._deferred if self._deferred else None
+            for pool in pools:
+                parked = self._parked[pool]
+                if not parked or state.is_full(pool):
+                    continue
+
+                if source is None or parked[0] < source[0]:
+                    source = parked
+
+            if source is None:
+                break
+
+            entry = heappop(source)
+            request = entry[-1]
+            blocker = self.get_blocker(request, state)
+
+            if blocker is None:
+                del self.waiting[request]
+                yield request
+
+            elif state.is_full(blocker):
+                heappush(self._parked[blocker], entry)
+
+            else:
+                # Held by the scheduler on a pool with capacity.
+                held.append((blocker, entry))
+
+        for pool, entry in held:
+            heappush(self._parked[pool], entry)
+
+    def get_blocker(self, request, state):
+        """
+        Return the pool that prevents `request` from starting now, or `None`
+        if it can start.
+
+        Parameters
+        ----------
+        request : object
+        state : SharedLibrary | FastEngine
+        """
+
+        for pool in request.pools:
+            if state.is_full(pool):
+                return pool
+
+        return None
+
+
+class PriorityScheduler(Scheduler):
+    """
+    Grants waiting requests with the highest `priority` first, e.g. from the
+    'project_priority' of a project configuration.
+    """
+
+    name = "priority"
+
+    def key(self, request):
+        return (-request.priority,)
+
+
+class EarliestStartScheduler(Scheduler):
+    """
+    Grants waiting requests with the earliest requested `start` first. In a
+    `GlobalManager` simulation, projects request resources at their start
+    date and this is equivalent to first in, first out, but requests
+    submitted to a `SharedLibrary` ahead of or after their start are ordered
+    by start date instead of submission.
+    """
+
+    name = "earliest_start"
+
+    def key(self, request):
+        return (request.start,)
+
+
+class BackfillScheduler(Scheduler):
+    """
+    First in, first out scheduling with backfilling. The oldest waiting
+    request holds a reservation on its pools from the earliest time they are
+    all expected to be free. Later requests only start if they leave a
+    reserved pool with spare capacity or are expected to finish before the
+    reservation starts, so they never delay the oldest request. Requests
+    without a `duration` estimate are not backfilled onto reserved pools.
+    """
+
+    name = "backfill"
+    estimates = True
+
+    def __init__(self):
+        """Creates an instance of `BackfillScheduler`."""
+
+        super().__init__()
+        self._arrivals = []
+
+    @property
+    def head(self):
+        """Return the oldest waiting request."""
+
+        while self._arrivals and self._arrivals[0][1] not in self.waiting:
+            heappop(self._arrivals)
+
+        return self._arrivals[0][1] if self._arrivals else None
+
+    def submit(self, request, state):
+
+        heappush(self._arrivals, (next(self._order), request))
+        return super().submit(request, state)
+
+    def defer(self, request):
+
+        heappush(self._arrivals, (next(self._order), request))
+        super().defer(request)
+
+    def wake(self, pool, state):
+
+        head = self.head
+        yield from super().wake(pool, state)
+
+        # Requests held for the previous head can be backfilled again.
+        while head is not None and head is not self.head:
+            pools, head = head.pools, self.head
+            for p in pools:
+                yield from super().wake(p, state)
+
+    def wake_many(self, pools, state):
+
+        head = self.head
+        yield from super().wake_many(pools, state)
+
+        # Requests held for the previous head can be backfilled again.
+        while head is not None and head is not self.head:
+            pools, head = head.pools, self.head
+            yield from super().wake_many(pools, state)
+
+    def get_blocker(self, request, state):
+
+        blocker = super().get_blocker(request, state)
+        head = self.head
+        if blocker is not None or head is None or head is request:
+            return blocker
+
+        shadow = self.reservation(head, state)
+        if request.duration is not None:
+            if state.now + request.duration <= shadow:
+                return None
+
+        for pool in request.pools:
+            if pool in head.pools and state.free(pool) < 2:
+                return pool
+
+        return None
+
+    def reservation(self, request, state):
+        """
+        Return the earliest time every pool of `request` is expected to have
+        capacity.
+
+        Parameters
+        ----------
+        request : object
+        state : SharedLibrary | FastEngine
+        """
+
+        shadow = state.now
+        for pool in request.pools:
+            if state.free(pool) > 0:
+                continue
+
+            # Holders that haven't reported their finish may free the pool
+            # now, pools without holders never gain capacity.
+            finishes = [
+                state.now if r.finish is None else r.finish
+                for r in state.holders(pool)
+            ]
+            shadow = max(shadow, min(finishes, default=float("inf")))
+
+        return shadow
+
+
+SCHEDULERS = {
+    s.name: s
+    for s in (
+        Scheduler,
+        PriorityScheduler,
+        EarliestStartScheduler,
+        BackfillScheduler,
+    )
+}
+
+
+def get_scheduler(scheduler=None):
+    """
+    Return a new scheduler for `scheduler`.
+
+    Parameters
+    ----------
+    scheduler : str | Scheduler | None
+        Name of a scheduler in `SCHEDULERS` or a `Scheduler` instance, which
+        is copied so it can be reused between simulations. Defaults to
+        first in, first out.
+    """
+
+    if scheduler is None:
+        return Scheduler()
+
+    if isinstance(scheduler, Scheduler):
+        return deepcopy(scheduler)
+
+    try:
+        return SCHEDULERS[scheduler]()
+
+    except KeyError:
+        raise ValueError(
+            f"Scheduler '{scheduler}' not recognized. "
+            f"Options: {tuple(SCHEDULERS)}"
+        )
@@ -0,0 +1,257 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import os
+import csv
+import sqlite3
+import datetime as dt
+
+
+class ResultSink:
+    """
+    Base class of sinks that write the record of each finished project,
+    buffered and written in batches. Subclasses implement `_write` and
+    optionally `_close`. Sinks are context managers that close on exit.
+    """
+
+    def __init__(self, batch_size=1000):
+        """
+        Creates an instance of `ResultSink`.
+
+        Parameters
+        ----------
+        batch_size : int
+            Number of records buffered before they are written.
+        """
+
+        self.batch_size = batch_size
+        self.written = 0
+        self._buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, record):
+        """
+        Buffer `record` and write the buffer if it is full.
+
+        Parameters
+        ----------
+        record : dict
+            Project record, see `CORAL.results.project_record`. Every
+            record written to a sink has the same keys.
+        """
+
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered records."""
+
+        if self._buffer:
+            self._write(self._buffer)
+            self.written += len(self._buffer)
+            self._buffer = []
+
+    def close(self):
+        """Write buffered records and close the sink."""
+
+        self.flush()
+        self._close()
+
+    def _write(self, records):
+        """Write a batch of `records`."""
+
+        raise NotImplementedError
+
+    def _close(self):
+        """Release resources held by the sink."""
+
+        pass
+
+
+class CSVSink(ResultSink):
+    """Writes project records to a CSV file with a header row."""
+
+    def __init__(self, path, batch_size=1000):
+        """
+        Creates an instance of `CSVSink`.
+
+        Parameters
+        ----------
+        path : str
+            Path of the CSV file, which is overwritten.
+        batch_size : int
+            Number of records buffered before they are written.
+        """
+
+        super().__init__(batch_size)
+        self.path = path
+        self._file = None
+        self._writer = None
+
+    def _write(self, records):
+
+        if self._writer is None:
+            self._file = open(self.path, "w", newline="")
+            self._writer = csv.DictWriter(self._file, fieldnames=records[0])
+            self._writer.writeheader()
+
+        self._writer.writerows(records)
+        self._file.flush()
+
+    def _close(self):
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+
+class SQLiteSink(ResultSink):
+    """
+    Writes project records to a table of a SQLite database. Dates are
+    stored as ISO 8601 strings.
+    """
+
+    def __init__(self, path, table="results", batch_size=1000):
+        """
+        Creates an instance of `SQLiteSink`.
+
+        Parameters
+        ----------
+        path : str
+            Path of the SQLite database.
+        table : str
+            Table name. The table is created if it doesn't exist.
+        batch_size : int
+            Number of records buffered before they are written.
+        """
+
+        super().__init__(batch_size)
+        self.path = path
+        self.table = table
+        self._conn = None
+        self._insert = None
+
+    def _write(self, records):
+
+        if self._conn is None:
+            columns = ", ".join(_quote(c) for c in records[0])
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {_quote(self.table)} ({columns})"
+            )
+            self._insert = (
+                f"INSERT INTO {_quote(self.table)} ({columns}) "
+                f"VALUES ({', '.join('?' * len(records[0]))})"
+            )
+
+        with self._conn:
+            self._conn.executemany(
+                self._insert,
+                (
+                    [
+                        v.isoformat() if isinstance(v, dt.datetime) else v
+                        for v in record.values()
+                    ]
+                    for record in records
+                ),
+            )
+
+    def _close(self):
+
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class ParquetSink(ResultSink):
+    """
+    Writes project records to a Parquet file, one row group per batch.
+    Requires `pyarrow`. Column types are inferred from the first batch.
+    """
+
+    def __init__(self, path, batch_size=1000):
+        """
+        Creates an instance of `ParquetSink`.
+
+        Parameters
+        ----------
+        path : str
+            Path of the Parquet file, which is overwritten.
+        batch_size : int
+            Number of records buffered before they are written.
+        """
+
+        import pyarrow
+        import pyarrow.parquet
+
+        super().__init__(batch_size)
+        self.path = path
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._writer = None
+
+    def _write(self, records):
+
+        if self._writer is None:
+            table = self._pa.Table.from_pylist(records)
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+
+        else:
+            table = self._pa.Table.from_pylist(
+                records, schema=self._writer.schema
+            )
+
+        self._writer.write_table(table)
+
+    def _close(self):
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+SINKS = {
+    ".csv": CSVSink,
+    ".parquet": ParquetSink,
+    ".db": SQLiteSink,
+    ".sqlite": SQLiteSink,
+}
+
+
+def open_sink(path, **kwargs):
+    """
+    Return a sink writing to `path`, chosen by the file extension: '.csv',
+    '.parquet', '.db' or '.sqlite'.
+
+    Parameters
+    ----------
+    path : str
+        Output path.
+    kwargs : dict
+        Passed to the sink.
+    """
+
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        return SINKS[ext](path, **kwargs)
+
+    except KeyError:
+        raise ValueError(
+            f"Sink for '{ext}' not recognized. Options: {tuple(SINKS)}"
+        )
+
+
+def _quote(name):
+    """Return SQL quoted identifier `name`."""
+
+    return '"' + str(name).replace('"', '""') + '"'
@@ -0,0 +1,443 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import os
+import time
+import tempfile
+from functools import partial
+from itertools import product
+from collections.abc import Mapping
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    wait,
+    as_completed,
+)
+
+import numpy as np
+import pandas as pd
+
+from CORAL.cache import ProjectCache, project_key, weather_fingerprint
+from CORAL.jobs import JobStore, worker_id
+from CORAL.library import compile_library, library_fingerprint
+from CORAL.manager import GlobalManager
+from CORAL.weather import WeatherStore
+
+# Configurations and manager arguments of a sweep worker process.
+_SWEEP = None
+
+
+def expand_grid(options):
+    """
+    Return allocations for every combination of `options`.
+
+    Parameters
+    ----------
+    options : dict
+        Candidate allocations per resource category, e.g.
+        `{"wtiv": [("example_wtiv", 1), ("example_wtiv", 2)]}`.
+    """
+
+    keys = list(options)
+    return [dict(zip(keys, values)) for values in product(*options.values())]
+
+
+def sweep(
+    configs,
+    allocation_grid,
+    workers=None,
+    callback=None,
+    engine="simpy",
+    library_path=None,
+    cache=None,
+    store=None,
+    **kwargs,
+):
+    """
+    Simulate `configs` with each allocation in `allocation_grid` and return
+    a `pd.DataFrame` with one row of summary metrics per scenario, see
+    `summarize`, and the total number of resources allocated per category.
+
+    With a `store`, scenarios are queued in a `JobStore` and results are
+    kept in it. Scenarios completed by an earlier or concurrent sweep with
+    the same store, on this or another machine, aren't re-ran, so a sweep
+    that crashed resumes where it stopped. Scenario names must be strings
+    or integers.
+
+    Parameters
+    ----------
+    configs : list
+        List of ORBIT configurations, shared by every scenario.
+    allocation_grid : list | dict
+        Allocations of each scenario, see `GlobalManager`. Scenarios are
+        named by their position in a list or their key in a dictionary.
+    workers : int | None
+        Number of worker processes. If `None`, scenarios are simulated in
+        this process.
+    callback : callable | None
+        Called with the scenario name and metrics as each scenario
+        completes.
+    engine : str
+        Scheduling backend, see `GlobalManager.run`.
+    library_path : str | None
+        Path to shared library items or a library snapshot. Directories are
+        compiled to a snapshot once and shared by every scenario.
+    cache : ProjectCache | None
+        Cache of ORBIT project results. Defaults to a temporary cache that
+        is shared by every scenario and worker process.
+    store : JobStore | str | None
+        Job store, a proxy returned by `CORAL.jobs.connect_store`, or the
+        path of a SQLite job store created for `configs`.
+    kwargs : dict
+        Passed to `GlobalManager`.
+    """
+
+    scenarios = _get_scenarios(allocation_grid)
+    options = {
+        "workers": workers,
+        "engine": engine,
+        "library_path": library_path,
+        "cache": cache,
+    }
+
+    if store is None:
+        runs = iter_sweep(configs, scenarios, **options, **kwargs)
+
+    else:
+        if isinstance(store, str):
+            key = sweep_key(configs, engine, library_path, **kwargs)
+            store = JobStore(store, key=key)
+
+        store.submit(scenarios)
+        runs = iter_jobs(store, configs, **options, **kwargs)
+
+    rows = {}
+    for name, metrics in runs:
+        rows[name] = metrics
+        if callback is not None:
+            callback(name, metrics)
+
+    if store is not None:
+        rows = store.results(scenarios)
+
+    frame = pd.DataFrame.from_dict(
+        {k: {**_count(v), **rows.get(k, {})} for k, v in scenarios.items()},
+        orient="index",
+    )
+    frame.index.name = "scenario"
+
+    return frame
+
+
+def iter_sweep(
+    configs,
+    allocation_grid,
+    workers=None,
+    engine="simpy",
+    library_path=None,
+    cache=None,
+    **kwargs,
+):
+    """
+    Yield the name and summary metrics of each scenario in
+    `allocation_grid` as it completes. See `sweep` for parameters.
+    """
+
+    scenarios = _get_scenarios(allocation_grid)
+    with tempfile.TemporaryDirectory() as tmp:
+
+        path, cache = _prepare(tmp, library_path, cache)
+        kwargs = {**kwargs, "library_path": path, "cache": cache}
+        if not workers:
+            for name, allocations in scenarios.items():
+                yield name, _run_scenario(allocations, engine, configs, kwargs)
+
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_initialize_worker,
+            initargs=(configs, kwargs),
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _run_worker_scenario, allocations, engine
+                ): name
+                for name, allocations in scenarios.items()
+            }
+
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+
+            finally:
+                for future in futures:
+                    future.cancel()
+
+
+def iter_jobs(
+    store,
+    configs,
+    workers=None,
+    engine="simpy",
+    library_path=None,
+    cache=None,
+    worker=None,
+    poll=5.0,
+    **kwargs,
+):
+    """
+    Lease scenarios from `store` and yield the name and summary metrics of
+    each as it completes, until no scenario is pending or leased by another
+    worker. Results are stored as scenarios complete. Scenarios that raise
+    are marked failed before the error is raised, and leases held when the
+    iterator stops are released. See `sweep` for other parameters.
+
+    Parameters
+    ----------
+    store : JobStore
+        Job store, or a proxy returned by `CORAL.jobs.connect_store`.
+    worker : str | None
+        Worker identifier. Defaults to `CORAL.jobs.worker_id`.
+    poll : int | float
+        Seconds between checks for expired leases while other workers hold
+        the remaining scenarios.
+    """
+
+    worker = worker if worker is not None else worker_id()
+    with tempfile.TemporaryDirectory() as tmp:
+
+        path, cache = _prepare(tmp, library_path, cache)
+        kwargs = {**kwargs, "library_path": path, "cache": cache}
+        if not workers:
+            while True:
+                job = store.lease(worker)
+                if job is None:
+                    if store.finished():
+                        return
+
+                    time.sleep(poll)
+                    continue
+
+                name, allocations = job
+                run = partial(
+                    _run_scenario, allocations, engine, configs, kwargs
+                )
+                yield name, _store_result(store, name, run)
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_initialize_worker,
+            initargs=(configs, kwargs),
+        ) as executor:
+            yield from _iter_leased(
+                store, worker, poll, executor, workers, engine
+            )
+
+
+def sweep_key(configs, engine="simpy", library_path=None, **kwargs):
+    """
+    Return key of the results of sweeping `configs`, see `JobStore`. The
+    key covers the configurations, engine, shared library contents,
+    weather, scheduler, leasing, coalescing and the ORBIT version.
+
+    Parameters
+    ----------
+    configs : list
+        List of ORBIT configurations.
+    engine : str
+        Scheduling backend.
+    library_path : str | None
+        Path to shared library items or a library snapshot.
+    kwargs : dict
+        `GlobalManager` arguments.
+    """
+
+    weather = kwargs.get("weather", None)
+    if isinstance(weather, WeatherStore):
+        weather = ",".join(weather.fingerprint(r) for r in weather.regions)
+
+    else:
+        weather = weather_fingerprint(weather)
+
+    options = {
+        "configs": list(configs),
+        "engine": engine,
+        "library": library_fingerprint(_library_path(library_path)),
+        "scheduler": kwargs.get("scheduler", None),
+        "leasing": kwargs.get("leasing", False),
+        "coalesce": kwargs.get("coalesce", False),
+    }
+
+    return project_key(options, weather)
+
+
+def summarize(manager):
+    """
+    Return summary metrics of a completed `GlobalManager` simulation: number
+    of projects, makespan, mean and maximum wait for shared resources and
+    utilization per resource category over the makespan.
+
+    Parameters
+    ----------
+    manager : GlobalManager
+    """
+
+    results = manager.results
+    makespan = float(results["Finished"].max()) if len(results) else 0.0
+    metrics = {
+        "projects": len(results),
+        "makespan": makespan,
+        "mean_wait": float(results["Wait"].mean()),
+        "max_wait": float(results["Wait"].max()),
+    }
+
+    utilization = manager.library.utilization(makespan)
+    for category, frame in utilization.groupby(level="category", sort=False):
+        busy = frame["busy_hours"].sum()
+        total = busy + frame["idle_hours"].sum()
+        metrics[f"utilization_{category}"] = busy / total if total else np.nan
+
+    return metrics
+
+
+def _prepare(tmp, library_path=None, cache=None):
+    """
+    Return library snapshot and project cache shared by the scenarios of a
+    sweep, created in directory `tmp` if needed.
+
+    Parameters
+    ----------
+    tmp : str
+        Temporary directory that outlives the sweep.
+    library_path : str | None
+        Path to shared library items or a library snapshot.
+    cache : ProjectCache | None
+    """
+
+    path = _library_path(library_path)
+    if not os.path.isfile(path):
+        path = compile_library(path, os.path.join(tmp, "library.pkl"))
+
+    if cache is None:
+        cache = ProjectCache(path=os.path.join(tmp, "cache"))
+
+    return path, cache
+
+
+def _library_path(library_path):
+    """Return `library_path`, or the ORBIT library if it is `None`."""
+
+    if library_path is None:
+        from ORBIT.core.library import default_library
+
+        return default_library
+
+    return library_path
+
+
+def _get_scenarios(allocation_grid):
+    """Return dictionary of allocations per scenario name."""
+
+    if isinstance(allocation_grid, Mapping):
+        return dict(allocation_grid)
+
+    return dict(enumerate(allocation_grid))
+
+
+def _iter_leased(store, worker, poll, executor, workers, engine):
+    """
+    Yield the name and summary metrics of scenarios leased from `store` and
+    simulated in `executor`, keeping `workers` scenarios in flight.
+    """
+
+    pending = {}
+    try:
+        while True:
+            while len(pending) < workers:
+                job = store.lease(worker)
+                if job is None:
+                    break
+
+                name, allocations = job
+                future = executor.submit(
+                    _run_worker_scenario, allocations, engine
+                )
+                pending[future] = name
+
+            if not pending:
+                if store.finished():
+                    return
+
+                time.sleep(poll)
+                continue
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                yield name, _store_result(store, name, future.result)
+
+    finally:
+        for future, name in pending.items():
+            future.cancel()
+            store.release(name)
+
+
+def _store_result(store, name, run):
+    """
+    Return result of `run` and store it as the result of scenario `name`.
+    The scenario is marked failed if `run` raises, or released if it is
+    interrupted.
+    """
+
+    try:
+        metrics = run()
+
+    except Exception as e:
+        store.fail(name, repr(e))
+        raise
+
+    except BaseException:
+        store.release(name)
+        raise
+
+    store.complete(name, metrics)
+    return metrics
+
+
+def _count(allocations):
+    """Return total number of resources per category in `allocations`."""
+
+    counts = {}
+    for key, data in allocations.items():
+        if isinstance(data, tuple):
+            data = [data]
+
+        counts[key] = sum(capacity for _, capacity in data)
+
+    return counts
+
+
+def _run_scenario(allocations, engine, configs, kwargs):
+    """Simulate `configs` with `allocations` and return summary metrics."""
+
+    manager = GlobalManager(configs, allocations, **kwargs)
+    manager.run(engine=engine)
+
+    return summarize(manager)
+
+
+def _initialize_worker(configs, kwargs):
+    """Store the configurations and manager arguments of a sweep worker."""
+
+    global _SWEEP
+    _SWEEP = (configs, kwargs)
+
+
+def _run_worker_scenario(allocations, engine):
+    """Simulate a scenario with the configurations of a sweep worker."""
+
+    return _run_scenario(allocations, engine, *_SWEEP)
@@ -0,0 +1,290 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import os
+import json
+import hashlib
+from collections.abc import Mapping
+
+import numpy as np
+
+DATA = "weather.npy"
+DATES = "datetime.npy"
+META = "weather.json"
+
+
+class WeatherStore:
+    """
+    Memory-mapped store of hourly weather profiles for one or more regions.
+    Profiles are held in a single float array on disk, so every process that
+    opens the store shares the same pages and views are handed to ORBIT
+    without copying. Stores are pickled by path, so passing one to a worker
+    process re-attaches to the file instead of copying the data.
+    """
+
+    def __init__(self, path, offset=0):
+        """
+        Opens the `WeatherStore` at `path`.
+
+        Parameters
+        ----------
+        path : str
+            Directory of a store created with `WeatherStore.create`.
+        offset : int
+            Index of the stored profiles that views start from, see
+            `WeatherStore.shift`.
+        """
+
+        self.path = path
+        self.offset = offset
+
+        with open(os.path.join(path, META), "r") as f:
+            meta = json.load(f)
+
+        self.columns = meta["columns"]
+        self.datetime = meta.get("datetime", None)
+        self.regions = [r["name"] for r in meta["regions"]]
+        self.coords = {
+            r["name"]: tuple(r["coords"])
+            for r in meta["regions"]
+            if r["coords"] is not None
+        }
+
+        self._index = {name: i for i, name in enumerate(self.regions)}
+        self._data = np.load(os.path.join(path, DATA), mmap_mode="r")
+        self._dates = None
+        if self.datetime is not None:
+            self._dates = np.load(os.path.join(path, DATES), mmap_mode="r")
+
+        self._fingerprints = {}
+
+    def __reduce__(self):
+        return (self.__class__, (self.path, self.offset))
+
+    def __len__(self):
+        return self._data.shape[1] - self.offset
+
+    def shift(self, offset):
+        """
+        Return the store with views starting `offset` hours later, e.g. a
+        later weather year. The shifted store shares the memory-mapped data.
+
+        Parameters
+        ----------
+        offset : int
+            Number of hours to shift by.
+        """
+
+        if not 0 <= self.offset + offset < self._data.shape[1]:
+            raise ValueError(
+                f"Offset {offset} is outside of the weather profile."
+            )
+
+        # Not `copy`, which re-opens the store through `__reduce__`.
+        store = object.__new__(self.__class__)
+        store.__dict__.update(self.__dict__, offset=self.offset + offset)
+
+        return store
+
+    @classmethod
+    def create(cls, path, weather, coords=None):
+        """
+        Write weather profiles to a new store at `path`.
+
+        Parameters
+        ----------
+        path : str
+            Directory to create the store in.
+        weather : pd.DataFrame | np.ndarray | dict
+            Weather profile, or dictionary of profiles by region name. All
+            profiles must have the same length and columns. A 'datetime'
+            column or a `pd.DatetimeIndex` is stored separately and restored
+            by `WeatherStore.view`, other non-numeric columns are dropped.
+        coords : dict | None
+            `(lat, lon)` of each region, used to select the region nearest
+            to a project.
+        """
+
+        import pandas as pd
+
+        if not isinstance(weather, Mapping):
+            weather = {"default": weather}
+
+        coords = coords if coords else {}
+        frames = {k: pd.DataFrame(v) for k, v in weather.items()}
+        columns = [
+            str(c)
+            for c, dtype in next(iter(frames.values())).dtypes.items()
+            if np.issubdtype(dtype, np.number)
+        ]
+        datetime = _get_datetime_layout(next(iter(frames.values())))
+
+        lengths = {len(frame) for frame in frames.values()}
+        if len(lengths) != 1:
+            raise ValueError("Weather profiles must have the same length.")
+
+        shape = (len(frames), lengths.pop(), len(columns))
+        os.makedirs(path, exist_ok=True)
+        data = np.lib.format.open_memmap(
+            os.path.join(path, DATA), mode="w+", dtype=float, shape=shape
+        )
+
+        for i, frame in enumerate(frames.values()):
+            data[i] = frame[columns].to_numpy(dtype=float)
+
+        data.flush()
+        del data
+
+        if datetime is not None:
+            dates = np.lib.format.open_memmap(
+                os.path.join(path, DATES),
+                mode="w+",
+                dtype="datetime64[ns]",
+                shape=shape[:2],
+            )
+
+            for i, frame in enumerate(frames.values()):
+                values = frame.index
+                if datetime["position"] is not None:
+                    values = frame["datetime"]
+
+                dates[i] = pd.to_datetime(values).to_numpy("datetime64[ns]")
+
+            dates.flush()
+            del dates
+
+        meta = {
+            "columns": columns,
+            "datetime": datetime,
+            "regions": [
+                {
+                    "name": name,
+                    "coords": list(coords[name]) if name in coords else None,
+                }
+                for name in frames
+            ],
+        }
+
+        with open(os.path.join(path, META), "w") as f:
+            json.dump(meta, f)
+
+        return cls(path)
+
+    def view(self, start=0, region=None):
+        """
+        Return weather profile of `region` starting at index `start` as a
+        `pd.DataFrame` backed by the memory-mapped store. Stored datetimes
+        are restored as the 'datetime' column or the index.
+
+        Parameters
+        ----------
+        start : int
+            Start index.
+        region : str | None
+            Region name. Defaults to the first region.
+        """
+
+        import pandas as pd
+
+        i = self._index[region] if region is not None else 0
+        start += self.offset
+        frame = pd.DataFrame(
+            self._data[i, start:], columns=self.columns, copy=False
+        )
+
+        if self.datetime is None:
+            return frame
+
+        dates = pd.DatetimeIndex(self._dates[i, start:])
+        if self.datetime["position"] is None:
+            frame.index = dates
+
+        else:
+            frame.insert(self.datetime["position"], "datetime", dates)
+
+        return frame
+
+    def select_region(self, name=None, coords=None):
+        """
+        Return region `name` if it exists in the store, otherwise the region
+        nearest to `coords`, otherwise the first region.
+
+        Parameters
+        ----------
+        name : str | None
+            Region name, e.g. a port region.
+        coords : tuple | None
+            `(lat, lon)` of the project.
+        """
+
+        if name in self._index:
+            return name
+
+        if coords is not None and self.coords:
+            return min(
+                self.coords, key=lambda r: _distance(coords, self.coords[r])
+            )
+
+        return self.regions[0]
+
+    def fingerprint(self, region=None):
+        """
+        Return hash of the weather profile of `region` and the offset of the
+        store.
+
+        Parameters
+        ----------
+        region : str | None
+            Region name. Defaults to the first region.
+        """
+
+        region = region if region is not None else self.regions[0]
+        if region not in self._fingerprints:
+            data = np.ascontiguousarray(self._data[self._index[region]])
+            h = hashlib.sha256(json.dumps(self.columns).encode())
+            h.update(data.tobytes())
+            if self._dates is not None:
+                dates = np.ascontiguousarray(self._dates[self._index[region]])
+                h.update(dates.tobytes())
+
+            self._fingerprints[region] = h.hexdigest()
+
+        if self.offset:
+            return f"{self._fingerprints[region]}+{self.offset}"
+
+        return self._fingerprints[region]
+
+
+def _get_datetime_layout(frame):
+    """
+    Return how datetimes of weather profile `frame` are stored, `None` if it
+    has none. The position is that of the 'datetime' column among the
+    stored columns, or `None` for a `pd.DatetimeIndex`.
+    """
+
+    import pandas as pd
+
+    if "datetime" in frame:
+        numeric = [np.issubdtype(dtype, np.number) for dtype in frame.dtypes]
+        position = sum(numeric[: frame.columns.get_loc("datetime")])
+        return {"position": int(position)}
+
+    if isinstance(frame.index, pd.DatetimeIndex):
+        return {"position": None}
+
+    return None
+
+
+def _distance(a, b):
+    """Return great circle distance in km between `(lat, lon)` pairs."""
+
+    lat1, lon1, lat2, lon2 = np.radians([*a, *b])
+    h = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+
+    return 2 * 6371 * np.arcsin(np.sqrt(h))
@@ -0,0 +1,109 @@
+"""
+Import time benchmarks for CORAL.
+
+Times a cold import of each module in a fresh interpreter, keeping the best
+of `--repeat` runs, and checks it against a budget well below the cost of
+importing ORBIT. Modules are also checked to not import ORBIT or pandas.
+
+Usage::
+
+    python -m benchmarks.bench_imports
+    python -m benchmarks.bench_imports --repeat 10 --scale 2
+"""
+
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import sys
+import json
+import argparse
+import subprocess
+
+# Seconds allowed for each import.
+BUDGETS = {
+    "CORAL": 0.1,
+    "CORAL.scheduling": 0.1,
+    "CORAL.engine": 0.1,
+    "CORAL.manager": 1.0,
+}
+
+SCRIPT = """
+import sys, json
+from time import perf_counter
+start = perf_counter()
+import {module}
+print(json.dumps([
+    perf_counter() - start, "ORBIT" in sys.modules, "pandas" in sys.modules
+]))
+"""
+
+
+def measure(module):
+    """Return import time of `module` in a fresh interpreter and whether
+    it imported ORBIT and pandas."""
+
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(module=module)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+    return json.loads(output)
+
+
+def bench_module(module, repeat):
+    """Return best import time of `module` over `repeat` runs and whether
+    any run imported ORBIT or pandas."""
+
+    times, heavy = [], False
+    for _ in range(repeat):
+        seconds, orbit, pandas = measure(module)
+        times.append(seconds)
+        heavy = heavy or orbit or pandas
+
+    return min(times), heavy
+
+
+def report(results, scale):
+    """Print results table."""
+
+    print(f"{'module':<20}{'time':>10}{'budget':>10}{'heavy':>8}")
+    for module, (time_, heavy) in results.items():
+        budget = BUDGETS[module] * scale
+        print(f"{module:<20}{time_:>9.3f}s{budget:>9.3f}s{str(heavy):>8}")
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modules", nargs="+", default=list(BUDGETS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scale", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    results = {m: bench_module(m, args.repeat) for m in args.modules}
+    report(results, args.scale)
+
+    failures = 0
+    for module, (time_, heavy) in results.items():
+        budget = BUDGETS[module] * args.scale
+        if heavy:
+            print(f"Failure: importing {module} imports ORBIT or pandas")
+            failures += 1
+
+        if time_ >= budget:
+            print(
+                f"Failure: importing {module} took {time_:.3f}s "
+                f"(budget {budget:.3f}s)"
+            )
+            failures += 1
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
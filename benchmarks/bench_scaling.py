@@ -0,0 +1,255 @@
+"""
+Scaling benchmarks for CORAL.
+
+Times the hot paths of a simulation separately for synthetic pipelines of
+increasing size and reports wall time and peak traced memory per stage:
+
+- pipeline: `Pipeline` construction from CSV.
+- init: `GlobalManager.__init__`, excluding `setup`.
+- setup: `GlobalManager.setup`.
+- orbit: ORBIT runs of the distinct project configurations, used to warm
+  the project cache so later stages measure CORAL itself.
+- run: `GlobalManager.run` against the warm cache.
+- wakeups: `SharedLibrary` request and release wakeups for every project
+  queued on one single-capacity pool.
+- logs: 100 accesses of `GlobalManager.logs` and `GlobalManager.results`.
+
+Usage::
+
+    python -m benchmarks.bench_scaling --sizes 10 100 1000 10000 50000
+    python -m benchmarks.bench_scaling --save baseline.json
+    python -m benchmarks.bench_scaling --compare baseline.json
+"""
+
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import io
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+import warnings
+from contextlib import contextmanager, redirect_stdout
+
+from simpy import Environment
+
+from CORAL import Pipeline, GlobalManager, SharedLibrary
+from CORAL.cache import ProjectCache
+from CORAL.manager import MultiRequest
+from benchmarks.synthetic import write_scenario
+
+STAGES = ("pipeline", "init", "setup", "orbit", "run", "wakeups", "logs")
+
+
+class Timings:
+    """Collects time and peak memory per stage."""
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.results = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as stage `name`."""
+
+        if self.memory:
+            tracemalloc.start()
+
+        start = time.perf_counter()
+        try:
+            yield
+
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = None
+            if self.memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+            time_, peak_ = self.results.get(name, (0.0, None))
+            if peak_ is not None and peak is not None:
+                peak = max(peak, peak_)
+
+            self.results[name] = (time_ + elapsed, peak)
+
+
+class TimedManager(GlobalManager):
+    """`GlobalManager` that times `setup` separately from `__init__`."""
+
+    timings = None
+
+    def setup(self):
+        with self.timings.stage("setup"):
+            super().setup()
+
+
+def bench_size(num_projects, directory, args, cache):
+    """Run every stage for a pipeline of `num_projects` projects."""
+
+    timings = Timings(memory=not args.no_memory)
+    projects_fp, base_fp, library, allocations = write_scenario(
+        directory, num_projects, contention=args.contention, seed=args.seed
+    )
+
+    with timings.stage("pipeline"):
+        pipeline = Pipeline(projects_fp, base_fp, layered=args.layered)
+
+    representatives = {}
+    for config in pipeline.configs:
+        key = (
+            config["port"],
+            config["plant"]["num_turbines"],
+            config["site"]["depth"],
+        )
+        representatives.setdefault(key, config)
+
+    with timings.stage("orbit"):
+        warm = GlobalManager(
+            list(representatives.values()),
+            allocations,
+            library_path=library,
+            cache=cache,
+            workers=args.workers,
+        )
+        warm.run(engine="fast")
+
+    TimedManager.timings = timings
+    with timings.stage("init"):
+        manager = TimedManager(
+            pipeline.configs, allocations, library_path=library, cache=cache
+        )
+
+    time_, peak = timings.results["init"]
+    timings.results["init"] = (time_ - timings.results["setup"][0], peak)
+
+    with timings.stage("run"):
+        manager.run(engine=args.engine)
+
+    with timings.stage("wakeups"):
+        bench_wakeups(num_projects, library)
+
+    with timings.stage("logs"):
+        for _ in range(100):
+            manager.logs
+            manager.results
+
+    return timings.results
+
+
+def bench_wakeups(num_projects, library):
+    """Queue every project on one pool and release them one at a time."""
+
+    env = Environment()
+    region = "northeast"
+    shared = SharedLibrary(
+        env,
+        {"wtiv": ("example_wtiv", 1), "port": [(region, num_projects)]},
+        path=library,
+    )
+
+    requests = []
+    for i in range(num_projects):
+        request = MultiRequest(
+            env, {"port": region, "wtiv": "example_wtiv"}, f"Project {i}"
+        )
+        shared.request(request)
+        requests.append(request)
+
+    for request in requests:
+        shared.release(request)
+
+
+def report(results):
+    """Print results table."""
+
+    print(f"{'projects':>10}" + "".join(f"{s:>16}" for s in STAGES))
+    for size, stages in results.items():
+        row = f"{size:>10}"
+        for stage in STAGES:
+            time_, peak = stages[stage]
+            cell = f"{time_:.3f}s"
+            if peak is not None:
+                cell += f"/{peak / 2 ** 20:.0f}MB"
+
+            row += f"{cell:>16}"
+
+        print(row)
+
+
+def compare(results, baseline, tolerance):
+    """Return list of stages slower than `baseline` by more than
+    `tolerance`."""
+
+    regressions = []
+    for size, stages in results.items():
+        for stage, (time_, _) in stages.items():
+            try:
+                reference = baseline[str(size)][stage][0]
+
+            except KeyError:
+                continue
+
+            if time_ > reference * (1 + tolerance):
+                regressions.append((size, stage, time_, reference))
+
+    return regressions
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[10, 100, 1000, 10000]
+    )
+    parser.add_argument("--contention", type=float, default=1.5)
+    parser.add_argument("--engine", default="fast")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--layered", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--save", default=None)
+    parser.add_argument("--compare", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter("ignore")
+    cache = ProjectCache(maxsize=4096)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            # ORBIT prints vessel capacity warnings to stdout.
+            with redirect_stdout(io.StringIO()):
+                results[size] = bench_size(size, directory, args, cache)
+
+    report(results)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+
+        regressions = compare(results, baseline, args.tolerance)
+        for size, stage, time_, reference in regressions:
+            print(
+                f"Regression: {stage} at {size} projects took {time_:.3f}s "
+                f"(baseline {reference:.3f}s)"
+            )
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
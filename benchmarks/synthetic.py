@@ -0,0 +1,198 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import os
+import shutil
+import datetime as dt
+
+import yaml
+import numpy as np
+import pandas as pd
+from ORBIT.core.library import default_library
+
+REGIONS = {
+    "northeast": (40.96, -70.83),
+    "central": (38.30, -74.60),
+    "south": (35.20, -75.30),
+}
+TURBINE = "12MW_generic"
+TURBINE_RATING = 12
+NUM_TURBINES = (40, 60, 80)
+DEPTHS = (25, 35)
+VESSELS = (
+    "example_wtiv",
+    "example_feeder",
+    "example_scour_protection_vessel",
+)
+
+# Approximate ORBIT project time of the base config below, used to size
+# allocations for a target level of contention.
+MEAN_PROJECT_TIME = 4000
+START = dt.datetime(2025, 1, 1)
+
+BASE_CONFIG = {
+    "wtiv": "example_wtiv",
+    "spi_vessel": "example_scour_protection_vessel",
+    "site": {
+        "depth": 30,
+        "distance": 50,
+        "mean_windspeed": 9,
+        "distance_to_landfall": 40,
+    },
+    "plant": {
+        "num_turbines": 50,
+        "layout": "grid",
+        "row_spacing": 7,
+        "turbine_spacing": 7,
+        "substation_distance": 1,
+    },
+    "turbine": TURBINE,
+    "port": {"num_cranes": 1},
+    "scour_protection_design": {
+        "cost_per_tonne": 40,
+        "scour_protection_depth": 1,
+    },
+    "design_phases": [],
+    "install_phases": {},
+}
+
+
+def generate_pipeline(num_projects, years=20, seed=0):
+    """
+    Return a synthetic pipeline with the columns of `tests/test_pipeline.csv`.
+    Projects are spread uniformly over `years` across the regions in
+    `REGIONS`. Sites are drawn from a small set of turbine counts and depths,
+    so the number of distinct ORBIT configurations stays small regardless of
+    `num_projects`.
+
+    Parameters
+    ----------
+    num_projects : int
+        Number of projects.
+    years : int
+        Length of the period over which projects start.
+    seed : int
+        Random seed.
+    """
+
+    rng = np.random.default_rng(seed)
+    regions = rng.choice(list(REGIONS), num_projects)
+    num_turbines = rng.choice(NUM_TURBINES, num_projects)
+    days = rng.integers(0, 365 * years, num_projects)
+
+    return pd.DataFrame(
+        {
+            "name": [f"Synthetic {i}" for i in range(num_projects)],
+            "lat": [REGIONS[r][0] for r in regions],
+            "lon": [REGIONS[r][1] for r in regions],
+            "capacity": num_turbines * TURBINE_RATING,
+            "turbine": TURBINE,
+            "depth": rng.choice(DEPTHS, num_projects),
+            "distance_to_site_(km)": 50,
+            "distance_to_shore": 40,
+            "substructure": "monopile",
+            "start_date": pd.Timestamp(START)
+            + pd.to_timedelta(np.sort(days), unit="D"),
+            "port_region": regions,
+        }
+    )
+
+
+def generate_allocations(pipeline, contention=1.0, years=20):
+    """
+    Return allocations for `pipeline`. Each pool's capacity is its average
+    concurrent demand divided by `contention`, so `contention` around 1
+    gives light queueing and larger values give long queues.
+
+    Parameters
+    ----------
+    pipeline : pd.DataFrame
+        Pipeline from `generate_pipeline`.
+    contention : float
+        Ratio of demand to capacity.
+    years : int
+        Length of the period over which projects start.
+    """
+
+    hours = years * 8760
+
+    def capacity(n):
+        return max(1, int(round(n * MEAN_PROJECT_TIME / hours / contention)))
+
+    counts = pipeline["port_region"].value_counts()
+    return {
+        "wtiv": ("example_wtiv", capacity(len(pipeline))),
+        "feeder": ("example_feeder", capacity(2 * len(pipeline))),
+        "port": [(r, capacity(n)) for r, n in counts.items()],
+    }
+
+
+def write_library(path):
+    """
+    Write a shared resource library with a port per region and the ORBIT
+    example vessels to `path`.
+
+    Parameters
+    ----------
+    path : str
+    """
+
+    os.makedirs(os.path.join(path, "ports"), exist_ok=True)
+    os.makedirs(os.path.join(path, "vessels"), exist_ok=True)
+
+    for region, (lat, lon) in REGIONS.items():
+        with open(os.path.join(path, "ports", f"{region}.yaml"), "w") as f:
+            yaml.dump({"num_cranes": 1, "lat": lat, "lon": lon}, f)
+
+    for vessel in VESSELS:
+        shutil.copy(
+            os.path.join(default_library, "vessels", f"{vessel}.yaml"),
+            os.path.join(path, "vessels", f"{vessel}.yaml"),
+        )
+
+    return path
+
+
+def write_base_config(path):
+    """
+    Write base ORBIT configuration for synthetic pipelines to `path`.
+
+    Parameters
+    ----------
+    path : str
+    """
+
+    with open(path, "w") as f:
+        yaml.dump(BASE_CONFIG, f)
+
+    return path
+
+
+def write_scenario(directory, num_projects, contention=1.0, seed=0):
+    """
+    Write a synthetic pipeline, base config and library to `directory`.
+    Returns the pipeline filepath, base config filepath, library path and
+    allocations.
+
+    Parameters
+    ----------
+    directory : str
+    num_projects : int
+    contention : float
+    seed : int
+    """
+
+    os.makedirs(directory, exist_ok=True)
+
+    pipeline = generate_pipeline(num_projects, seed=seed)
+    projects_fp = os.path.join(directory, f"pipeline_{num_projects}.csv")
+    pipeline.to_csv(projects_fp, index=False, date_format="%Y-%m-%d")
+
+    base_fp = write_base_config(os.path.join(directory, "base.yaml"))
+    library = write_library(os.path.join(directory, "library"))
+    allocations = generate_allocations(pipeline, contention)
+
+    return projects_fp, base_fp, library, allocations
@@ -5,11 +5,18 @@ __email__ = "jake.nunemaker@nrel.gov"
 
 
 import os
+import asyncio
+import datetime as dt
 from copy import deepcopy
 
+import pytest
+import numpy as np
+import pandas as pd
 from ORBIT import ProjectManager
 
 from CORAL import GlobalManager
+from CORAL.cache import ProjectCache
+from CORAL.manager import ENGINES
 
 DIR = os.path.split(__file__)[0]
 LIBRARY_PATH = os.path.join(DIR, "test_library")
@@ -165,3 +172,534 @@ def test_staggered_resources_by_int():
     assert first["Started"] == 0
     assert second["Started"] == 400
     assert third["Started"] == 1000
+
+
+def test_parallel_workers_match_serial():
+
+    allocations = {
+        "wtiv": ("test_wtiv", 2),
+        "port": [("test_port_1", 1), ("test_port_2", 1)],
+    }
+
+    configs = []
+    for i, port in enumerate(["test_port_1", "test_port_1", "test_port_2"]):
+        config = deepcopy(BASE)
+        config["wtiv"] = "_shared_pool_:test_wtiv"
+        config["port"] = f"_shared_pool_:{port}"
+        config["plant"] = {"num_turbines": 10 + 5 * i}
+        configs.append(config)
+
+    serial = GlobalManager(configs, allocations, library_path=LIBRARY_PATH)
+    serial.run()
+
+    parallel = GlobalManager(
+        configs, allocations, library_path=LIBRARY_PATH, workers=2
+    )
+    parallel.run()
+
+    assert parallel.logs == serial.logs
+
+
+def test_speculative_workers_match_serial_with_weather():
+
+    rng = np.random.default_rng(0)
+    weather = pd.DataFrame(
+        {
+            "windspeed": rng.uniform(0, 20, 20000),
+            "waveheight": rng.uniform(0, 3, 20000),
+        }
+    )
+
+    allocations = {"port": [("test_port_1", 1), ("test_port_2", 1)]}
+
+    configs = []
+    for port, start in [
+        ("test_port_1", 0),
+        ("test_port_1", 0),
+        ("test_port_2", 100),
+    ]:
+        config = deepcopy(BASE)
+        config["port"] = f"_shared_pool_:{port}"
+        config["project_start"] = start
+        configs.append(config)
+
+    serial = GlobalManager(
+        configs, allocations, weather=weather, library_path=LIBRARY_PATH
+    )
+    serial.run()
+
+    parallel = GlobalManager(
+        configs,
+        allocations,
+        weather=weather,
+        library_path=LIBRARY_PATH,
+        workers=2,
+    )
+    parallel.run()
+
+    assert parallel.logs == serial.logs
+    assert serial.logs[0]["Finished"] != BASE_PROJECT_TIME
+
+
+def test_fast_engine_matches_simpy():
+
+    rng = np.random.default_rng(1)
+    allocations = {
+        "wtiv": ("test_wtiv", 2),
+        "port": [("test_port_1", 1), ("test_port_2", 2)],
+    }
+
+    configs = []
+    for i in range(40):
+        config = deepcopy(BASE)
+        config["plant"] = {"num_turbines": int(rng.choice([10, 20, 30]))}
+        config["port"] = "_shared_pool_:" + rng.choice(
+            ["test_port_1", "test_port_2"]
+        )
+        if rng.random() < 0.7:
+            config["wtiv"] = "_shared_pool_:test_wtiv"
+
+        config["project_start"] = int(rng.choice([0, 500, 1000, 5000]))
+        configs.append(config)
+
+    cache = ProjectCache()
+    managers = []
+    for engine in ENGINES:
+        manager = GlobalManager(
+            configs, allocations, library_path=LIBRARY_PATH, cache=cache
+        )
+        manager.add_future_resources("wtiv", "test_wtiv", [1000, 3000])
+        manager.add_future_resources("port", "test_port_1", [1000])
+        manager.run(engine=engine)
+        managers.append(manager)
+
+    simpy, fast = managers
+    assert fast.logs == simpy.logs
+    assert len(fast.logs) == 40
+    pd.testing.assert_frame_equal(
+        fast.library.utilization(), simpy.library.utilization()
+    )
+
+    # Later runs with either engine don't record the projects again.
+    timelines = [
+        len(r.timeline) for r in fast.library.resources["wtiv"].values()
+    ]
+    for engine in ENGINES:
+        fast.run(engine=engine)
+
+    async def run_async():
+        return [event async for event in fast.run_async()]
+
+    assert asyncio.run(run_async()) == []
+    assert fast.logs == simpy.logs
+    assert [
+        len(r.timeline) for r in fast.library.resources["wtiv"].values()
+    ] == timelines
+
+
+def test_results_frame_and_dates():
+
+    allocations = {"port": [("test_port_1", 1)]}
+    start = dt.datetime(2021, 5, 1)
+
+    config1 = deepcopy(BASE)
+    config1["port"] = "_shared_pool_:test_port_1"
+    config1["project_start"] = start
+
+    config2 = deepcopy(config1)
+    config2["project_start"] = start + dt.timedelta(days=10)
+
+    manager = GlobalManager(
+        [config1, config2], allocations, library_path=LIBRARY_PATH
+    )
+    manager.run()
+
+    first, second = manager.logs
+    assert second["Initialized"] == 240
+    assert type(second["Initialized"]) is int
+    assert type(second["Date Finished"]) is dt.datetime
+    assert second["Started"] == BASE_PROJECT_TIME
+    assert second["Date Finished"] == start + dt.timedelta(
+        hours=int(np.ceil(2 * BASE_PROJECT_TIME))
+    )
+
+    results = manager.results
+    assert list(results["name"]) == ["Project 1", "Project 2"]
+    assert list(results["port"]) == ["test_port_1", "test_port_1"]
+    assert results["Wait"].tolist() == [0, BASE_PROJECT_TIME - 240]
+    assert results["Date Started"][1] == first["Date Finished"]
+    assert manager.results is not results
+
+    # Changes to returned logs and results don't leak into the manager.
+    first["Started"] = -1
+    results.loc[0, "Wait"] = -1
+    assert manager.logs[0]["Started"] == 0
+    assert manager.results["Wait"][0] == 0
+
+
+def test_profile_and_callbacks():
+
+    allocations = {"port": [("test_port_1", 1)]}
+
+    config = deepcopy(BASE)
+    config["port"] = "_shared_pool_:test_port_1"
+    configs = [config, deepcopy(config), deepcopy(config)]
+
+    manager = GlobalManager(configs, allocations, library_path=LIBRARY_PATH)
+    manager.run()
+    assert manager.profile is None
+
+    for engine in ENGINES:
+        events = []
+        manager = GlobalManager(
+            configs,
+            allocations,
+            library_path=LIBRARY_PATH,
+            cache=ProjectCache(),
+            callbacks=[lambda event, data: events.append((event, data))],
+        )
+        manager.run(engine=engine)
+
+        profile = manager.profile
+        assert {"library", "setup", "run", "orbit", "check_requests"} <= set(
+            profile.stages.index
+        )
+        assert profile.stages.loc["orbit", "calls"] == 3
+        assert profile.projects["source"].tolist() == [
+            "orbit",
+            "cache",
+            "cache",
+        ]
+        assert profile.queues["length"].max() == 2
+
+        finished = [data for event, data in events if event == "finished"]
+        assert finished == manager.logs
+        assert "Max waiting requests: 2" in profile.report()
+
+
+def test_resource_utilization():
+
+    allocations = {"port": [("test_port_1", 1), ("test_port_2", 1)]}
+
+    config = deepcopy(BASE)
+    config["port"] = "_shared_pool_:test_port_1"
+    configs = [config, deepcopy(config), deepcopy(config)]
+
+    for engine in ENGINES:
+        manager = GlobalManager(
+            configs, allocations, library_path=LIBRARY_PATH
+        )
+        manager.add_future_resources("port", "test_port_1", [1])
+        manager.run(engine=engine)
+
+        stats = manager.library.utilization()
+        port1 = stats.loc[("port", "test_port_1")]
+        port2 = stats.loc[("port", "test_port_2")]
+        end = 2 * BASE_PROJECT_TIME
+
+        assert port1["capacity"] == 2
+        assert port1["peak_in_use"] == 2
+        assert port1["peak_queue"] == 2
+        assert port1["busy_hours"] == 3 * BASE_PROJECT_TIME
+        assert port1["idle_hours"] == 2 * end - 1 - 3 * BASE_PROJECT_TIME
+        assert port2["utilization"] == 0
+        assert port2["idle_hours"] == end
+
+        timeline = manager.library.resources["port"]["test_port_1"].timeline
+        assert timeline.to_frame()["time"].is_monotonic_increasing
+
+
+def test_priority_scheduler():
+
+    allocations = {"port": [("test_port_1", 1)]}
+
+    config = deepcopy(BASE)
+    config["port"] = "_shared_pool_:test_port_1"
+    low = {**config, "project_name": "low", "project_priority": 1}
+    high = {**config, "project_name": "high", "project_priority": 5}
+    configs = [config, low, high]
+
+    for scheduler, order in [
+        ("fifo", ["Project 1", "low", "high"]),
+        ("priority", ["Project 1", "high", "low"]),
+    ]:
+        for engine in ENGINES:
+            manager = GlobalManager(
+                configs,
+                allocations,
+                library_path=LIBRARY_PATH,
+                scheduler=scheduler,
+            )
+            manager.run(engine=engine)
+
+            started = sorted(manager.logs, key=lambda log: log["Started"])
+            assert [log["name"] for log in started] == order
+            assert "project_priority" in high
+
+
+def test_phase_leasing():
+
+    allocations = {"spi_vessel": ("test_spi_vessel", 1)}
+
+    config = deepcopy(BASE)
+    config["spi_vessel"] = "_shared_pool_:test_spi_vessel"
+    config["plant"] = {"num_turbines": 20, "turbine_spacing": 7}
+    config["port"] = {"num_cranes": 1}
+    config["scour_protection"] = {
+        "tonnes_per_substructure": 200,
+        "cost_per_tonne": 40,
+    }
+    config["install_phases"] = {
+        "ScourProtectionInstallation": 0,
+        "TurbineInstallation": ("ScourProtectionInstallation", 1.0),
+    }
+
+    configs = [deepcopy(config), deepcopy(config)]
+
+    held = GlobalManager(configs, allocations, library_path=LIBRARY_PATH)
+    held.run()
+    first, second = held.logs
+    assert second["Started"] == first["Finished"]
+
+    logs = []
+    for engine in ENGINES:
+        leased = GlobalManager(
+            configs, allocations, library_path=LIBRARY_PATH, leasing=True
+        )
+        leased.run(engine=engine)
+        logs.append(leased.logs)
+
+        first, second = leased.logs
+        assert 0 < second["Started"] < first["Finished"]
+        assert second["Finished"] - second["Started"] == pytest.approx(
+            first["Finished"] - first["Started"]
+        )
+
+        stats = leased.library.utilization().iloc[0]
+        assert stats["busy_hours"] < 2 * (first["Finished"] - first["Started"])
+
+    assert logs[0] == logs[1]
+
+
+def test_partitioned_components_match_serial():
+
+    allocations = {
+        "wtiv": [("test_wtiv", 1)],
+        "port": [("test_port_1", 1), ("test_port_2", 1)],
+    }
+
+    configs = []
+    for i, port in enumerate([1, 1, 2, 2, 2, None]):
+        config = deepcopy(BASE)
+        config["project_start"] = 200 * (i % 2)
+        if port is not None:
+            config["port"] = f"_shared_pool_:test_port_{port}"
+
+        if port == 2:
+            config["wtiv"] = "_shared_pool_:test_wtiv"
+
+        configs.append(config)
+
+    serial = GlobalManager(configs, allocations, library_path=LIBRARY_PATH)
+    assert serial.components() == [
+        (("Project 1", "Project 2"), (("port", "test_port_1"),)),
+        (
+            ("Project 3", "Project 4", "Project 5"),
+            (("wtiv", "test_wtiv"), ("port", "test_port_2")),
+        ),
+        (("Project 6",), ()),
+    ]
+
+    serial.add_future_resources("wtiv", "test_wtiv", [500])
+    serial.run()
+
+    for engine in ENGINES:
+        partitioned = GlobalManager(
+            configs,
+            allocations,
+            library_path=LIBRARY_PATH,
+            workers=2,
+            partition=True,
+            profile=True,
+        )
+        partitioned.add_future_resources("wtiv", "test_wtiv", [500])
+        partitioned.run(engine=engine)
+
+        assert partitioned.logs == serial.logs
+        assert partitioned.profile.projects.empty
+        pd.testing.assert_frame_equal(
+            partitioned.library.utilization(), serial.library.utilization()
+        )
+
+
+def test_resimulate_matches_full_run():
+
+    rng = np.random.default_rng(2)
+    allocations = {
+        "wtiv": ("test_wtiv", 2),
+        "port": [("test_port_1", 1), ("test_port_2", 1)],
+    }
+
+    configs = []
+    for i in range(12):
+        config = deepcopy(BASE)
+        config["plant"] = {"num_turbines": int(rng.choice([10, 20, 30]))}
+        config["port"] = "_shared_pool_:" + rng.choice(
+            ["test_port_1", "test_port_2"]
+        )
+        if rng.random() < 0.7:
+            config["wtiv"] = "_shared_pool_:test_wtiv"
+
+        config["project_start"] = int(rng.choice([0, 500, 1000, 5000]))
+        configs.append(config)
+
+    def full_run(configs, allocations):
+        manager = GlobalManager(
+            configs, allocations, library_path=LIBRARY_PATH
+        )
+        manager.add_future_resources("port", "test_port_1", [2000])
+        manager.run(engine="fast")
+        return manager
+
+    manager = GlobalManager(
+        configs,
+        allocations,
+        library_path=LIBRARY_PATH,
+        checkpoints=500,
+        profile=True,
+    )
+    manager.add_future_resources("port", "test_port_1", [2000])
+    manager.run(engine="fast")
+    assert manager.logs == full_run(configs, allocations).logs
+
+    moved = deepcopy(configs)
+    moved[9]["project_start"] = 6000
+    ran = len(manager.profile.projects)
+    manager.resimulate(starts={"Project 10": 6000})
+
+    expected = full_run(moved, allocations)
+    assert manager.logs == expected.logs
+    assert len(manager.profile.projects) - ran < len(configs)
+    pd.testing.assert_frame_equal(
+        manager.library.utilization(), expected.library.utilization()
+    )
+
+    allocations["wtiv"] = ("test_wtiv", 3)
+    manager.resimulate(capacities={("wtiv", "test_wtiv"): 3})
+
+    expected = full_run(moved, allocations)
+    assert manager.logs == expected.logs
+    pd.testing.assert_frame_equal(
+        manager.library.utilization(), expected.library.utilization()
+    )
+
+    simpy = GlobalManager(configs, allocations, library_path=LIBRARY_PATH)
+    simpy.run()
+    with pytest.raises(ValueError):
+        simpy.resimulate(starts={"Project 1": 100})
+
+
+def test_run_async_matches_run():
+
+    rng = np.random.default_rng(2)
+    weather = pd.DataFrame(
+        {
+            "windspeed": rng.uniform(0, 14, 20000),
+            "waveheight": rng.uniform(0, 3, 20000),
+        }
+    )
+
+    allocations = {
+        "wtiv": ("test_wtiv", 1),
+        "port": [("test_port_1", 1), ("test_port_2", 1)],
+    }
+
+    configs = []
+    for port, start in [
+        ("test_port_1", 0),
+        ("test_port_1", 0),
+        ("test_port_2", 100),
+        ("test_port_2", 100),
+    ]:
+        config = deepcopy(BASE)
+        config["wtiv"] = "_shared_pool_:test_wtiv"
+        config["port"] = f"_shared_pool_:{port}"
+        config["project_start"] = start
+        configs.append(config)
+
+    serial = GlobalManager(
+        configs, allocations, weather=weather, library_path=LIBRARY_PATH
+    )
+    serial.run()
+
+    async def run_async(**kwargs):
+        manager = GlobalManager(
+            configs,
+            allocations,
+            weather=weather,
+            library_path=LIBRARY_PATH,
+            **kwargs,
+        )
+        events = [event async for event in manager.run_async(steps=2)]
+        return manager, events
+
+    manager, events = asyncio.run(run_async(cache=ProjectCache()))
+    assert manager.logs == serial.logs
+
+    finished = [data for event, data in events if event == "finished"]
+    assert finished == manager.logs
+    assert [e for e, _ in events].count("initialized") == len(configs)
+    times = [data["time"] for event, data in events if event == "time"]
+    assert times == sorted(times)
+    assert times[-1] == manager.logs[-1]["Finished"]
+
+    manager, _ = asyncio.run(run_async(workers=2))
+    assert manager.logs == serial.logs
+
+
+def test_run_async_cancel():
+
+    allocations = {"wtiv": ("test_wtiv", 1)}
+
+    configs = []
+    for _ in range(3):
+        config = deepcopy(BASE)
+        config["wtiv"] = "_shared_pool_:test_wtiv"
+        configs.append(config)
+
+    async def run_until_finished():
+        manager = GlobalManager(
+            configs, allocations, library_path=LIBRARY_PATH
+        )
+        async for event, _ in manager.run_async():
+            if event == "finished":
+                break
+
+        return manager
+
+    manager = asyncio.run(run_until_finished())
+    assert len(manager.logs) == 1
+    assert manager._offloaded is None
+
+    async def cancel():
+        manager = GlobalManager(
+            configs, allocations, library_path=LIBRARY_PATH
+        )
+
+        started = asyncio.Event()
+
+        async def consume():
+            async for event, _ in manager.run_async(steps=1):
+                if event == "started":
+                    started.set()
+
+        task = asyncio.create_task(consume())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        return manager
+
+    manager = asyncio.run(cancel())
+    assert manager.logs == []
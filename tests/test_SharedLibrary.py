@@ -0,0 +1,245 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import os
+from copy import deepcopy
+
+from simpy import Environment
+
+from CORAL.library import SharedLibrary, compile_library, load_library_item
+from CORAL.manager import ENGINES, GlobalManager, MultiRequest
+from CORAL.profile import Profiler
+from CORAL.results import Timeline
+from tests.test_GlobalManager import BASE
+
+DIR = os.path.split(__file__)[0]
+LIBRARY_PATH = os.path.join(DIR, "test_library")
+
+
+def test_release_grants_in_fifo_order():
+
+    env = Environment()
+    allocations = {"port": [("test_port_1", 1), ("test_port_2", 1)]}
+    library = SharedLibrary(env, allocations, path=LIBRARY_PATH)
+
+    first = MultiRequest(env, {"port": "test_port_1"}, "first")
+    second = MultiRequest(env, {"port": "test_port_1"}, "second")
+    other = MultiRequest(env, {"port": "test_port_2"}, "other")
+    third = MultiRequest(env, {"port": "test_port_1"}, "third")
+
+    for request in [first, second, other, third]:
+        library.request(request)
+
+    assert library.processed_requests == [first, other]
+    assert library.unprocessed_requests == [second, third]
+
+    library.release(first)
+    assert library.processed_requests == [first, other, second]
+    assert library.unprocessed_requests == [third]
+
+    library.release(second)
+    assert library.unprocessed_requests == []
+    assert library.requests == [first, second, other, third]
+
+
+def test_multi_pool_request_waits_for_all_pools():
+
+    env = Environment()
+    allocations = {
+        "wtiv": ("test_wtiv", 1),
+        "port": [("test_port_1", 1), ("test_port_2", 1)],
+    }
+    library = SharedLibrary(env, allocations, path=LIBRARY_PATH)
+
+    first = MultiRequest(
+        env, {"wtiv": "test_wtiv", "port": "test_port_1"}, "first"
+    )
+    second = MultiRequest(
+        env, {"wtiv": "test_wtiv", "port": "test_port_2"}, "second"
+    )
+
+    library.request(first)
+    library.request(second)
+    assert library.unprocessed_requests == [second]
+
+    library.resources["port"]["test_port_2"].add_capacity()
+    library.check_requests(("port", "test_port_2"))
+    assert library.unprocessed_requests == [second]
+
+    library.release(first)
+    assert library.unprocessed_requests == []
+
+
+def test_timeline_grows_and_summarizes():
+
+    timeline = Timeline(size=2)
+    for t in range(100):
+        timeline.record(t, 2, t % 3, t % 5)
+
+    assert len(timeline) == 100
+    assert timeline.data[-1].tolist() == [99, 2, 0, 4]
+
+    stats = timeline.stats(end=100)
+    assert stats["busy_hours"] == sum(t % 3 for t in range(100))
+    assert stats["idle_hours"] == 200 - stats["busy_hours"]
+    assert stats["peak_queue"] == 4
+    assert stats["mean_queue"] == 2
+
+
+def test_library_items_are_cached(tmp_path):
+
+    filepath = tmp_path / "item.yaml"
+    filepath.write_text("num_cranes: 1\n")
+
+    data = load_library_item(str(filepath))
+    assert load_library_item(str(filepath)) is data
+
+    filepath.write_text("num_cranes: 2\n")
+    stat = os.stat(filepath)
+    os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_library_item(str(filepath)) == {"num_cranes": 2}
+
+
+def test_library_snapshot(tmp_path):
+
+    snapshot = compile_library(LIBRARY_PATH, str(tmp_path / "library.pkl"))
+    allocations = {
+        "wtiv": ("test_wtiv", 1),
+        "port": [("test_port_1", 1), ("missing_port", 1)],
+    }
+
+    env = Environment()
+    library = SharedLibrary(env, allocations, path=LIBRARY_PATH)
+    compiled = SharedLibrary(env, allocations, path=snapshot)
+
+    assert set(compiled.resources["port"]) == {"test_port_1"}
+    for k, data in library.resources.items():
+        for name, resource in data.items():
+            assert compiled.resources[k][name].data == resource.data
+
+
+def test_priority_scheduler():
+
+    env = Environment()
+    allocations = {"port": [("test_port_1", 1)]}
+    library = SharedLibrary(
+        env, allocations, path=LIBRARY_PATH, scheduler="priority"
+    )
+
+    first = MultiRequest(env, {"port": "test_port_1"}, "first")
+    low = MultiRequest(env, {"port": "test_port_1"}, "low", priority=1)
+    high = MultiRequest(env, {"port": "test_port_1"}, "high", priority=5)
+
+    for request in [first, low, high]:
+        library.request(request)
+
+    library.release(first)
+    assert library.processed_requests == [first, high]
+    assert library.unprocessed_requests == [low]
+
+
+def test_backfill_scheduler_protects_oldest_request():
+
+    env = Environment()
+    allocations = {
+        "wtiv": ("test_wtiv", 1),
+        "port": [("test_port_1", 1)],
+    }
+    library = SharedLibrary(
+        env, allocations, path=LIBRARY_PATH, scheduler="backfill"
+    )
+
+    running = MultiRequest(env, {"port": "test_port_1"}, "running")
+    library.request(running)
+    running.finish = 100
+
+    head = MultiRequest(
+        env, {"port": "test_port_1", "wtiv": "test_wtiv"}, "head"
+    )
+    long = MultiRequest(env, {"wtiv": "test_wtiv"}, "long")
+    short = MultiRequest(env, {"wtiv": "test_wtiv"}, "short")
+    long.duration = 200
+    short.duration = 50
+
+    for request in [head, long, short]:
+        library.request(request)
+
+    assert library.processed_requests == [running, short]
+    assert library.unprocessed_requests == [head, long]
+
+    library.release(short)
+    assert library.unprocessed_requests == [head, long]
+
+    library.release(running)
+    assert library.processed_requests == [running, short, head]
+
+    library.release(head)
+    assert library.unprocessed_requests == []
+
+
+def test_coalesced_wakeups():
+
+    allocations = {
+        "wtiv": ("test_wtiv", 1),
+        "port": [("test_port_1", 1)],
+    }
+
+    granted = {}
+    for coalesce in [None, True]:
+        env = Environment()
+        profiler = Profiler()
+        kwargs = {} if coalesce is None else {"coalesce": coalesce}
+        library = SharedLibrary(
+            env, allocations, path=LIBRARY_PATH, profiler=profiler, **kwargs
+        )
+
+        resources = {"port": "test_port_1", "wtiv": "test_wtiv"}
+        running = MultiRequest(env, resources, "running")
+        both = MultiRequest(env, resources, "both")
+        port = MultiRequest(env, {"port": "test_port_1"}, "port")
+
+        for request in [running, both, port]:
+            library.request(request)
+
+        library.release(running)
+        if coalesce:
+            assert library.unprocessed_requests == [both, port]
+
+            late = MultiRequest(env, {"port": "test_port_1"}, "late")
+            library.request(late)
+            env.run()
+
+        granted[coalesce] = library.processed_requests[1:]
+        calls = profiler.stages.loc["check_requests", "calls"]
+        assert calls == (1 if coalesce else 2)
+
+    # By default each release is checked as it happens, which lets the
+    # younger request take the port before the wtiv is released. A single
+    # pass grants in arrival order.
+    assert [r.name for r in granted[None]] == ["port"]
+    assert [r.name for r in granted[True]] == ["both"]
+
+    configs = []
+    for name in ["running", "both", "port"]:
+        config = {"project_name": name, "port": "_shared_pool_:test_port_1"}
+        config.update(deepcopy(BASE))
+        if name != "port":
+            config["wtiv"] = "_shared_pool_:test_wtiv"
+
+        configs.append(config)
+
+    # Managers keep per release checks unless coalescing is requested, with
+    # the same logs from both engines.
+    for coalesce, expected in [(False, "port"), (True, "both")]:
+        for engine in ENGINES:
+            manager = GlobalManager(
+                configs,
+                allocations,
+                library_path=LIBRARY_PATH,
+                coalesce=coalesce,
+            )
+            manager.run(engine=engine)
+            assert manager.logs[1]["name"] == expected
@@ -0,0 +1,92 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+from copy import deepcopy
+
+from CORAL import GlobalManager
+from CORAL.cache import ProjectCache, ProjectResult, project_key
+from tests.test_GlobalManager import BASE, LIBRARY_PATH, BASE_PROJECT_TIME
+
+
+def test_project_key_is_canonical():
+
+    a = {"plant": {"num_turbines": 20}, "site": {"depth": 20}}
+    b = {"site": {"depth": 20}, "plant": {"num_turbines": 20}}
+    assert project_key(a) == project_key(b)
+
+    c = {"phases": {"TurbineInstallation": ("MonopileInstallation", 1.0)}}
+    d = {"phases": {"TurbineInstallation": ["MonopileInstallation", 1.0]}}
+    assert project_key(c) != project_key(d)
+
+    assert project_key(a, None, 0) == project_key(a, None, 100)
+    assert project_key(a, "weather", 0) != project_key(a, "weather", 100)
+
+
+def test_lru_eviction():
+
+    cache = ProjectCache(maxsize=2)
+    cache.set("a", ProjectResult(1.0))
+    cache.set("b", ProjectResult(2.0))
+    assert cache.get("a").project_time == 1.0
+
+    cache.set("c", ProjectResult(3.0))
+    assert cache.get("b") is None
+    assert cache.get("a").project_time == 1.0
+    assert cache.info["hits"] == 2
+    assert cache.info["misses"] == 1
+
+
+def test_disk_tier_persists(tmp_path):
+
+    result = ProjectResult(10.5, {"A": 0.0}, {"A": 10.5})
+    ProjectCache(path=str(tmp_path)).set("ab12", result)
+
+    cache = ProjectCache(path=str(tmp_path))
+    cached = cache.get("ab12")
+    assert cached.project_time == 10.5
+    assert cached.phase_times == {"A": 10.5}
+    assert cache.hits == 1
+
+
+def test_manager_reuses_cached_results():
+
+    allocations = {"port": [("test_port_1", 1)]}
+    config = deepcopy(BASE)
+    config["port"] = "_shared_pool_:test_port_1"
+
+    cache = ProjectCache()
+    manager = GlobalManager(
+        [config, config], allocations, library_path=LIBRARY_PATH, cache=cache
+    )
+    manager.run()
+
+    assert cache.misses == 1
+    assert cache.hits == 1
+    assert manager.logs[1]["Finished"] == BASE_PROJECT_TIME * 2
+
+    manager = GlobalManager(
+        [config], allocations, library_path=LIBRARY_PATH, cache=cache
+    )
+    manager.run()
+
+    assert cache.hits == 2
+    assert manager.logs[0]["Finished"] == BASE_PROJECT_TIME
+
+
+def test_project_key_tracks_library_items(tmp_path, monkeypatch):
+
+    turbines = tmp_path / "turbines"
+    turbines.mkdir()
+    item = turbines / "test_turbine.yaml"
+    item.write_text("rotor_diameter: 200\n")
+    monkeypatch.setenv("DATA_LIBRARY", str(tmp_path))
+
+    config = {"turbine": "test_turbine", "plant": {"num_turbines": 20}}
+    key = project_key(config)
+    assert project_key(config) == key
+
+    item.write_text("rotor_diameter: 2200\n")
+    assert project_key(config) != key
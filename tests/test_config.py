@@ -0,0 +1,71 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+from copy import deepcopy
+
+import pytest
+
+from CORAL import GlobalManager
+from CORAL.config import LayeredConfig
+from tests.test_GlobalManager import BASE, LIBRARY_PATH
+
+
+def test_layers_merge_nested_dicts():
+
+    base = {"plant": {"num_turbines": 20, "layout": "grid"}, "turbine": "a"}
+    config = LayeredConfig(base, {"plant": {"num_turbines": 50}})
+
+    assert config["plant"]["num_turbines"] == 50
+    assert config["plant"]["layout"] == "grid"
+    assert config.to_dict() == {
+        "plant": {"num_turbines": 50, "layout": "grid"},
+        "turbine": "a",
+    }
+
+
+def test_writes_do_not_modify_layers():
+
+    base = {"plant": {"num_turbines": 20}, "design_phases": [], "x": 1}
+    original = deepcopy(base)
+    config = LayeredConfig(base)
+
+    config["plant"]["num_turbines"] = 10
+    config["design_phases"] += ["MonopileDesign"]
+    config["port"] = {"num_cranes": 1}
+    assert config.pop("x") == 1
+
+    assert base == original
+    assert "x" not in config
+    assert list(config) == ["plant", "design_phases", "port"]
+    assert config.to_dict() == {
+        "plant": {"num_turbines": 10},
+        "design_phases": ["MonopileDesign"],
+        "port": {"num_cranes": 1},
+    }
+
+    with pytest.raises(KeyError):
+        config["x"]
+
+
+def test_manager_does_not_modify_configs():
+
+    allocations = {"port": [("test_port_1", 1)]}
+    config = deepcopy(BASE)
+    config["project_name"] = "Layered"
+    config["port"] = "_shared_pool_:test_port_1"
+    original = deepcopy(config)
+
+    manager = GlobalManager([config], allocations, library_path=LIBRARY_PATH)
+    manager.run()
+
+    assert config == original
+    assert manager.logs[0]["name"] == "Layered"
+
+    # Configurations are exposed as plain dicts with the manager's changes.
+    (final,) = manager.configs
+    assert type(final) is dict
+    assert "project_name" not in final
+    assert isinstance(final["port"], dict)
@@ -0,0 +1,91 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import datetime as dt
+from copy import deepcopy
+
+import numpy as np
+import pandas as pd
+
+from CORAL import GlobalManager, run_ensemble
+from CORAL.results import StreamingQuantile
+from tests.test_weather import weather_profile
+from tests.test_GlobalManager import BASE, LIBRARY_PATH
+
+
+def test_streaming_quantile():
+
+    rng = np.random.default_rng(0)
+    values = rng.exponential(100, 5000)
+
+    for q in (0.1, 0.5, 0.9):
+        estimate = StreamingQuantile(q)
+        for x in values[:4]:
+            estimate.add(x)
+
+        assert estimate.value == np.quantile(values[:4], q)
+
+        for x in values[4:]:
+            estimate.add(x)
+
+        assert estimate.count == 5000
+        assert abs(estimate.value - np.quantile(values, q)) < 5
+
+
+def test_ensemble_matches_realizations():
+
+    weather = weather_profile(0, hours=30000)
+    allocations = {"port": [("test_port_1", 1)]}
+
+    configs = []
+    for start in [dt.datetime(2022, 1, 1), dt.datetime(2022, 2, 1)]:
+        config = deepcopy(BASE)
+        config["port"] = "_shared_pool_:test_port_1"
+        config["project_start"] = start
+        configs.append(config)
+
+    offsets = [0, 1000, 2000, 3000]
+    finished = {"Project 1": [], "Project 2": []}
+    for offset in offsets:
+        manager = GlobalManager(
+            configs,
+            allocations,
+            weather=weather[offset:].reset_index(drop=True),
+            library_path=LIBRARY_PATH,
+        )
+        manager.run()
+        for log in manager.logs:
+            finished[log["name"]].append(log["Finished"])
+
+    completed = []
+    serial = run_ensemble(
+        configs,
+        allocations,
+        weather,
+        offsets,
+        library_path=LIBRARY_PATH,
+        callback=lambda offset, logs: completed.append(offset),
+    )
+    assert completed == offsets
+
+    for name, values in finished.items():
+        assert serial.loc[name, "realizations"] == 4
+        assert serial.loc[name, "Finished mean"] == np.mean(values)
+        assert serial.loc[name, "Finished P90"] == np.quantile(values, 0.9)
+
+    assert serial.loc["Project 2", "Date Finished P50"] > pd.Timestamp(
+        2022, 2, 1
+    )
+
+    parallel = run_ensemble(
+        configs,
+        allocations,
+        weather,
+        offsets,
+        workers=2,
+        library_path=LIBRARY_PATH,
+    )
+    pd.testing.assert_frame_equal(parallel, serial)
@@ -0,0 +1,31 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import pytest
+
+from benchmarks.bench_imports import BUDGETS, measure
+
+
+@pytest.mark.parametrize("module", BUDGETS)
+def test_imports_are_light(module):
+
+    # Import times are checked by `benchmarks.bench_imports`.
+    _, orbit, pandas = measure(module)
+    assert not orbit
+    assert not pandas
+
+
+def test_lazy_exports():
+
+    import CORAL
+    import CORAL.sweeps
+    import CORAL.optimize  # noqa: F401
+
+    assert CORAL.sweep is CORAL.sweeps.sweep
+    assert CORAL.sweeps.__name__ == "CORAL.sweeps"
+    assert set(CORAL.__all__) <= set(dir(CORAL))
+    with pytest.raises(AttributeError):
+        CORAL.missing
@@ -0,0 +1,194 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import os
+import time
+import pickle
+import shutil
+import socket
+import sqlite3
+import multiprocessing
+
+import pytest
+import pandas as pd
+
+from CORAL import JobStore, sweep, expand_grid
+from CORAL.jobs import serve_store, connect_store
+from CORAL.sweeps import sweep_key
+from tests.test_sweep import get_configs
+from tests.test_GlobalManager import LIBRARY_PATH
+
+
+def get_grid():
+
+    return expand_grid(
+        {
+            "wtiv": [("test_wtiv", 1), ("test_wtiv", 2), ("test_wtiv", 3)],
+            "port": [[("test_port_1", 1), ("test_port_2", 1)]],
+        }
+    )
+
+
+def test_job_store_leases(tmp_path):
+
+    store = JobStore(str(tmp_path / "jobs.db"), lease=0.5)
+    assert store.submit({"a": 1, "b": 2}) == 2
+    assert store.submit({"a": 1}) == 0
+
+    assert store.lease("worker 1") == ("a", 1)
+    assert store.lease("worker 1") == ("b", 2)
+    assert store.lease("worker 2") is None
+
+    store.complete("a", {"makespan": 10.0})
+    store.fail("b", "error")
+    assert store.counts() == {
+        "pending": 0,
+        "leased": 0,
+        "done": 1,
+        "failed": 1,
+    }
+    assert store.finished()
+
+    # Failed scenarios are queued again, and expired leases re-leased.
+    assert store.submit({"a": 1, "b": 2}) == 1
+    assert store.lease("worker 2") == ("b", 2)
+    assert store.lease("worker 3") is None
+    time.sleep(0.6)
+    assert store.lease("worker 3") == ("b", 2)
+
+    store.release("b")
+    assert store.lease("worker 4") == ("b", 2)
+    assert store.results() == {"a": {"makespan": 10.0}}
+
+    JobStore(str(tmp_path / "keyed.db"), key="1")
+    with pytest.raises(ValueError):
+        JobStore(str(tmp_path / "keyed.db"), key="2")
+
+
+def test_changed_allocations_are_queued(tmp_path):
+
+    path = str(tmp_path / "jobs.db")
+    store = JobStore(path)
+    store.submit({"a": [("wtiv", 1)], "b": [("wtiv", 2)]})
+    for _ in range(2):
+        name, _ = store.lease("worker 1")
+        store.complete(name, {"makespan": 10.0})
+
+    assert store.submit({"a": [("wtiv", 1)], "b": [("wtiv", 2)]}) == 0
+    assert store.submit({"a": [("wtiv", 1)], "b": [("wtiv", 3)]}) == 1
+    assert store.results() == {"a": {"makespan": 10.0}}
+    assert store.lease("worker 1") == ("b", [("wtiv", 3)])
+
+    # Results of the previous allocations are ignored.
+    store.submit({"b": [("wtiv", 4)]})
+    store.complete("b", {"makespan": 20.0})
+    assert store.counts()["pending"] == 1
+
+    # Stores created without digests are compared to the stored allocations.
+    path = str(tmp_path / "old.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE jobs (scenario TEXT PRIMARY KEY, allocations BLOB "
+            "NOT NULL, status TEXT NOT NULL DEFAULT 'pending', worker TEXT, "
+            "expires REAL, attempts INTEGER NOT NULL DEFAULT 0, result TEXT, "
+            "error TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO jobs VALUES ('\"a\"', ?, 'done', NULL, NULL, 1, "
+            "'{}', NULL)",
+            (pickle.dumps([("wtiv", 1)]),),
+        )
+
+    store = JobStore(path)
+    assert store.submit({"a": [("wtiv", 1)]}) == 0
+    assert store.submit({"a": [("wtiv", 2)]}) == 1
+
+
+def test_sweep_resumes_from_store(tmp_path):
+
+    configs = get_configs()
+    grid = get_grid()
+    expected = sweep(configs, grid, library_path=LIBRARY_PATH)
+
+    path = str(tmp_path / "jobs.db")
+    key = sweep_key(configs, library_path=LIBRARY_PATH)
+    store = JobStore(path, lease=0.0, key=key)
+    store.submit(dict(enumerate(grid)))
+
+    # A worker that crashed while holding a lease.
+    assert store.lease("crashed")[0] == 0
+
+    completed = []
+    results = sweep(
+        configs,
+        grid,
+        library_path=LIBRARY_PATH,
+        store=JobStore(path, key=key),
+        callback=lambda name, metrics: completed.append(name),
+    )
+    pd.testing.assert_frame_equal(results, expected, check_dtype=False)
+    assert sorted(completed) == [0, 1, 2]
+
+    completed = []
+    results = sweep(
+        configs,
+        grid,
+        workers=2,
+        library_path=LIBRARY_PATH,
+        store=path,
+        callback=lambda name, metrics: completed.append(name),
+    )
+    pd.testing.assert_frame_equal(results, expected, check_dtype=False)
+    assert completed == []
+
+    # Changed shared library items aren't mixed with stored results.
+    library = str(tmp_path / "library")
+    shutil.copytree(LIBRARY_PATH, library)
+    stored = str(tmp_path / "library.db")
+    sweep(configs, grid, library_path=library, store=stored)
+    with open(os.path.join(library, "ports", "test_port_1.yaml"), "a") as f:
+        f.write("# edited\n")
+
+    with pytest.raises(ValueError):
+        sweep(configs, grid, library_path=library, store=stored)
+
+    configs[0]["project_start"] = 100
+    with pytest.raises(ValueError):
+        sweep(configs, grid, library_path=LIBRARY_PATH, store=path)
+
+
+def test_served_store(tmp_path):
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        address = s.getsockname()
+
+    path = str(tmp_path / "jobs.db")
+    server = multiprocessing.Process(
+        target=serve_store, args=(path, address, b"secret"), daemon=True
+    )
+    server.start()
+
+    try:
+        for _ in range(100):
+            try:
+                store = connect_store(address, b"secret")
+                break
+
+            except ConnectionRefusedError:
+                time.sleep(0.05)
+
+        configs = get_configs()
+        grid = get_grid()
+        results = sweep(configs, grid, library_path=LIBRARY_PATH, store=store)
+
+        expected = sweep(configs, grid, library_path=LIBRARY_PATH)
+        pd.testing.assert_frame_equal(results, expected, check_dtype=False)
+        assert JobStore(path).counts()["done"] == len(grid)
+
+    finally:
+        server.terminate()
+        server.join()
@@ -0,0 +1,68 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import pytest
+
+from CORAL import minimize_fleet
+from tests.test_sweep import get_configs
+from tests.test_GlobalManager import LIBRARY_PATH, BASE_PROJECT_TIME
+
+ALLOCATIONS = {
+    "wtiv": ("test_wtiv", 10),
+    "port": [("test_port_1", 10), ("test_port_2", 10)],
+}
+
+
+@pytest.mark.parametrize(
+    "budget, expected",
+    [
+        (0, {"wtiv": 3, "test_port_1": 2, "test_port_2": 1}),
+        (BASE_PROJECT_TIME, {"wtiv": 2, "test_port_1": 1, "test_port_2": 1}),
+        (
+            2 * BASE_PROJECT_TIME,
+            {"wtiv": 1, "test_port_1": 1, "test_port_2": 1},
+        ),
+    ],
+)
+def test_minimize_fleet(budget, expected):
+
+    allocations, evaluations = minimize_fleet(
+        get_configs(), ALLOCATIONS, budget, library_path=LIBRARY_PATH
+    )
+
+    assert allocations == {
+        "wtiv": ("test_wtiv", expected["wtiv"]),
+        "port": [
+            ("test_port_1", expected["test_port_1"]),
+            ("test_port_2", expected["test_port_2"]),
+        ],
+    }
+
+    assert evaluations["feasible"].any()
+    assert evaluations["max_wait"].min() == 0
+    assert len(evaluations) < 10
+
+
+def test_minimize_fleet_parallel_and_infeasible():
+
+    serial = minimize_fleet(
+        get_configs(), ALLOCATIONS, 1000, library_path=LIBRARY_PATH
+    )
+    parallel = minimize_fleet(
+        get_configs(), ALLOCATIONS, 1000, workers=2, library_path=LIBRARY_PATH
+    )
+    assert parallel[0] == serial[0]
+
+    with pytest.raises(ValueError):
+        minimize_fleet(
+            get_configs(),
+            {
+                "wtiv": ("test_wtiv", 1),
+                "port": [("test_port_1", 2), ("test_port_2", 1)],
+            },
+            0,
+            library_path=LIBRARY_PATH,
+        )
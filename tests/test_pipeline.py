@@ -0,0 +1,91 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import os
+
+import yaml
+import pandas as pd
+from ORBIT import load_config
+
+from CORAL import Pipeline
+
+DIR = os.path.split(__file__)[0]
+PIPELINE = os.path.join(DIR, "test_pipeline.csv")
+BASE_CONFIG = os.path.join(DIR, "test_base_config.yaml")
+
+
+def test_build_configs():
+
+    pipeline = Pipeline(PIPELINE, BASE_CONFIG)
+    first, _, third = pipeline.configs
+
+    assert first["project_name"] == "Bay State Wind a"
+    assert first["project_coords"] == (40.96, -70.829972)
+    assert first["project_start"] == pd.Timestamp("2021-05-01")
+    assert first["plant"]["num_turbines"] == 51
+    assert first["plant"]["layout"] == "grid"
+    assert first["site"] == {
+        "depth": 43,
+        "distance": 40,
+        "distance_to_landfall": 33,
+    }
+
+    assert first["port"] == "_shared_pool_:northeast"
+    assert third["port"] == "_shared_pool_:central"
+    assert first["wtiv"] == "_shared_pool_:example_wtiv"
+    assert "MonopileDesign" in first["design_phases"]
+
+    assert pipeline.base["plant"]["num_turbines"] == 20
+    assert pipeline.base["design_phases"] == []
+
+    # Plain dict configs don't share containers of the template.
+    first["design_phases"].append("ArraySystemDesign")
+    first["install_phases"]["MonopileInstallation"] = 10
+    assert "ArraySystemDesign" not in third["design_phases"]
+    assert third["install_phases"]["MonopileInstallation"] == 0
+
+
+def test_nested_containers_are_copied(tmp_path):
+
+    base = load_config(BASE_CONFIG)
+    base["array_system_design"] = {"opts": {"a": 1}, "cables": ["XLPE"]}
+    filepath = tmp_path / "base.yaml"
+    with open(filepath, "w") as f:
+        yaml.dump(base, f)
+
+    first, second, third = Pipeline(PIPELINE, str(filepath)).configs
+    first["array_system_design"]["opts"]["a"] = 99
+    first["array_system_design"]["cables"].append("HVAC")
+
+    for config in [second, third]:
+        assert config["array_system_design"] == {
+            "opts": {"a": 1},
+            "cables": ["XLPE"],
+        }
+
+
+def test_lazy_configs():
+
+    eager = Pipeline(PIPELINE, BASE_CONFIG)
+    lazy = Pipeline(PIPELINE, BASE_CONFIG, lazy=True)
+
+    assert not isinstance(lazy.configs, list)
+    assert list(lazy.configs) == eager.configs
+
+
+def test_priority_column(tmp_path):
+
+    projects = pd.read_csv(PIPELINE)
+    projects["priority"] = [2, None, 1]
+    filepath = tmp_path / "pipeline.csv"
+    projects.to_csv(filepath, index=False)
+
+    first, second, third = Pipeline(filepath, BASE_CONFIG).configs
+    assert first["project_priority"] == 2
+    assert "project_priority" not in second
+    assert third["project_priority"] == 1
+
+    assert "project_priority" not in Pipeline(PIPELINE, BASE_CONFIG).configs[0]
@@ -0,0 +1,119 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import sqlite3
+import datetime as dt
+
+import pytest
+import pandas as pd
+
+from CORAL import GlobalManager
+from CORAL.sinks import CSVSink, SQLiteSink, open_sink
+from tests.test_sweep import get_configs
+from tests.test_GlobalManager import LIBRARY_PATH
+
+ALLOCATIONS = {
+    "wtiv": ("test_wtiv", 1),
+    "port": [("test_port_1", 1), ("test_port_2", 1)],
+}
+
+
+def get_expected(engine="simpy"):
+
+    manager = GlobalManager(
+        get_configs(), ALLOCATIONS, library_path=LIBRARY_PATH
+    )
+    manager.run(engine)
+
+    return manager.results
+
+
+@pytest.mark.parametrize("engine", ["simpy", "fast"])
+def test_csv_sink(tmp_path, engine):
+
+    path = str(tmp_path / "results.csv")
+    manager = GlobalManager(
+        get_configs(),
+        ALLOCATIONS,
+        library_path=LIBRARY_PATH,
+        sink=CSVSink(path, batch_size=2),
+    )
+    manager.run(engine)
+    assert manager.sink.written == 3
+    manager.sink.close()
+
+    written = pd.read_csv(path)
+    expected = manager.results
+    assert list(written.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(written, expected, check_dtype=False)
+    pd.testing.assert_frame_equal(expected, get_expected(engine))
+
+
+def test_sqlite_sink_drop_finished(tmp_path):
+
+    start = dt.datetime(2010, 1, 1)
+    configs = get_configs()
+    for config in configs:
+        config["project_start"] = start
+
+    path = str(tmp_path / "results.db")
+    manager = GlobalManager(
+        configs,
+        ALLOCATIONS,
+        library_path=LIBRARY_PATH,
+        sink=path,
+        drop_finished=True,
+    )
+    manager.run()
+
+    assert manager.results.empty
+    assert manager.configs == [None] * 3
+    assert all(config is None for _, _, config, _ in manager._projects)
+
+    with sqlite3.connect(path) as conn:
+        written = pd.read_sql("SELECT * FROM results", conn)
+
+    expected = get_expected()
+    assert written["name"].tolist() == expected["name"].tolist()
+    assert written["Finished"].tolist() == expected["Finished"].tolist()
+    assert written["port"].tolist() == expected["port"].tolist()
+    assert written["Date Started"].iloc[0] == "2010-01-01T00:00:00"
+
+    with pytest.raises(ValueError):
+        manager.resimulate()
+
+    with pytest.raises(ValueError):
+        GlobalManager(configs, ALLOCATIONS, drop_finished=True)
+
+
+def test_sink_batches(tmp_path):
+
+    path = str(tmp_path / "results.db")
+    with SQLiteSink(path, batch_size=2) as sink:
+        for i in range(5):
+            sink.write({"name": f"Project {i}", "Finished": float(i)})
+            assert sink.written == 2 * ((i + 1) // 2)
+
+    assert sink.written == 5
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM results").fetchone() == (5,)
+
+    with pytest.raises(ValueError):
+        open_sink(str(tmp_path / "results.txt"))
+
+
+def test_parquet_sink(tmp_path):
+
+    pytest.importorskip("pyarrow")
+
+    path = str(tmp_path / "results.parquet")
+    manager = GlobalManager(
+        get_configs(), ALLOCATIONS, library_path=LIBRARY_PATH, sink=path
+    )
+    manager.run()
+
+    written = pd.read_parquet(path)
+    pd.testing.assert_frame_equal(written, manager.results, check_dtype=False)
@@ -0,0 +1,76 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+from copy import deepcopy
+
+import pandas as pd
+
+from CORAL import GlobalManager, sweep, expand_grid
+from CORAL.sweeps import summarize
+from tests.test_GlobalManager import BASE, LIBRARY_PATH, BASE_PROJECT_TIME
+
+
+def get_configs():
+
+    configs = []
+    for port in ["test_port_1", "test_port_1", "test_port_2"]:
+        config = deepcopy(BASE)
+        config["wtiv"] = "_shared_pool_:test_wtiv"
+        config["port"] = f"_shared_pool_:{port}"
+        configs.append(config)
+
+    return configs
+
+
+def test_expand_grid():
+
+    grid = expand_grid(
+        {
+            "wtiv": [("test_wtiv", 1), ("test_wtiv", 2)],
+            "port": [[("test_port_1", 1), ("test_port_2", 1)]],
+        }
+    )
+
+    assert len(grid) == 2
+    assert grid[1] == {
+        "wtiv": ("test_wtiv", 2),
+        "port": [("test_port_1", 1), ("test_port_2", 1)],
+    }
+
+
+def test_sweep_matches_managers():
+
+    configs = get_configs()
+    grid = expand_grid(
+        {
+            "wtiv": [("test_wtiv", 1), ("test_wtiv", 3)],
+            "port": [[("test_port_1", 1), ("test_port_2", 1)]],
+        }
+    )
+
+    completed = []
+    serial = sweep(
+        configs,
+        grid,
+        library_path=LIBRARY_PATH,
+        callback=lambda name, metrics: completed.append(name),
+    )
+    assert sorted(completed) == [0, 1]
+    assert serial.loc[0, "wtiv"] == 1
+    assert serial.loc[1, "port"] == 2
+    assert serial.loc[0, "makespan"] == 3 * BASE_PROJECT_TIME
+    assert serial.loc[1, "makespan"] == 2 * BASE_PROJECT_TIME
+
+    for scenario, allocations in enumerate(grid):
+        manager = GlobalManager(
+            configs, allocations, library_path=LIBRARY_PATH
+        )
+        manager.run()
+        for k, v in summarize(manager).items():
+            assert serial.loc[scenario, k] == v
+
+    parallel = sweep(configs, grid, workers=2, library_path=LIBRARY_PATH)
+    pd.testing.assert_frame_equal(parallel, serial)
@@ -0,0 +1,145 @@
+__author__ = "Jake Nunemaker"
+__copyright__ = "Copyright 2021, National Renewable Energy Laboratory"
+__maintainer__ = "Jake Nunemaker"
+__email__ = "jake.nunemaker@nrel.gov"
+
+
+import pickle
+from copy import deepcopy
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from CORAL import GlobalManager
+from CORAL.weather import WeatherStore
+from tests.test_GlobalManager import BASE, LIBRARY_PATH
+
+
+def weather_profile(seed, hours=20000):
+
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "windspeed": rng.uniform(0, 20, hours),
+            "waveheight": rng.uniform(0, 3, hours),
+        }
+    )
+
+
+def test_views_are_zero_copy(tmp_path):
+
+    weather = weather_profile(0, hours=100)
+    store = WeatherStore.create(str(tmp_path), weather)
+
+    view = store.view(10)
+    assert np.shares_memory(view.to_numpy(), store._data)
+    assert view.equals(weather[10:].reset_index(drop=True))
+
+    attached = pickle.loads(pickle.dumps(store))
+    assert attached.path == store.path
+    assert attached.fingerprint() == store.fingerprint()
+
+
+def test_shifted_views(tmp_path):
+
+    weather = weather_profile(0, hours=100)
+    store = WeatherStore.create(str(tmp_path), weather)
+
+    shifted = store.shift(30).shift(10)
+    assert len(shifted) == 60
+    assert shifted.view(5).equals(weather[45:].reset_index(drop=True))
+    assert np.shares_memory(shifted.view().to_numpy(), store._data)
+    assert shifted.fingerprint() != store.fingerprint()
+
+    attached = pickle.loads(pickle.dumps(shifted))
+    assert attached.offset == 40
+    assert attached.fingerprint() == shifted.fingerprint()
+
+    with pytest.raises(ValueError):
+        store.shift(100)
+
+
+def test_region_selection(tmp_path):
+
+    store = WeatherStore.create(
+        str(tmp_path),
+        {"north": weather_profile(0, 10), "south": weather_profile(1, 10)},
+        coords={"north": (42.0, -70.0), "south": (35.0, -75.0)},
+    )
+
+    assert store.select_region("south") == "south"
+    assert store.select_region("central", (41.0, -71.0)) == "north"
+    assert store.select_region() == "north"
+    assert store.fingerprint("north") != store.fingerprint("south")
+
+
+def test_manager_uses_regional_weather(tmp_path):
+
+    north, south = weather_profile(0), weather_profile(1)
+    store = WeatherStore.create(
+        str(tmp_path), {"test_port_1": north, "test_port_2": south}
+    )
+    allocations = {"port": [("test_port_1", 1), ("test_port_2", 1)]}
+
+    configs = []
+    for port in ["test_port_1", "test_port_2"]:
+        config = deepcopy(BASE)
+        config["port"] = f"_shared_pool_:{port}"
+        configs.append(config)
+
+    expected = {}
+    for weather in [north, south]:
+        manager = GlobalManager(
+            configs, allocations, weather=weather, library_path=LIBRARY_PATH
+        )
+        manager.run()
+        expected[id(weather)] = {log["name"]: log for log in manager.logs}
+
+    manager = GlobalManager(
+        configs, allocations, weather=store, library_path=LIBRARY_PATH
+    )
+    manager.run()
+
+    logs = {log["name"]: log for log in manager.logs}
+    assert logs["Project 1"] == expected[id(north)]["Project 1"]
+    assert logs["Project 2"] == expected[id(south)]["Project 2"]
+    assert logs["Project 1"]["Finished"] != logs["Project 2"]["Finished"]
+
+
+def test_datetimes_are_restored(tmp_path):
+
+    weather = weather_profile(0)
+    weather.insert(
+        0, "datetime", pd.date_range("2021-01-01", periods=20000, freq="h")
+    )
+    store = WeatherStore.create(str(tmp_path / "column"), weather)
+
+    view = store.view(10)
+    pd.testing.assert_frame_equal(
+        view, weather[10:].reset_index(drop=True), check_dtype=False
+    )
+    assert np.shares_memory(view["windspeed"].to_numpy(), store._data)
+
+    indexed = WeatherStore.create(
+        str(tmp_path / "index"), weather.set_index("datetime")
+    )
+    assert indexed.view(10).index[0] == weather["datetime"][10]
+    assert indexed.shift(5).view(5).index[0] == weather["datetime"][10]
+
+    # Date based install phases need the datetimes of the weather profile.
+    config = deepcopy(BASE)
+    config["port"] = "_shared_pool_:test_port_1"
+    config["install_phases"] = {"TurbineInstallation": "01/01/2022"}
+    configs = [config, deepcopy(config)]
+    allocations = {"port": [("test_port_1", 1)]}
+
+    logs = []
+    for profile in [weather, store]:
+        manager = GlobalManager(
+            configs, allocations, weather=profile, library_path=LIBRARY_PATH
+        )
+        manager.run()
+        logs.append(manager.logs)
+
+    assert logs[0] == logs[1]